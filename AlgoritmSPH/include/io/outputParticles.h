@@ -7,3 +7,12 @@
 void printState(const std::vector<Particle>& particles, int step,
                 const std::string& output_dir);
 
+// Modo "dedup": las partículas de frontera/agujero no se mueven, así que el
+// estado completo (13 columnas) se guarda una sola vez en static_state.txt
+// y por step solo se escriben los campos variables del fluido.
+void printStaticState(const std::vector<Particle>& particles,
+                      const std::string& output_dir);
+
+void printFluidState(const std::vector<Particle>& particles, int step,
+                     const std::string& output_dir);
+
@@ -40,6 +40,7 @@ int main(int argc, char* argv[]) {
         // 3. Extraer parámetros principales
         std::string filename             = params["io"]["input_file"];
         std::string output_dir_sim       = params["io"]["output_dir_simulation"];
+        std::string snapshot_mode        = params["io"].value("snapshot_mode", "full");
         
         double h_factor                  = params["kernel"]["h_factor"];
         bool enable_kernel_test          = params["kernel"]["test_enabled"];
@@ -82,6 +83,13 @@ int main(int argc, char* argv[]) {
                                     ". Opciones válidas: 'Monaghan' o 'Korzani'.");
         }
 
+        // "full": 13 columnas de todas las partículas por step
+        // "dedup": estáticas una vez (static_state.txt) + solo fluido por step
+        if (snapshot_mode != "full" && snapshot_mode != "dedup") {
+            throw std::runtime_error("Modo de snapshot desconocido: " + snapshot_mode +
+                                    ". Opciones válidas: 'full' o 'dedup'.");
+        }
+
         // 4. Leer parámetros físicos del bloque "eos_params"
         json eos_params = params["physics"]["eos_params"];
         double rho0 = eos_params.value("rho0", 1000.0);
@@ -157,7 +165,14 @@ int main(int argc, char* argv[]) {
                           dt, g, dr, fluidHeight, eos_type);
 
             // 7.5. Guarda el estado actual
-            printState(particles, step, output_dir_sim);
+            if (snapshot_mode == "dedup") {
+                // Tras el primer integrateStep las fronteras ya tienen su
+                // presión inicial y no vuelven a cambiar
+                if (step == 0) printStaticState(particles, output_dir_sim);
+                printFluidState(particles, step, output_dir_sim);
+            } else {
+                printState(particles, step, output_dir_sim);
+            }
 
             // 7.6. Actualizar el tiempo
             time += dt;
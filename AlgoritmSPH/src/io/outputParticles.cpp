@@ -5,27 +5,32 @@
 #include <filesystem>
 #include <stdexcept>
 
-void printState(const std::vector<Particle>& particles,
-                int step,
-                const std::string& output_dir) {
+// Abre output_dir/<name> creando la carpeta si no existe
+static std::ofstream openOutput(const std::string& output_dir,
+                                const std::string& name) {
     namespace fs = std::filesystem;
 
     fs::create_directories(output_dir);
 
-    std::ostringstream filename;
-    filename << output_dir << "/state_" 
-             << std::setw(4) << std::setfill('0') << step 
-             << ".txt";
-
-    std::ofstream out(filename.str());
+    std::string filename = output_dir + "/" + name;
+    std::ofstream out(filename);
     if (!out) {
-        throw std::runtime_error("No se pudo abrir archivo " +
-             filename.str());
+        throw std::runtime_error("No se pudo abrir archivo " + filename);
     }
 
     // Configurar formato numérico: 10 cifras decimales, notación fija
     out << std::fixed << std::setprecision(10);
+    return out;
+}
+
+static std::string stateName(int step) {
+    std::ostringstream filename;
+    filename << "state_" << std::setw(4) << std::setfill('0') << step << ".txt";
+    return filename.str();
+}
 
+static void writeFullRows(std::ofstream& out,
+                          const std::vector<Particle>& particles) {
     out << "id posx posy velx vely accelx accely "
         << "rho mass pressure h internalE type\n";
 
@@ -44,6 +49,44 @@ void printState(const std::vector<Particle>& particles,
             << p.internalE << " "
             << p.type << "\n";
     }
+}
+
+void printState(const std::vector<Particle>& particles,
+                int step,
+                const std::string& output_dir) {
+    std::ofstream out = openOutput(output_dir, stateName(step));
+    writeFullRows(out, particles);
+    out.close();
+}
+
+void printStaticState(const std::vector<Particle>& particles,
+                      const std::string& output_dir) {
+    std::ofstream out = openOutput(output_dir, "static_state.txt");
+    writeFullRows(out, particles);
+    out.close();
+}
+
+void printFluidState(const std::vector<Particle>& particles,
+                     int step,
+                     const std::string& output_dir) {
+    std::ofstream out = openOutput(output_dir, stateName(step));
+
+    // mass, h y type son constantes: se toman de static_state.txt
+    out << "id posx posy velx vely accelx accely rho pressure internalE\n";
+
+    for (const auto& p : particles) {
+        if (p.type != Particle::Fluid) continue;
+        out << p.id << " "
+            << p.pos[0] << " "
+            << p.pos[1] << " "
+            << p.vel[0] << " "
+            << p.vel[1] << " "
+            << p.accel[0] << " "
+            << p.accel[1] << " "
+            << p.rho << " "
+            << p.pressure << " "
+            << p.internalE << "\n";
+    }
 
     out.close();
 }
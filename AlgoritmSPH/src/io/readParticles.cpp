@@ -7,8 +7,16 @@
 #include <algorithm>
 #include <unordered_set>
 #include <cmath>
+#include <cstdint>
+#include <cstring>
 #include "io/particle.h"
 
+// Formato binario de condiciones iniciales (InitialConditions/src/core/ics_writer.py):
+// "SPHBIN01", uint64 n, uint64 ncols (=13) y n filas de 13 double little-endian
+// en el mismo orden de columnas que el archivo de texto.
+static const char BINARY_MAGIC[8] = {'S', 'P', 'H', 'B', 'I', 'N', '0', '1'};
+static const std::uint64_t BINARY_NCOLS = 13;
+
 // -----------------------------
 // Función de verificación
 // -----------------------------
@@ -56,6 +64,54 @@ void verifyParticles(const std::vector<Particle>& particles) {
     }
 }
 
+// -----------------------------
+// Construcción de una partícula a partir de las 13 columnas
+// -----------------------------
+static Particle makeParticle(int id, const double* v, int typeInt) {
+    Particle p;
+    p.id = id;
+    p.pos = {v[0], v[1]};
+    p.vel = {v[2], v[3]};
+    p.accel = {v[4], v[5]};
+    p.rho = v[6];
+    p.mass = v[7];
+    p.pressure = v[8];
+    p.h = v[9];
+    p.soundVel = 0.0;
+    p.internalE = v[10];
+    p.dinternalE = 0.0;
+    p.type = static_cast<Particle::Type>(typeInt);
+    return p;
+}
+
+// -----------------------------
+// Lectura del formato binario
+// -----------------------------
+static std::vector<Particle> readParticlesBinary(std::ifstream& infile, const std::string& filename) {
+    std::uint64_t n = 0, ncols = 0;
+    infile.read(reinterpret_cast<char*>(&n), sizeof(n));
+    infile.read(reinterpret_cast<char*>(&ncols), sizeof(ncols));
+    if (!infile || ncols != BINARY_NCOLS) {
+        throw std::runtime_error("Cabecera binaria inválida en: " + filename);
+    }
+
+    std::vector<double> data(n * ncols);
+    infile.read(reinterpret_cast<char*>(data.data()),
+                static_cast<std::streamsize>(data.size() * sizeof(double)));
+    if (!infile) {
+        throw std::runtime_error("Archivo binario truncado: " + filename);
+    }
+
+    std::vector<Particle> particles;
+    particles.reserve(n);
+    for (std::uint64_t i = 0; i < n; ++i) {
+        const double* row = &data[i * ncols];
+        particles.push_back(makeParticle(static_cast<int>(row[0]), row + 1,
+                                         static_cast<int>(row[12])));
+    }
+    return particles;
+}
+
 // -----------------------------
 // Función principal de lectura
 // -----------------------------
@@ -63,11 +119,22 @@ std::vector<Particle> readParticlesFromFile(const std::string& filename){
     
     std::cout << "Dentro de función de lectura de partículas\n";
     
-    std::ifstream infile(filename);
+    std::ifstream infile(filename, std::ios::binary);
     if (!infile) {
         throw std::runtime_error("No se pudo abrir el archivo: " + filename);
     }
 
+    // Detectar formato binario por el número mágico
+    char magic[sizeof(BINARY_MAGIC)] = {};
+    infile.read(magic, sizeof(magic));
+    if (infile && std::memcmp(magic, BINARY_MAGIC, sizeof(magic)) == 0) {
+        std::vector<Particle> particles = readParticlesBinary(infile, filename);
+        verifyParticles(particles);
+        return particles;
+    }
+    infile.clear();
+    infile.seekg(0);
+
     std::string line;
     std::getline(infile, line); // Saltar cabecera
 
@@ -82,27 +149,17 @@ std::vector<Particle> readParticlesFromFile(const std::string& filename){
 
         std::istringstream iss(line);
 
-        Particle p;
-        double posx, posy, velx, vely, accelx, accely, rho, mass, pressure, h, internalE;
+        int id;
+        double v[11]; // posx posy velx vely accelx accely rho mass pressure h internalE
         int typeInt;
 
-        if (!(iss >> p.id >> posx >> posy >> velx >> vely >> accelx >> accely
-                  >> rho >> mass >> pressure >> h >> internalE >> typeInt)) {
+        if (!(iss >> id >> v[0] >> v[1] >> v[2] >> v[3] >> v[4] >> v[5]
+                  >> v[6] >> v[7] >> v[8] >> v[9] >> v[10] >> typeInt)) {
             std::cerr << "Error en formato de línea: " << line << "\n";
             continue;
         }
 
-        p.pos = {posx, posy};
-        p.vel = {velx, vely};
-        p.accel = {accelx, accely};
-        p.rho = rho;
-        p.mass = mass;
-        p.pressure = pressure;
-        p.h = h;
-        p.soundVel = 0.0;
-        p.internalE = internalE;
-        p.dinternalE = 0.0;
-        p.type = static_cast<Particle::Type>(typeInt);
+        Particle p = makeParticle(id, v, typeInt);
         
         if (p.type == Particle::Fluid && !printedFluidSep) {
             std::cout << "Separación dx/dy de fluido: " << 0 << ", " << 0 << "\n"; // Si quieres, calcular real
@@ -41,18 +41,28 @@ void computeNormalizedDensity(std::vector<Particle>& particles,
     
     computeRawDensity(particles, nParticles, nBoundary, true);
 
+    // Todas las normas se calculan con la densidad cruda antes de dividir:
+    // si rho se actualizara dentro del mismo bucle, los vecinos ya
+    // normalizados entrarían en la norma de i y el resultado dependería
+    // del orden de las partículas en el arreglo.
+    std::vector<double> norm(nParticles - nBoundary, 0.0);
+
     for (int i = nBoundary; i < nParticles; ++i) {
         Particle& pi = particles[i];
         double wii = cubicSplineKernel(0.0, pi.h);
-        double norm = (pi.mass / pi.rho) * wii;
+        double sum = (pi.mass / pi.rho) * wii;
 
         for (size_t j = 0; j < pi.neighbors.size(); ++j) {
             int neighborIdx = pi.neighbors[j];
             Particle& pj = particles[neighborIdx];
-            norm += (pj.mass / pj.rho) * pi.W[j];
+            sum += (pj.mass / pj.rho) * pi.W[j];
         }
 
-        pi.rho /= norm;
+        norm[i - nBoundary] = sum;
+    }
+
+    for (int i = nBoundary; i < nParticles; ++i) {
+        particles[i].rho /= norm[i - nBoundary];
     }
     std::cout << "Uso densidad normalizada\n\n";
 }
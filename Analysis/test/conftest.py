@@ -0,0 +1,40 @@
+# conftest.py
+
+import numpy as np
+import pytest
+
+from Analysis.utils.state_files import STATE_COLUMNS, write_state
+
+
+def frame_data(step, n_fluid=12, n_boundary=4, rho=1000.0, vel=0.0):
+    """Frame sintético: fluido en una grilla que cae con el paso, frontera fija."""
+    n = n_fluid + n_boundary
+    data = {c: np.zeros(n) for c in STATE_COLUMNS}
+    data["id"] = np.arange(n)
+    data["type"] = np.r_[np.ones(n_boundary), np.zeros(n_fluid)]
+    data["posx"] = np.arange(n) * 1e-3
+    data["posy"] = np.where(data["type"] == 0, 1e-2 - step * 1e-4, 0.0)
+    data["vely"] = np.where(data["type"] == 0, -vel, 0.0)
+    data["rho"] = np.full(n, rho, dtype=float)
+    data["mass"] = np.full(n, 1e-4)
+    data["pressure"] = (data["rho"] - 1000.0) * 10
+    data["h"] = np.full(n, 1e-3)
+    return data
+
+
+@pytest.fixture
+def make_run(tmp_path):
+    """
+    Crea una carpeta Output con n_frames frames sintéticos. rho y vel
+    pueden ser funciones del paso.
+    """
+    def _make(n_frames=6, rho=1000.0, vel=0.0, name="Output", **kwargs):
+        output_dir = tmp_path / name
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for step in range(n_frames):
+            r = rho(step) if callable(rho) else rho
+            v = vel(step) if callable(vel) else vel
+            write_state(output_dir / f"state_{step:04d}.txt",
+                        frame_data(step, rho=r, vel=v, **kwargs))
+        return output_dir
+    return _make
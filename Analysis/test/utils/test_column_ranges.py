@@ -0,0 +1,84 @@
+# test_column_ranges.py
+
+import numpy as np
+import pytest
+
+import Analysis.utils.column_ranges as cr
+from Analysis.utils.column_ranges import column_range, default_cache_path
+from Analysis.utils.run_archive import archive_run
+from Analysis.utils.state_files import read_state, state_files, write_state
+from conftest import frame_data
+
+
+def _todos(output_dir, column):
+    return np.concatenate([read_state(p, [column])[column] for p in state_files(output_dir)])
+
+
+def test_rango_igual_a_recorrer_todo(make_run):
+    output_dir = make_run(n_frames=5, rho=lambda s: 1000.0 + 10 * s, vel=lambda s: 0.1 * s)
+
+    rho = column_range(output_dir, "rho", workers=1)
+    todos = _todos(output_dir, "rho")
+    assert (rho["min"], rho["max"]) == (todos.min(), todos.max())
+    assert rho["n_frames"] == 5 and rho["n_values"] == len(todos)
+
+    # 'vel' = |v| a partir de velx/vely
+    vel = column_range(output_dir, "vel", workers=1)
+    assert vel["min"] == pytest.approx(0.0) and vel["max"] == pytest.approx(0.4)
+    assert default_cache_path(output_dir).exists()
+
+
+def test_percentiles_combinados(tmp_path):
+    rng = np.random.default_rng(0)
+    output_dir = tmp_path / "Output"
+    output_dir.mkdir()
+    for step in range(8):
+        write_state(output_dir / f"state_{step:04d}.txt",
+                    frame_data(step, n_fluid=60, rho=1000.0 + rng.normal(0, 5 * (step + 1), 64)))
+    rho = _todos(output_dir, "rho")
+
+    r = column_range(output_dir, "rho", percentiles=(1, 99), workers=1)
+    # Error de a lo sumo 1 % en rango respecto del percentil exacto
+    for key, p in (("p_low", 1), ("p_high", 99)):
+        assert (rho < r[key]).mean() * 100 <= p + 1.0
+        assert (rho <= r[key]).mean() * 100 >= p - 1.0
+    assert r["min"] < r["p_low"] < r["p_high"] < r["max"]
+
+
+def test_cache_incremental(make_run, monkeypatch):
+    output_dir = make_run(n_frames=4)
+    column_range(output_dir, "rho", workers=1)
+
+    llamadas = []
+    original = cr.map_frames
+
+    def _contar(*args, files=None, **kwargs):
+        llamadas.append([p.name for p in files])
+        return original(*args, files=files, **kwargs)
+
+    monkeypatch.setattr(cr, "map_frames", _contar)
+    assert column_range(output_dir, "rho", workers=1)["max"] == pytest.approx(1000.0)
+    assert llamadas == []
+
+    write_state(output_dir / "state_0002.txt", frame_data(2, rho=1800.0))
+    write_state(output_dir / "state_0004.txt", frame_data(4, rho=900.0))
+    r = column_range(output_dir, "rho", workers=1)
+    assert llamadas == [["state_0002.txt", "state_0004.txt"]]
+    assert (r["min"], r["max"], r["n_frames"]) == (pytest.approx(900.0), pytest.approx(1800.0), 5)
+
+    # Otra variable no invalida la anterior
+    column_range(output_dir, "pressure", workers=1)
+    llamadas.clear()
+    column_range(output_dir, "rho", workers=1)
+    assert llamadas == []
+
+
+def test_archivo_y_errores(make_run, tmp_path):
+    output_dir = make_run(n_frames=3, rho=lambda s: 1000.0 + s)
+    path = archive_run(output_dir)
+    assert column_range(path, "rho", cache_path=tmp_path / "r.json", workers=1)["max"] == pytest.approx(1002.0)
+
+    with pytest.raises(ValueError):
+        column_range(output_dir, "temperatura")
+    with pytest.raises(FileNotFoundError):
+        column_range(tmp_path / "vacio", "rho")
@@ -0,0 +1,58 @@
+# test_frame_reductions.py
+
+import os
+
+import pytest
+
+import Analysis.utils.frame_reductions as fr
+from Analysis.utils.frame_reductions import default_cache_path, frame_reductions
+from Analysis.utils.state_files import state_files, write_state
+from conftest import frame_data
+
+
+def test_reducciones_basicas(make_run):
+    output_dir = make_run(n_frames=4, rho=lambda s: 1000.0 + s, vel=0.5)
+    df = frame_reductions(output_dir, workers=1)
+
+    assert list(df["step"]) == [0, 1, 2, 3]
+    assert df["rho_max"].tolist() == pytest.approx([1000, 1001, 1002, 1003])
+    assert df["vel_max"].tolist() == pytest.approx([0.5] * 4)
+    assert (df["n_fluid"] == 12).all() and (df["n_nan"] == 0).all()
+    assert default_cache_path(output_dir).exists()
+
+
+def test_cache_evita_reparsear(make_run, monkeypatch):
+    """Una corrida sin cambios se responde desde el caché sin leer frames."""
+    output_dir = make_run(n_frames=3)
+    esperado = frame_reductions(output_dir, workers=1)
+
+    def _no_parsear(*args, **kwargs):
+        raise AssertionError("no debería parsear ningún frame")
+
+    monkeypatch.setattr(fr, "map_frames", _no_parsear)
+    assert frame_reductions(output_dir, workers=1).equals(esperado)
+
+
+def test_solo_se_reparsean_frames_nuevos_o_modificados(make_run, monkeypatch):
+    output_dir = make_run(n_frames=3)
+    frame_reductions(output_dir, workers=1)
+
+    write_state(output_dir / "state_0001.txt", frame_data(1, rho=1500.0))
+    archivo = state_files(output_dir)[1]
+    st = archivo.stat()
+    os.utime(archivo, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    write_state(output_dir / "state_0003.txt", frame_data(3))
+
+    parseados = []
+    original = fr.map_frames
+
+    def _contar(*args, files=None, **kwargs):
+        parseados.extend(f.name for f in files)
+        return original(*args, files=files, **kwargs)
+
+    monkeypatch.setattr(fr, "map_frames", _contar)
+    df = frame_reductions(output_dir, workers=1)
+
+    assert sorted(parseados) == ["state_0001.txt", "state_0003.txt"]
+    assert df.loc[df["step"] == 1, "rho_max"].item() == pytest.approx(1500.0)
+    assert len(df) == 4
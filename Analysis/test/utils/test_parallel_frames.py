@@ -0,0 +1,39 @@
+# test_parallel_frames.py
+
+import numpy as np
+
+from Analysis.utils.parallel_frames import map_frames
+from Analysis.utils.state_files import state_files
+
+
+def _rho_max(data):
+    return float(data["rho"].max())
+
+
+def _resumen(data):
+    return {"n": len(data["id"]), "rho": float(data["rho"].mean())}
+
+
+def test_orden_y_resultado_independientes_de_workers(make_run):
+    output_dir = make_run(n_frames=10, rho=lambda s: 1000.0 + s)
+    uno = map_frames(output_dir, _rho_max, columns=["rho"], workers=1)
+    dos = map_frames(output_dir, _rho_max, columns=["rho"], workers=2, chunksize=3)
+
+    np.testing.assert_array_equal(uno, np.arange(1000.0, 1010.0))
+    np.testing.assert_array_equal(uno, dos)
+
+
+def test_dicts_apilados_y_pasos(make_run):
+    output_dir = make_run(n_frames=4, rho=lambda s: 1000.0 + s)
+    steps, res = map_frames(output_dir, _resumen, columns=["id", "rho"],
+                            workers=2, return_steps=True)
+    assert list(steps) == [0, 1, 2, 3]
+    assert list(res["n"]) == [16] * 4
+    np.testing.assert_allclose(res["rho"], [1000, 1001, 1002, 1003])
+
+
+def test_subconjunto_de_archivos(make_run):
+    output_dir = make_run(n_frames=6, rho=lambda s: 1000.0 + s)
+    files = state_files(output_dir)[::2]
+    res = map_frames(output_dir, _rho_max, columns=["rho"], files=files, stack=False, workers=1)
+    assert res == [1000.0, 1002.0, 1004.0]
@@ -0,0 +1,46 @@
+# test_run_archive.py
+
+import numpy as np
+import pytest
+
+from Analysis.utils.run_archive import ArchiveFrame, archive_run, open_archive
+from Analysis.utils.state_files import read_state, state_files
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_archivo_reproduce_los_frames(make_run, codec):
+    output_dir = make_run(n_frames=7, rho=lambda s: 1000.0 + s)
+    originales = {p.name: p.read_bytes() for p in state_files(output_dir)}
+
+    path = archive_run(output_dir, frames_per_block=3, codec=codec)
+    archive = open_archive(path)
+
+    assert len(archive) == 7
+    assert list(archive.steps) == list(range(7))
+    for name, raw in originales.items():
+        assert archive.read_bytes(name) == raw
+
+    refs = state_files(path)
+    assert refs[4] == ArchiveFrame(str(path.resolve()), "state_0004.txt")
+    np.testing.assert_array_equal(read_state(refs[4], ["rho"])["rho"],
+                                  read_state(output_dir / "state_0004.txt", ["rho"])["rho"])
+    # Ruta tipo <archivo.sphar>/state_XXXX.txt
+    assert read_state(path / "state_0006.txt", ["rho"])["rho"][-1] == pytest.approx(1006.0)
+
+
+def test_remove_source_y_extract(make_run, tmp_path):
+    output_dir = make_run(n_frames=4)
+    originales = {p.name: p.read_bytes() for p in state_files(output_dir)}
+
+    path = archive_run(output_dir, remove_source=True)
+    assert not output_dir.exists()
+
+    dest = open_archive(path).extract(tmp_path / "restaurado")
+    assert {p.name: p.read_bytes() for p in state_files(dest)} == originales
+
+
+def test_no_sobrescribe_sin_overwrite(make_run):
+    output_dir = make_run(n_frames=2)
+    archive_run(output_dir)
+    with pytest.raises(FileExistsError):
+        archive_run(output_dir)
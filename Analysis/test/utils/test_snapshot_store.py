@@ -0,0 +1,76 @@
+# test_snapshot_store.py
+
+import os
+
+import numpy as np
+import pytest
+
+from Analysis.utils.snapshot_store import SnapshotStore, find_store, pack_run
+from Analysis.utils.state_files import read_state, state_files, write_state
+from conftest import frame_data
+
+
+def test_pack_y_lectura(make_run):
+    output_dir = make_run(n_frames=4, rho=lambda s: 1000.0 + s)
+    store = SnapshotStore(pack_run(output_dir))
+
+    assert store.n_frames == 4
+    assert list(store.steps) == [0, 1, 2, 3]
+    np.testing.assert_allclose(store.field("rho")[:, 0], [1000, 1001, 1002, 1003])
+    frame = read_state(state_files(output_dir)[2])
+    for c in store.columns:
+        np.testing.assert_allclose(store.frame(2)[c], frame[c])
+
+
+def test_find_store_exige_columnas(make_run):
+    """Un almacén sin 'rho' no sirve para el análisis de densidad."""
+    output_dir = make_run(n_frames=3)
+    pack_run(output_dir, columns=["id", "posx", "posy"])
+
+    assert find_store(output_dir) is not None
+    assert find_store(output_dir, columns=["id", "posx"]) is not None
+    assert find_store(output_dir, columns=["rho"]) is None
+
+
+def test_find_store_detecta_frames_reescritos(make_run):
+    """Mismo número de frames pero un archivo reescrito: el almacén está viejo."""
+    output_dir = make_run(n_frames=3)
+    pack_run(output_dir)
+    assert find_store(output_dir) is not None
+
+    archivo = state_files(output_dir)[1]
+    st = archivo.stat()
+    os.utime(archivo, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert find_store(output_dir) is None
+
+
+def test_analisis_de_densidad_con_almacen_sin_rho(make_run):
+    """Con un almacén sin rho se vuelve al caché de reducciones, sin KeyError."""
+    from Analysis.utils.estabilization_calculus import analyze_density_simulation
+
+    output_dir = make_run(n_frames=40, rho=lambda s: 1000.0 + 20 * np.sin(s / 3))
+    opciones = dict(window_length=5, polyorder=2, prominence=5, min_peak_distance=1, workers=1)
+    esperado = analyze_density_simulation(output_dir, **opciones)
+
+    pack_run(output_dir, columns=["id", "posx"])
+    result = analyze_density_simulation(output_dir, **opciones)
+    np.testing.assert_allclose(result["rho_avg"], esperado["rho_avg"])
+    np.testing.assert_array_equal(result["peaks_filtered"], esperado["peaks_filtered"])
+
+
+def test_overwrite_fallido_conserva_el_almacen(make_run):
+    """Si el nuevo pack falla, el almacén anterior sigue intacto."""
+    output_dir = make_run(n_frames=3, rho=1000.0)
+    store_dir = pack_run(output_dir)
+
+    write_state(output_dir / "state_0003.txt", frame_data(3, n_fluid=5))
+    with pytest.raises(ValueError):
+        pack_run(output_dir, overwrite=True)
+    assert SnapshotStore(store_dir).n_frames == 3
+    assert [p.name for p in store_dir.parent.iterdir() if p.name.startswith(store_dir.name)] \
+        == [store_dir.name]
+
+    write_state(output_dir / "state_0003.txt", frame_data(3, rho=1500.0))
+    assert SnapshotStore(pack_run(output_dir, overwrite=True)).field("rho")[3].max() == 1500.0
+    with pytest.raises(FileExistsError):
+        pack_run(output_dir)
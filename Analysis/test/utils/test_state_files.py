@@ -0,0 +1,49 @@
+# test_state_files.py
+
+import numpy as np
+import pytest
+
+from Analysis.utils.state_files import (
+    DYNAMIC_COLUMNS, STATE_COLUMNS, STATIC_FILE, read_state, state_files, write_state
+)
+from conftest import frame_data
+
+
+def test_orden_numerico_de_pasos(tmp_path):
+    for step in (2, 10000, 30):
+        write_state(tmp_path / f"state_{step}.txt", frame_data(step))
+    (tmp_path / "state_final.txt").write_text("")
+    assert [p.name for p in state_files(tmp_path)] == [
+        "state_2.txt", "state_30.txt", "state_10000.txt"
+    ]
+
+
+def test_modo_dedup_reconstruye_el_frame_completo(tmp_path):
+    full_dir, dedup_dir = tmp_path / "full", tmp_path / "dedup"
+    full_dir.mkdir()
+    dedup_dir.mkdir()
+
+    for step in range(3):
+        data = frame_data(step, rho=1000.0 + step)
+        data["rho"][:4] = 1000.0              # la frontera no cambia entre pasos
+        data["pressure"][:4] = 7.0
+        write_state(full_dir / f"state_{step:04d}.txt", data)
+        if step == 0:
+            write_state(dedup_dir / STATIC_FILE, data)
+        write_state(dedup_dir / f"state_{step:04d}.txt", data,
+                    columns=DYNAMIC_COLUMNS, rows=data["type"] == 0)
+
+    for full, dedup in zip(state_files(full_dir), state_files(dedup_dir)):
+        a, b = read_state(full), read_state(dedup)
+        for c in STATE_COLUMNS:
+            np.testing.assert_array_equal(a[c], b[c], err_msg=c)
+
+    sub = read_state(dedup_dir / "state_0002.txt", ["id", "rho", "mass"])
+    assert list(sub) == ["id", "rho", "mass"]
+    assert sub["rho"][-1] == pytest.approx(1002.0)
+
+
+def test_columna_desconocida(tmp_path):
+    write_state(tmp_path / "state_0000.txt", frame_data(0))
+    with pytest.raises(ValueError):
+        read_state(tmp_path / "state_0000.txt", ["densidad"])
@@ -0,0 +1,73 @@
+# test_trajectories.py
+
+import numpy as np
+
+from Analysis.utils.snapshot_store import pack_run
+from Analysis.utils.state_files import read_state, state_files, write_state
+from Analysis.utils.trajectories import (
+    TrajectoryIndex, build_trajectory_index, load_trajectory_index, track_particles
+)
+from conftest import frame_data
+
+
+def test_indice_coincide_con_los_frames(make_run):
+    output_dir = make_run(n_frames=9, rho=lambda s: 1000.0 + s)
+    index = TrajectoryIndex(build_trajectory_index(output_dir, workers=1))
+
+    assert list(index.steps) == list(range(9))
+    for i, archivo in enumerate(state_files(output_dir)):
+        data = read_state(archivo)
+        rows = index.rows(data["id"])
+        for c in index.fields:
+            np.testing.assert_allclose(index.field(c)[rows, i], data[c])
+
+
+def test_pool_y_secuencial_dan_lo_mismo(make_run, tmp_path):
+    """Un solo pool con varios workers escribe el mismo índice que workers=1."""
+    output_dir = make_run(n_frames=11, rho=lambda s: 1000.0 + 2 * s)
+    uno = TrajectoryIndex(build_trajectory_index(output_dir, index_dir=tmp_path / "uno", workers=1))
+    dos = TrajectoryIndex(build_trajectory_index(output_dir, index_dir=tmp_path / "dos", workers=2))
+    for c in uno.fields:
+        np.testing.assert_array_equal(uno.field(c), dos.field(c))
+
+
+def test_desde_almacen_columnar(make_run, tmp_path):
+    output_dir = make_run(n_frames=5, rho=lambda s: 1000.0 + s)
+    texto = TrajectoryIndex(build_trajectory_index(output_dir, index_dir=tmp_path / "t", workers=1))
+    pack_run(output_dir)
+    almacen = TrajectoryIndex(build_trajectory_index(output_dir, index_dir=tmp_path / "a"))
+    for c in texto.fields:
+        np.testing.assert_allclose(almacen.field(c), texto.field(c))
+
+
+def test_particula_ausente_queda_nan(tmp_path):
+    output_dir = tmp_path / "Output"
+    output_dir.mkdir()
+    for step in range(3):
+        data = frame_data(step)
+        if step == 1:
+            data = {c: v[:-1] for c, v in data.items()}   # falta la última partícula
+        write_state(output_dir / f"state_{step:04d}.txt", data)
+
+    traj = track_particles(output_dir, [15], fields=["posy"], workers=1)
+    assert np.isnan(traj["posy"][0, 1])
+    assert np.isfinite(traj["posy"][0, [0, 2]]).all()
+
+
+def test_indice_se_reconstruye_con_frames_nuevos(make_run):
+    output_dir = make_run(n_frames=3)
+    assert len(load_trajectory_index(output_dir, workers=1).steps) == 3
+    write_state(output_dir / "state_0003.txt", frame_data(3))
+    assert len(load_trajectory_index(output_dir, workers=1).steps) == 4
+
+
+def test_corrida_repetida_en_la_misma_carpeta(make_run):
+    """Mismo número de frames y mismo último archivo, pero otra corrida."""
+    output_dir = make_run(n_frames=3, rho=1000.0)
+    index = load_trajectory_index(output_dir, ["rho"], workers=1)
+    assert np.all(index.field("rho")[:] == 1000.0)
+
+    for step in range(3):
+        write_state(output_dir / f"state_{step:04d}.txt", frame_data(step, rho=1200.0))
+    index = load_trajectory_index(output_dir, ["rho"], workers=1)
+    assert np.all(index.field("rho")[:] == 1200.0)
@@ -0,0 +1,165 @@
+import json
+import os
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from .parallel_frames import map_frames
+from .state_files import STATE_COLUMNS, state_files
+
+
+CACHE_FORMAT_VERSION = 1
+CACHE_SUFFIX = "_ranges.json"
+
+# Cuantiles guardados por frame (0%, 1%, ..., 100%): con ellos se combinan
+# percentiles de toda la corrida sin volver a leer los archivos.
+QUANTILES = np.linspace(0.0, 1.0, 101)
+
+# Variables derivadas: nombre -> columnas que se leen
+DERIVED = {"vel": ["velx", "vely"]}
+
+
+def default_cache_path(output_dir):
+    """Ubicación por defecto del caché: archivo hermano '<Output>_ranges.json'."""
+    output_dir = Path(output_dir)
+    return output_dir.parent / f"{output_dir.name}{CACHE_SUFFIX}"
+
+
+def variable_values(data, variable):
+    """Valores de una columna o variable derivada ('vel' = |v|)."""
+    if variable == "vel":
+        return np.hypot(data["velx"], data["vely"])
+    return data[variable]
+
+
+def frame_range(data, variable):
+    """Conteo, mínimo, máximo y cuantiles de una variable en un frame (solo valores finitos)."""
+    x = variable_values(data, variable)
+    x = x[np.isfinite(x)]
+    if len(x) == 0:
+        return {"n": 0, "min": None, "max": None, "q": None}
+    return {
+        "n": int(len(x)),
+        "min": float(x.min()),
+        "max": float(x.max()),
+        "q": np.quantile(x, QUANTILES).tolist(),
+    }
+
+
+def _load_cache(cache_path):
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if cache.get("format_version") != CACHE_FORMAT_VERSION:
+        return {}
+    return cache.get("variables", {})
+
+
+def _save_cache(cache_path, variables):
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"format_version": CACHE_FORMAT_VERSION, "variables": variables}, f)
+    os.replace(tmp_path, cache_path)
+
+
+def _merged_percentile(entries, p):
+    """
+    Percentil p (0–100) de toda la corrida combinando los cuantiles de cada
+    frame, ponderados por su número de valores. El error en rango es de a
+    lo sumo 1 % (la separación entre cuantiles guardados).
+    """
+    points = np.concatenate([e["q"] for e in entries])
+    weights = np.concatenate([np.full(len(QUANTILES), e["n"] / len(QUANTILES)) for e in entries])
+    order = np.argsort(points, kind="stable")
+    cum = np.cumsum(weights[order])
+    idx = np.searchsorted(cum, p / 100.0 * cum[-1], side="left")
+    return float(points[order][min(idx, len(points) - 1)])
+
+
+def column_range(output_dir, variable, percentiles=None, cache_path=None,
+                 refresh=False, workers=None):
+    """
+    Rango de una variable sobre todos los frames de una corrida, con caché
+    incremental por frame (igual que frame_reductions): solo se parsean
+    los frames nuevos o modificados y solo la(s) columna(s) necesaria(s).
+
+    Parámetros
+    ----------
+    output_dir : Path
+        Carpeta 'Output' con los state_*.txt (o archivo .sphar).
+    variable : str
+        Columna de STATE_COLUMNS o variable derivada ('vel').
+    percentiles : tuple[float, float] | None
+        Si se indica, p.ej. (1, 99), también se devuelve el rango entre
+        esos percentiles (menos sensible a partículas aisladas).
+    cache_path : Path | None
+        Por defecto '<Output>_ranges.json'.
+    refresh : bool
+        Ignorar el caché y recalcular.
+    workers : int | None
+        Procesos para parsear (ver map_frames).
+
+    Returns
+    -------
+    dict
+        {"min", "max", "n_frames", "n_values"} y, con percentiles,
+        "p_low"/"p_high".
+    """
+    if variable not in STATE_COLUMNS and variable not in DERIVED:
+        raise ValueError(f"Variable no reconocida: {variable}")
+
+    output_dir = Path(output_dir)
+    cache_path = Path(cache_path) if cache_path is not None else default_cache_path(output_dir)
+
+    archivos = state_files(output_dir)
+    if not archivos:
+        raise FileNotFoundError(f"No se encontraron archivos state_*.txt en {output_dir}")
+
+    variables = {} if refresh else _load_cache(cache_path)
+    cached = variables.get(variable, {})
+    frames = {}
+    pending = []
+
+    for archivo in archivos:
+        st = archivo.stat()
+        entry = cached.get(archivo.name)
+        if (entry is None or entry["mtime_ns"] != st.st_mtime_ns
+                or entry["size"] != st.st_size):
+            pending.append((archivo, st))
+            entry = None
+        frames[archivo.name] = entry
+
+    if pending:
+        rangos = map_frames(
+            output_dir, partial(frame_range, variable=variable),
+            columns=DERIVED.get(variable, [variable]),
+            workers=workers, files=[a for a, _ in pending], stack=False
+        )
+        for (archivo, st), entry in zip(pending, rangos):
+            entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+            frames[archivo.name] = entry
+
+    if pending or len(frames) != len(cached):
+        variables[variable] = frames
+        _save_cache(cache_path, variables)
+
+    entries = [e for e in frames.values() if e["n"]]
+    if not entries:
+        raise RuntimeError(f"No hay valores finitos de {variable} en {output_dir}")
+
+    result = {
+        "min": min(e["min"] for e in entries),
+        "max": max(e["max"] for e in entries),
+        "n_frames": len(frames),
+        "n_values": sum(e["n"] for e in entries),
+    }
+    if percentiles is not None:
+        low, high = percentiles
+        result["p_low"] = _merged_percentile(entries, low)
+        result["p_high"] = _merged_percentile(entries, high)
+    return result
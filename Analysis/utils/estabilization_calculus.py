@@ -1,25 +1,28 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
-import glob
-import os
 from scipy.signal import find_peaks, savgol_filter
 
+from .frame_reductions import frame_reductions
+from .snapshot_store import find_store
+
 
 def analyze_density_simulation(sim_folder: Path,
                                window_length=151,
                                polyorder=3,
                                prominence=5,
                                min_peak_distance=50,
-                               variation_threshold=1.0):
+                               variation_threshold=1.0,
+                               refresh_cache=False,
+                               workers=None):
     """
     Ejecuta todo el análisis de ondas de densidad sobre carpetas de simulación SPH.
     
     Parámetros
     ----------
     sim_folder : Path
-        Carpeta que contiene el folder 'Output' con los archivos state_*.txt.
+        Carpeta que contiene el folder 'Output' con los archivos state_*.txt,
+        o archivo .sphar generado con run_archive.
     window_length : int
         Longitud de ventana para el suavizado Savitzky-Golay.
     polyorder : int
@@ -30,6 +33,10 @@ def analyze_density_simulation(sim_folder: Path,
         Separación mínima entre picos filtrados (en índices).
     variation_threshold : float
         Porcentaje (en %) por debajo del cual se considera que la amplitud es estable.
+    refresh_cache : bool
+        Si True recalcula el caché de reducciones por frame desde cero.
+    workers : int | None
+        Procesos para parsear los frames que no están en caché.
     
     Returns
     -------
@@ -49,22 +56,21 @@ def analyze_density_simulation(sim_folder: Path,
     """
 
     output_folder = sim_folder
-    archivos = sorted(glob.glob(os.path.join(output_folder, "state_*.txt")))
-    
-    if not archivos:
-        raise FileNotFoundError(f"No se encontraron archivos state_*.txt en {output_folder}")
-
-    promedios_rho = []
-    indices = []
-
-    for archivo in archivos:
-        df = pd.read_csv(archivo, sep=r"\s+", header=0)
-        promedios_rho.append(df["rho"].mean())
-        idx = int(os.path.basename(archivo).split("_")[1].split(".")[0])
-        indices.append(idx)
 
-    y = np.array(promedios_rho)
-    t = np.array(indices)
+    # Si la corrida ya fue empaquetada en un almacén columnar, se usa
+    # directamente sin volver a parsear los archivos de texto (si está al
+    # día y tiene 'rho'; si no, se usa el caché de reducciones).
+    store = find_store(output_folder, columns=["rho"])
+    if store is not None:
+        y = np.asarray(store.field("rho")).mean(axis=1)
+        t = np.asarray(store.steps)
+    else:
+        # Caché incremental de reducciones por frame: solo se parsean los
+        # archivos nuevos o modificados desde la última llamada.
+        reducciones = frame_reductions(output_folder, refresh=refresh_cache,
+                                       workers=workers)
+        y = reducciones["rho_mean"].to_numpy()
+        t = reducciones["step"].to_numpy()
 
     y_smooth = savgol_filter(y, window_length=window_length, polyorder=polyorder)
 
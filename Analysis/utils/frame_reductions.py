@@ -0,0 +1,194 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .parallel_frames import map_frames
+from .state_files import state_files, step_from_name
+
+
+CACHE_FORMAT_VERSION = 2
+CACHE_SUFFIX = "_reductions.json"
+
+# Columnas necesarias para calcular todas las reducciones
+REDUCTION_COLUMNS = ["posx", "posy", "velx", "vely", "rho", "mass", "pressure", "type"]
+
+
+def default_cache_path(output_dir):
+    """Ubicación por defecto del caché: archivo hermano '<Output>_reductions.json'."""
+    output_dir = Path(output_dir)
+    return output_dir.parent / f"{output_dir.name}{CACHE_SUFFIX}"
+
+
+def _stat(x):
+    """min/max/mean robustos a arreglos vacíos o con NaN."""
+    x = x[np.isfinite(x)]
+    if len(x) == 0:
+        return None, None, None
+    return float(x.min()), float(x.max()), float(x.mean())
+
+
+def reduce_frame(data):
+    """
+    Reducciones escalares de un frame.
+
+    Parámetros
+    ----------
+    data : dict
+        {columna: np.ndarray} con al menos REDUCTION_COLUMNS.
+
+    Returns
+    -------
+    dict
+        Densidad y presión (todas las partículas y solo fluido), conteos,
+        energía cinética y velocidad máxima del fluido, caja envolvente del
+        fluido y número de valores no finitos.
+    """
+    fluid = data["type"] == 0
+
+    rho_min, rho_max, rho_mean = _stat(data["rho"])
+    rho_fluid_min, rho_fluid_max, rho_fluid_mean = _stat(data["rho"][fluid])
+    p_min, p_max, p_mean = _stat(data["pressure"])
+
+    vx, vy = data["velx"][fluid], data["vely"][fluid]
+    v2 = vx * vx + vy * vy
+    finite_v2 = v2[np.isfinite(v2)]
+
+    xmin, xmax, _ = _stat(data["posx"][fluid])
+    ymin, ymax, _ = _stat(data["posy"][fluid])
+
+    n_nan = int(sum(
+        np.count_nonzero(~np.isfinite(data[c]))
+        for c in ("posx", "posy", "velx", "vely", "rho", "pressure")
+    ))
+
+    return {
+        "n_particles": int(len(fluid)),
+        "n_fluid": int(np.count_nonzero(fluid)),
+        "rho_mean": rho_mean,
+        "rho_min": rho_min,
+        "rho_max": rho_max,
+        "rho_fluid_mean": rho_fluid_mean,
+        "rho_fluid_min": rho_fluid_min,
+        "rho_fluid_max": rho_fluid_max,
+        "pressure_mean": p_mean,
+        "pressure_min": p_min,
+        "pressure_max": p_max,
+        "kinetic_energy": float(0.5 * np.nansum(data["mass"][fluid] * v2)),
+        "vel_max": float(np.sqrt(finite_v2.max())) if len(finite_v2) else None,
+        "fluid_xmin": xmin,
+        "fluid_xmax": xmax,
+        "fluid_ymin": ymin,
+        "fluid_ymax": ymax,
+        "n_nan": n_nan,
+    }
+
+
+def _load_cache(cache_path):
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if cache.get("format_version") != CACHE_FORMAT_VERSION:
+        return {}
+    return cache.get("frames", {})
+
+
+def _save_cache(cache_path, frames):
+    # Escritura atómica: nunca queda un caché truncado si se interrumpe
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"format_version": CACHE_FORMAT_VERSION, "frames": frames}, f)
+    os.replace(tmp_path, cache_path)
+
+
+def frame_reductions(output_dir, cache_path=None, refresh=False, workers=None):
+    """
+    Tabla de reducciones por frame con caché incremental en disco.
+
+    Cada entrada del caché se indexa por nombre de archivo y se valida con
+    su mtime y tamaño: solo se parsean los frames nuevos o modificados, de
+    modo que re-analizar una corrida terminada no lee ningún state_*.txt y
+    re-analizar una en curso solo lee la cola nueva.
+
+    Parámetros
+    ----------
+    output_dir : Path
+        Carpeta 'Output' con los archivos state_*.txt.
+    cache_path : Path | None
+        Archivo de caché. Por defecto '<Output>_reductions.json'.
+    refresh : bool
+        Si True ignora el caché existente y recalcula todo.
+    workers : int | None
+        Procesos para parsear los frames pendientes (ver map_frames).
+
+    Returns
+    -------
+    pd.DataFrame
+        Una fila por frame, ordenada por 'step'.
+    """
+    output_dir = Path(output_dir)
+    cache_path = Path(cache_path) if cache_path is not None else default_cache_path(output_dir)
+
+    archivos = state_files(output_dir)
+    if not archivos:
+        raise FileNotFoundError(f"No se encontraron archivos state_*.txt en {output_dir}")
+
+    cached = {} if refresh else _load_cache(cache_path)
+    frames = {}
+    pending = []
+
+    for archivo in archivos:
+        st = archivo.stat()
+        entry = cached.get(archivo.name)
+        if (entry is None or entry["mtime_ns"] != st.st_mtime_ns
+                or entry["size"] != st.st_size):
+            pending.append((archivo, st))
+            entry = None
+        frames[archivo.name] = entry
+
+    if pending:
+        reducciones = map_frames(
+            output_dir, reduce_frame, columns=REDUCTION_COLUMNS,
+            workers=workers, files=[a for a, _ in pending], stack=False
+        )
+        for (archivo, st), entry in zip(pending, reducciones):
+            entry.update(step=step_from_name(archivo),
+                         mtime_ns=st.st_mtime_ns, size=st.st_size)
+            frames[archivo.name] = entry
+
+    # Frames borrados por una política de retención: sus reducciones se conservan
+    for name, entry in cached.items():
+        if entry.get("pruned") and name not in frames:
+            frames[name] = entry
+
+    # Se reescribe también si desaparecieron frames del directorio
+    if pending or len(frames) != len(cached):
+        _save_cache(cache_path, frames)
+
+    df = pd.DataFrame(frames.values()).drop(columns=["mtime_ns", "size", "pruned"],
+                                             errors="ignore")
+    df = df[["step"] + [c for c in df.columns if c != "step"]]
+    return df.sort_values("step").reset_index(drop=True)
+
+
+def mark_pruned(output_dir, names, cache_path=None):
+    """
+    Marca frames del caché como eliminados a propósito (p.ej. por
+    Config/Pipeline/retention.py): frame_reductions los sigue devolviendo
+    aunque su state_*.txt ya no exista. Debe llamarse con el caché al día.
+    """
+    output_dir = Path(output_dir)
+    cache_path = Path(cache_path) if cache_path is not None else default_cache_path(output_dir)
+    frames = _load_cache(cache_path)
+    missing = [n for n in names if n not in frames]
+    if missing:
+        raise KeyError(f"Frames sin reducciones en el caché: {missing[:5]}")
+    for name in names:
+        frames[name]["pruned"] = True
+    _save_cache(cache_path, frames)
@@ -0,0 +1,98 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+
+from .state_files import read_state, state_files, step_from_name
+
+
+def default_workers():
+    """Número de CPUs disponibles para este proceso."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def frame_data(data):
+    """fn identidad para map_frames: devuelve las columnas parseadas tal cual."""
+    return data
+
+
+def _run_chunk(paths, fn, columns):
+    return [fn(read_state(p, columns)) for p in paths]
+
+
+def stack_results(results):
+    """
+    Apila los resultados por frame en arreglos numpy.
+
+    - Si fn devuelve dicts, se devuelve {clave: arreglo apilado}.
+    - Si devuelve escalares o arreglos, se devuelve un único arreglo cuya
+      primera dimensión es el frame.
+    """
+    if not results:
+        return np.array([])
+    if isinstance(results[0], dict):
+        return {k: np.asarray([r[k] for r in results]) for k in results[0]}
+    return np.stack([np.asarray(r) for r in results])
+
+
+def map_frames(run_dir, fn, columns=None, workers=None, chunksize=None,
+               files=None, stack=True, return_steps=False):
+    """
+    Aplica fn a cada frame de una corrida repartiendo el parseo en un pool
+    de procesos.
+
+    Los frames se agrupan en bloques consecutivos que se envían a los
+    workers; el orden de los resultados es siempre el de los pasos.
+
+    Parámetros
+    ----------
+    run_dir : Path
+        Carpeta 'Output' con los archivos state_*.txt (o archivo .sphar).
+    fn : callable
+        fn(data) -> resultado, con data = {columna: np.ndarray}. Debe ser
+        una función definida a nivel de módulo (se envía por pickle).
+    columns : list[str] | None
+        Columnas a parsear; leer solo las necesarias reduce el costo.
+    workers : int | None
+        Procesos a usar (por defecto todas las CPUs disponibles).
+        Con workers=1 todo se ejecuta en el proceso actual.
+    chunksize : int | None
+        Frames por bloque (por defecto ~4 bloques por worker).
+    files : list[Path] | None
+        Subconjunto explícito de archivos a procesar, en lugar de todos
+        los state_*.txt de run_dir.
+    stack : bool
+        Si True apila los resultados con stack_results; si False devuelve
+        la lista de resultados por frame.
+    return_steps : bool
+        Si True devuelve (steps, resultados).
+    """
+    if files is None:
+        files = state_files(run_dir)
+    else:
+        files = [Path(f) if isinstance(f, str) else f for f in files]
+    if not files:
+        raise FileNotFoundError(f"No se encontraron archivos state_*.txt en {run_dir}")
+
+    workers = default_workers() if workers is None else max(1, int(workers))
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(files) / (workers * 4)))
+    chunks = [files[i:i + chunksize] for i in range(0, len(files), chunksize)]
+
+    if workers == 1 or len(chunks) == 1:
+        results = [r for chunk in chunks for r in _run_chunk(chunk, fn, columns)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            parts = pool.map(_run_chunk, chunks, repeat(fn), repeat(columns))
+            results = [r for part in parts for r in part]
+
+    if stack:
+        results = stack_results(results)
+    if return_steps:
+        return np.array([step_from_name(f) for f in files]), results
+    return results
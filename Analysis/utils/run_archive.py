@@ -0,0 +1,331 @@
+import argparse
+import io
+import json
+import lzma
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from .state_files import (
+    STATE_COLUMNS, STATIC_FILE, _read_columns, assemble_dedup, state_files, step_from_name
+)
+
+
+ARCHIVE_FORMAT_VERSION = 1
+ARCHIVE_SUFFIX = ".sphar"
+MAGIC = b"SPHARCH1"
+_FOOTER = struct.Struct("<QQ")   # (offset del índice, longitud del índice)
+
+CODECS = {
+    "zlib": (lambda raw, level: zlib.compress(raw, level), zlib.decompress),
+    "lzma": (lambda raw, level: lzma.compress(raw, preset=level), lzma.decompress),
+}
+
+# Bloques descomprimidos que se mantienen en memoria por archivo abierto
+_BLOCK_CACHE_SIZE = 4
+
+_open_archives = {}
+
+
+class FrameStat(NamedTuple):
+    st_mtime_ns: int
+    st_size: int
+
+
+class ArchiveFrame(NamedTuple):
+    """
+    Referencia a un frame dentro de un archivo .sphar.
+
+    Imita lo que los lectores usan de una ruta (name, stat()) para que
+    state_files/read_state/map_frames funcionen igual sobre una carpeta o
+    sobre un archivo comprimido. Es serializable para el pool de procesos.
+    """
+    archive: str
+    name: str
+
+    def stat(self):
+        archive = open_archive(self.archive)
+        return FrameStat(archive.mtime_ns, archive.members[self.name][2])
+
+
+def default_archive_path(output_dir):
+    """Ubicación por defecto: archivo hermano '<Output>.sphar'."""
+    output_dir = Path(output_dir)
+    return output_dir.parent / f"{output_dir.name}{ARCHIVE_SUFFIX}"
+
+
+def is_archive(path):
+    path = Path(path)
+    if not path.is_file():
+        return False
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def open_archive(path):
+    """RunArchive abierto para path, reutilizado mientras el archivo no cambie."""
+    path = Path(path).resolve()
+    key = (str(path), path.stat().st_mtime_ns)
+    if key not in _open_archives:
+        for old in [k for k in _open_archives if k[0] == key[0]]:
+            _open_archives.pop(old).close()
+        _open_archives[key] = RunArchive(path)
+    return _open_archives[key]
+
+
+def archive_run(output_dir, archive_path=None, frames_per_block=32,
+                codec="zlib", level=6, remove_source=False, overwrite=False):
+    """
+    Empaqueta los state_*.txt (y static_state.txt en modo 'dedup') de una
+    corrida terminada en un único archivo con bloques comprimidos.
+
+    Cada bloque agrupa frames_per_block frames consecutivos; un índice al
+    final del archivo ubica cada frame (bloque, desplazamiento, longitud),
+    así que leer un frame solo descomprime su bloque.
+
+    Parámetros
+    ----------
+    output_dir : Path
+        Carpeta 'Output' de la simulación.
+    archive_path : Path | None
+        Archivo destino. Por defecto '<Output>.sphar'.
+    frames_per_block : int
+        Frames por bloque comprimido (compromiso entre razón de compresión
+        y costo de acceso aleatorio).
+    codec : str
+        "zlib" o "lzma".
+    level : int
+        Nivel de compresión del codec.
+    remove_source : bool
+        Si True, tras verificar el archivo se borran los archivos de texto
+        originales (libera espacio e inodos).
+    overwrite : bool
+        Si False y el archivo ya existe, lanza FileExistsError.
+
+    Returns
+    -------
+    Path
+        Ruta del archivo generado.
+    """
+    output_dir = Path(output_dir)
+    archive_path = (Path(archive_path) if archive_path is not None
+                    else default_archive_path(output_dir))
+
+    if codec not in CODECS:
+        raise ValueError(f"Codec desconocido: {codec}. Opciones válidas: {list(CODECS)}")
+    compress, _ = CODECS[codec]
+
+    archivos = state_files(output_dir)
+    if not archivos:
+        raise FileNotFoundError(f"No se encontraron archivos state_*.txt en {output_dir}")
+
+    if archive_path.exists() and not overwrite:
+        raise FileExistsError(f"El archivo ya existe: {archive_path}")
+
+    # El estado estático va en su propio bloque: se lee una vez por archivo
+    groups = []
+    static_path = output_dir / STATIC_FILE
+    if static_path.exists():
+        groups.append([static_path])
+    groups += [archivos[i:i + frames_per_block]
+               for i in range(0, len(archivos), frames_per_block)]
+
+    tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+    members = {}
+    blocks = []
+    raw_total = 0
+
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        for group in groups:
+            datos = [(p.name, p.read_bytes()) for p in group]
+            raw = b"".join(d for _, d in datos)
+            comp = compress(raw, level)
+
+            blocks.append([f.tell(), len(comp), len(raw)])
+            pos = 0
+            for name, d in datos:
+                members[name] = [len(blocks) - 1, pos, len(d), zlib.crc32(d)]
+                pos += len(d)
+            f.write(comp)
+            raw_total += len(raw)
+
+        index = json.dumps({
+            "format_version": ARCHIVE_FORMAT_VERSION,
+            "codec": codec,
+            "source": str(output_dir.resolve()),
+            "frames": [p.name for p in archivos],
+            "blocks": blocks,
+            "members": members,
+        }).encode()
+        index_offset = f.tell()
+        f.write(index)
+        f.write(_FOOTER.pack(index_offset, len(index)))
+        f.write(MAGIC)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, archive_path)
+
+    size = archive_path.stat().st_size
+    print(f"[✓] Archivo generado: {archive_path} ({len(archivos)} frames, "
+          f"{raw_total / 1e6:.1f} MB → {size / 1e6:.1f} MB)")
+
+    if remove_source:
+        # Verificar todo antes de borrar nada
+        archive = RunArchive(archive_path)
+        for name in members:
+            archive.read_bytes(name)
+        archive.close()
+
+        for p in archivos + ([static_path] if static_path.exists() else []):
+            p.unlink()
+        if not any(output_dir.iterdir()):
+            output_dir.rmdir()
+        print(f"[✓] Archivos de texto originales eliminados de {output_dir}")
+
+    return archive_path
+
+
+class RunArchive:
+    """Lector con acceso aleatorio por frame de un archivo .sphar."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        # os.pread no depende de la posición del descriptor, así que el
+        # archivo puede leerse desde procesos hijos creados con fork.
+        self._fd = os.open(self.path, os.O_RDONLY)
+        st = os.fstat(self._fd)
+        self.mtime_ns = st.st_mtime_ns
+
+        tail_len = _FOOTER.size + len(MAGIC)
+        tail = os.pread(self._fd, tail_len, st.st_size - tail_len)
+        if os.pread(self._fd, len(MAGIC), 0) != MAGIC or tail[_FOOTER.size:] != MAGIC:
+            os.close(self._fd)
+            raise ValueError(f"No es un archivo de corrida válido: {self.path}")
+
+        index_offset, index_len = _FOOTER.unpack(tail[:_FOOTER.size])
+        self.index = json.loads(os.pread(self._fd, index_len, index_offset))
+        if self.index.get("format_version") != ARCHIVE_FORMAT_VERSION:
+            os.close(self._fd)
+            raise ValueError(
+                f"Versión de archivo no soportada: {self.index.get('format_version')}"
+            )
+
+        self.members = self.index["members"]
+        self.frames = self.index["frames"]
+        self.steps = np.array([step_from_name(n) for n in self.frames], dtype=np.int64)
+        self._decompress = CODECS[self.index["codec"]][1]
+        self._blocks = OrderedDict()
+        self._static = None
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        self.close()
+
+    def __len__(self):
+        return len(self.frames)
+
+    # ---------------------------------------------------------
+    def _block(self, i):
+        if i in self._blocks:
+            self._blocks.move_to_end(i)
+            return self._blocks[i]
+
+        offset, comp_len, raw_len = self.index["blocks"][i]
+        raw = self._decompress(os.pread(self._fd, comp_len, offset))
+        if len(raw) != raw_len:
+            raise ValueError(f"Bloque {i} corrupto en {self.path}")
+
+        self._blocks[i] = raw
+        if len(self._blocks) > _BLOCK_CACHE_SIZE:
+            self._blocks.popitem(last=False)
+        return raw
+
+    def read_bytes(self, name):
+        """Contenido original (bytes) de un miembro del archivo."""
+        if name not in self.members:
+            raise KeyError(f"{name} no está en {self.path}")
+        block, pos, length, crc = self.members[name]
+        data = self._block(block)[pos:pos + length]
+        if zlib.crc32(data) != crc:
+            raise ValueError(f"CRC inválido para {name} en {self.path}")
+        return data
+
+    def read_state(self, name, columns=None):
+        """Como state_files.read_state, pero para un frame del archivo."""
+        columns = list(STATE_COLUMNS if columns is None else columns)
+        buffer = io.BytesIO(self.read_bytes(name))
+
+        if STATIC_FILE not in self.members or name == STATIC_FILE:
+            return _read_columns(buffer, columns)
+
+        if self._static is None:
+            static = _read_columns(io.BytesIO(self.read_bytes(STATIC_FILE)), STATE_COLUMNS)
+            self._static = (static, np.argsort(static["id"], kind="stable"))
+        return assemble_dedup(*self._static, buffer, columns)
+
+    def frame_refs(self):
+        """Referencias ArchiveFrame de todos los frames, en orden de paso."""
+        return [ArchiveFrame(str(self.path), name) for name in self.frames]
+
+    def frame_range(self, start=None, stop=None, columns=None):
+        """Itera (step, data) sobre los frames con start <= step < stop."""
+        for name, step in zip(self.frames, self.steps):
+            if (start is None or step >= start) and (stop is None or step < stop):
+                yield int(step), self.read_state(name, columns)
+
+    def extract(self, dest_dir):
+        """Restaura los archivos de texto originales en dest_dir."""
+        dest_dir = Path(dest_dir)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        for name in self.members:
+            (dest_dir / name).write_bytes(self.read_bytes(name))
+        return dest_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Archivo comprimido con acceso aleatorio para corridas terminadas"
+    )
+    parser.add_argument("command", choices=["pack", "extract", "info"],
+                        help="pack: Output → .sphar | extract: .sphar → carpeta | info")
+    parser.add_argument("path", help="Carpeta Output (pack) o archivo .sphar")
+    parser.add_argument("--dest", default=None,
+                        help="Archivo destino (pack) o carpeta destino (extract)")
+    parser.add_argument("--frames_per_block", type=int, default=32)
+    parser.add_argument("--codec", choices=list(CODECS), default="zlib")
+    parser.add_argument("--level", type=int, default=6)
+    parser.add_argument("--remove", action="store_true",
+                        help="Borrar los state_*.txt tras verificar el archivo")
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        archive_run(args.path, args.dest, args.frames_per_block, args.codec,
+                    args.level, args.remove, args.overwrite)
+
+    elif args.command == "extract":
+        archive = RunArchive(args.path)
+        dest = args.dest or Path(args.path).with_suffix("")
+        print(f"[✓] Extraído en {archive.extract(dest)}")
+
+    elif args.command == "info":
+        archive = RunArchive(args.path)
+        print(f"Archivo: {archive.path}")
+        print(f"Frames: {len(archive)} (pasos {archive.steps[0]}–{archive.steps[-1]})")
+        print(f"Bloques: {len(archive.index['blocks'])} ({archive.index['codec']})")
+        print(f"Modo dedup: {STATIC_FILE in archive.members}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import argparse
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .state_files import (
+    STATE_COLUMNS, STATIC_FILE, column_dtype, read_state, state_files, step_from_name
+)
+
+
+STORE_FORMAT_VERSION = 1
+STORE_SUFFIX = "_columnar"
+META_FILE = "meta.json"
+STEPS_FILE = "steps.npy"
+
+
+def default_store_dir(output_dir):
+    """Ubicación por defecto del almacén: carpeta hermana '<Output>_columnar'."""
+    output_dir = Path(output_dir)
+    return output_dir.parent / f"{output_dir.name}{STORE_SUFFIX}"
+
+
+def is_store(path):
+    return (Path(path) / META_FILE).exists()
+
+
+def source_signature(output_dir):
+    """
+    Huella de los archivos de una corrida (nombre, mtime y tamaño de cada
+    state_*.txt y del static_state.txt): cambia si se reescribe cualquier
+    frame aunque el número de frames sea el mismo.
+    """
+    output_dir = Path(output_dir)
+    archivos = list(state_files(output_dir))
+    static_path = output_dir / STATIC_FILE
+    if static_path.exists():
+        archivos.append(static_path)
+
+    h = hashlib.sha1()
+    for archivo in archivos:
+        st = archivo.stat()
+        h.update(f"{archivo.name}:{st.st_mtime_ns}:{st.st_size};".encode())
+    return h.hexdigest()
+
+
+def _write_store(tmp_dir, output_dir, archivos, columns, signature):
+    """Escribe los .npy, steps.npy y meta.json de un almacén en tmp_dir."""
+    first = read_state(archivos[0], columns)
+    n_frames = len(archivos)
+    n_particles = len(first[columns[0]])
+
+    arrays = {
+        c: np.lib.format.open_memmap(
+            tmp_dir / f"{c}.npy", mode="w+",
+            dtype=column_dtype(c), shape=(n_frames, n_particles)
+        )
+        for c in columns
+    }
+
+    steps = np.empty(n_frames, dtype=np.int64)
+    for i, archivo in enumerate(archivos):
+        data = first if i == 0 else read_state(archivo, columns)
+        n = len(data[columns[0]])
+        if n != n_particles:
+            raise ValueError(
+                f"{archivo.name} tiene {n} partículas, se esperaban {n_particles}"
+            )
+        for c in columns:
+            arrays[c][i] = data[c]
+        steps[i] = step_from_name(archivo)
+
+    for arr in arrays.values():
+        arr.flush()
+    del arrays
+
+    np.save(tmp_dir / STEPS_FILE, steps)
+
+    meta = {
+        "format_version": STORE_FORMAT_VERSION,
+        "source": str(output_dir.resolve()),
+        "source_signature": signature,
+        "columns": columns,
+        "dtypes": {c: np.dtype(column_dtype(c)).str for c in columns},
+        "n_frames": n_frames,
+        "n_particles": n_particles,
+    }
+    with open(tmp_dir / META_FILE, "w") as f:
+        json.dump(meta, f, indent=2)
+    return n_frames, n_particles
+
+
+def pack_run(output_dir, store_dir=None, columns=None, overwrite=False):
+    """
+    Empaqueta todos los state_*.txt de una corrida en un almacén columnar.
+
+    Cada campo se guarda como un único arreglo .npy de forma
+    (n_frames, n_particles), contiguo y mapeable en memoria, más un índice
+    'steps.npy' con el paso de cada frame.
+
+    Parámetros
+    ----------
+    output_dir : Path
+        Carpeta 'Output' de la simulación con los archivos state_*.txt.
+    store_dir : Path | None
+        Carpeta destino. Por defecto '<Output>_columnar' junto a output_dir.
+    columns : list[str] | None
+        Campos a empaquetar (por defecto las 13 columnas).
+    overwrite : bool
+        Si False y el almacén ya existe, lanza FileExistsError.
+
+    Returns
+    -------
+    Path
+        Ruta del almacén generado.
+    """
+    output_dir = Path(output_dir)
+    store_dir = Path(store_dir) if store_dir is not None else default_store_dir(output_dir)
+    columns = list(STATE_COLUMNS if columns is None else columns)
+
+    archivos = state_files(output_dir)
+    if not archivos:
+        raise FileNotFoundError(f"No se encontraron archivos state_*.txt en {output_dir}")
+    signature = source_signature(output_dir)
+
+    if store_dir.exists() and not overwrite:
+        raise FileExistsError(f"El almacén ya existe: {store_dir}")
+
+    # Se escribe en una carpeta temporal y se renombra al final para que
+    # un almacén a medio escribir nunca parezca válido. Con overwrite el
+    # almacén anterior sigue en su lugar hasta que el nuevo está completo.
+    tmp_dir = store_dir.with_name(store_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    try:
+        n_frames, n_particles = _write_store(tmp_dir, output_dir, archivos, columns, signature)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Intercambio: el anterior se aparta, el nuevo ocupa su lugar y recién
+    # entonces se borra el anterior
+    if store_dir.exists():
+        old_dir = store_dir.with_name(store_dir.name + ".old")
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+        store_dir.rename(old_dir)
+        tmp_dir.rename(store_dir)
+        shutil.rmtree(old_dir)
+    else:
+        tmp_dir.rename(store_dir)
+
+    print(f"[✓] Almacén columnar generado: {store_dir} "
+          f"({n_frames} frames × {n_particles} partículas)")
+    return store_dir
+
+
+class SnapshotStore:
+    """
+    Lector de un almacén columnar generado con pack_run.
+
+    Los campos se abren como np.memmap de solo lectura: abrir una corrida no
+    lee datos y cualquier rebanada (campo, frame o partícula) se resuelve
+    directamente sobre el archivo.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        meta_path = self.store_dir / META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No es un almacén columnar: {self.store_dir}")
+
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+
+        if self.meta.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Versión de almacén no soportada: {self.meta.get('format_version')}"
+            )
+
+        self.columns = self.meta["columns"]
+        self.steps = np.load(self.store_dir / STEPS_FILE)
+        self._fields = {}
+
+    @property
+    def n_frames(self):
+        return self.meta["n_frames"]
+
+    @property
+    def n_particles(self):
+        return self.meta["n_particles"]
+
+    def __len__(self):
+        return self.n_frames
+
+    def field(self, name):
+        """Arreglo (n_frames, n_particles) del campo pedido, mapeado en memoria."""
+        if name not in self.columns:
+            raise KeyError(f"Campo no disponible en el almacén: {name}")
+        if name not in self._fields:
+            self._fields[name] = np.load(self.store_dir / f"{name}.npy", mmap_mode="r")
+        return self._fields[name]
+
+    def frame_index(self, step):
+        """Fila del almacén correspondiente a un número de paso."""
+        i = int(np.searchsorted(self.steps, step))
+        if i >= len(self.steps) or self.steps[i] != step:
+            raise KeyError(f"Paso {step} no está en el almacén")
+        return i
+
+    def frame(self, i, columns=None):
+        """Frame i como dict {columna: np.ndarray}."""
+        columns = self.columns if columns is None else columns
+        return {c: np.asarray(self.field(c)[i]) for c in columns}
+
+    def frame_df(self, i, columns=None):
+        """Frame i como DataFrame, con las mismas columnas que state_XXXX.txt."""
+        return pd.DataFrame(self.frame(i, columns))
+
+
+def find_store(output_dir, columns=None):
+    """
+    Devuelve el SnapshotStore asociado a output_dir si existe, está al día
+    y tiene las columnas pedidas; si no, None (y el llamador vuelve a los
+    archivos de texto).
+
+    Al día significa que la huella de los state_*.txt (source_signature)
+    coincide con la guardada al empaquetar: un almacén de una corrida
+    rehecha con el mismo número de frames se descarta. Los almacenes sin
+    huella (anteriores a ella) también se descartan.
+    """
+    output_dir = Path(output_dir)
+    if is_store(output_dir):
+        store = SnapshotStore(output_dir)
+    else:
+        store_dir = default_store_dir(output_dir)
+        if not is_store(store_dir):
+            return None
+        store = SnapshotStore(store_dir)
+        if (store.n_frames != len(state_files(output_dir))
+                or store.meta.get("source_signature") != source_signature(output_dir)):
+            return None
+
+    if columns is not None and not all(c in store.columns for c in columns):
+        return None
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Empaqueta los state_*.txt de una corrida en un almacén columnar"
+    )
+    parser.add_argument("output_dir", help="Carpeta Output con los state_*.txt")
+    parser.add_argument("--store_dir", default=None,
+                        help="Carpeta destino (por defecto <Output>_columnar)")
+    parser.add_argument("--columns", nargs="+", default=None,
+                        help="Subconjunto de columnas a empaquetar")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Reemplazar un almacén existente")
+    args = parser.parse_args()
+
+    pack_run(args.output_dir, args.store_dir, args.columns, args.overwrite)
+
+
+if __name__ == "__main__":
+    main()
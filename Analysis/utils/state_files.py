@@ -0,0 +1,176 @@
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# Columnas en el orden exacto en que las escribe printState (outputParticles.cpp)
+STATE_COLUMNS = [
+    "id", "posx", "posy", "velx", "vely", "accelx", "accely",
+    "rho", "mass", "pressure", "h", "internalE", "type"
+]
+
+# Columnas enteras; el resto se maneja como float64
+INT_COLUMNS = {"id": np.int64, "type": np.int8}
+
+# Modo "dedup" del solver (io.snapshot_mode): el estado completo se guarda una
+# vez en static_state.txt y cada state_XXXX.txt trae solo estas columnas
+# del fluido. mass, h y type (y todas las partículas estáticas) salen del
+# archivo estático.
+STATIC_FILE = "static_state.txt"
+DYNAMIC_COLUMNS = [
+    "id", "posx", "posy", "velx", "vely", "accelx", "accely",
+    "rho", "pressure", "internalE"
+]
+
+_static_cache = {}
+
+_STEP_RE = re.compile(r"state_(\d+)\.txt$")
+
+
+def column_dtype(name):
+    """Devuelve el dtype numpy asociado a una columna del estado."""
+    return INT_COLUMNS.get(name, np.float64)
+
+
+def _name(path):
+    return path.name if hasattr(path, "name") else Path(path).name
+
+
+def step_from_name(path):
+    """Extrae el número de paso de un nombre tipo state_XXXX.txt (o -1)."""
+    match = _STEP_RE.search(_name(path))
+    return int(match.group(1)) if match else -1
+
+
+def state_files(folder):
+    """
+    Lista los archivos state_*.txt de una carpeta ordenados por paso
+    numérico (no lexicográfico, para soportar pasos >= 10000).
+
+    'folder' puede ser también un archivo generado por run_archive; en ese
+    caso se devuelven referencias ArchiveFrame, que read_state acepta igual
+    que una ruta.
+    """
+    from .run_archive import is_archive, open_archive
+
+    folder = Path(folder)
+    if is_archive(folder):
+        return open_archive(folder).frame_refs()
+
+    files = [f for f in folder.glob("state_*.txt") if step_from_name(f) >= 0]
+    return sorted(files, key=step_from_name)
+
+
+def _read_columns(path, columns):
+    df = pd.read_csv(
+        path,
+        sep=r"\s+",
+        header=0,
+        usecols=columns,
+        dtype={c: column_dtype(c) for c in columns},
+    )
+    return {c: df[c].to_numpy() for c in columns}
+
+
+def is_dedup(folder):
+    """True si la carpeta fue escrita por el solver en modo 'dedup'."""
+    return (Path(folder) / STATIC_FILE).exists()
+
+
+def read_static(folder):
+    """
+    Lee (y memoriza mientras no cambie) el static_state.txt de una carpeta.
+    Devuelve (data, order) con order = argsort de los ids.
+    """
+    path = Path(folder) / STATIC_FILE
+    key = (str(path.resolve()), path.stat().st_mtime_ns)
+    if key not in _static_cache:
+        _static_cache.clear()
+        data = _read_columns(path, STATE_COLUMNS)
+        _static_cache[key] = (data, np.argsort(data["id"], kind="stable"))
+    return _static_cache[key]
+
+
+def write_state(path, data, columns=None, rows=None):
+    """
+    Escribe un state_XXXX.txt con la cabecera y el formato de printState:
+    id y type enteros, el resto con 10 decimales. Las columnas que falten
+    en data se escriben en cero (data debe traer 'id').
+
+    Con columns=DYNAMIC_COLUMNS y rows = máscara del fluido se obtiene un
+    frame del modo 'dedup'.
+    """
+    columns = list(STATE_COLUMNS if columns is None else columns)
+    n = len(data["id"])
+    values = {c: np.asarray(data[c]) if c in data else np.zeros(n) for c in columns}
+    indices = range(n) if rows is None else np.flatnonzero(rows)
+    with open(path, "w") as f:
+        f.write(" ".join(columns) + "\n")
+        for i in indices:
+            f.write(" ".join(
+                str(int(values[c][i])) if c in INT_COLUMNS else f"{values[c][i]:.10f}"
+                for c in columns
+            ) + "\n")
+
+
+def read_state(path, columns=None):
+    """
+    Lee un archivo state_XXXX.txt y devuelve un dict {columna: np.ndarray}.
+
+    Si la carpeta está en modo 'dedup' el frame se reconstruye completo a
+    partir de static_state.txt, con las mismas filas y orden que escribiría
+    printState, de modo que los consumidores no notan la diferencia.
+
+    Parámetros
+    ----------
+    path : str | Path
+        Archivo de estado (13 columnas con cabecera).
+    columns : list[str] | None
+        Columnas a leer. Si es None se leen todas. Leer sólo las columnas
+        necesarias evita convertir texto que luego se descarta.
+    """
+    columns = list(STATE_COLUMNS if columns is None else columns)
+    unknown = [c for c in columns if c not in STATE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Columnas no reconocidas: {unknown}")
+
+    from .run_archive import ArchiveFrame, is_archive, open_archive
+
+    if isinstance(path, ArchiveFrame):
+        return open_archive(path.archive).read_state(path.name, columns)
+
+    path = Path(path)
+    # Ruta tipo <archivo.sphar>/state_XXXX.txt: miembro de un archivo comprimido
+    if not path.exists() and is_archive(path.parent):
+        return open_archive(path.parent).read_state(path.name, columns)
+
+    if path.name == STATIC_FILE or not is_dedup(path.parent):
+        return _read_columns(path, columns)
+
+    static, order = read_static(path.parent)
+    return assemble_dedup(static, order, path, columns)
+
+
+def assemble_dedup(static, order, source, columns):
+    """
+    Reconstruye un frame completo en modo 'dedup' a partir del estado
+    estático y del archivo (o buffer) con las columnas dinámicas del fluido.
+    """
+    dynamic = [c for c in columns if c in DYNAMIC_COLUMNS and c != "id"]
+    frame = _read_columns(source, ["id"] + dynamic)
+    rows = order[np.searchsorted(static["id"], frame["id"], sorter=order)]
+
+    data = {}
+    for c in columns:
+        arr = static[c].copy()
+        if c in dynamic:
+            arr[rows] = frame[c]
+        data[c] = arr
+    return data
+
+
+def read_state_df(path, columns=None):
+    """read_state como DataFrame (mismas columnas que state_XXXX.txt)."""
+    return pd.DataFrame(read_state(path, columns))
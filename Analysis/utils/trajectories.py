@@ -0,0 +1,315 @@
+import json
+import math
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .parallel_frames import default_workers
+from .snapshot_store import find_store, source_signature
+from .state_files import STATE_COLUMNS, read_state, state_files, step_from_name
+
+
+INDEX_FORMAT_VERSION = 1
+INDEX_SUFFIX = "_trajectories"
+META_FILE = "meta.json"
+
+# Campos que cambian en el tiempo; id, mass, h y type son constantes
+DEFAULT_FIELDS = ["posx", "posy", "velx", "vely", "accelx", "accely", "rho", "pressure"]
+
+# Máximo de frames que un worker acumula en memoria antes de escribir su bloque
+_CHUNK_FRAMES = 256
+
+# Estado de cada proceso del pool (ver _init_index_worker)
+_worker = {}
+
+
+def default_index_dir(output_dir):
+    """Ubicación por defecto del índice: carpeta hermana '<Output>_trajectories'."""
+    output_dir = Path(output_dir)
+    return output_dir.parent / f"{output_dir.name}{INDEX_SUFFIX}"
+
+
+def _rows_for(ids_sorted, ids):
+    rows = np.searchsorted(ids_sorted, ids)
+    rows = np.clip(rows, 0, len(ids_sorted) - 1)
+    found = ids_sorted[rows] == ids
+    return rows, found
+
+
+def _init_index_worker(index_dir, fields, ids_sorted):
+    _worker.update(
+        fields=fields,
+        ids=ids_sorted,
+        arrays={c: np.load(Path(index_dir) / f"{c}.npy", mmap_mode="r+") for c in fields},
+    )
+
+
+def _index_chunk(files, start):
+    """
+    Parsea un bloque de frames consecutivos y escribe sus columnas
+    start … start+len(files) del índice directamente en los .npy (cada
+    bloque toca columnas distintas, así que los workers no se pisan y
+    nada vuelve al proceso principal).
+    """
+    fields, ids_sorted = _worker["fields"], _worker["ids"]
+    # Las partículas ausentes en algún frame quedan como NaN
+    block = {c: np.full((len(ids_sorted), len(files)), np.nan) for c in fields}
+    for j, path in enumerate(files):
+        data = read_state(path, ["id"] + fields)
+        rows, found = _rows_for(ids_sorted, data["id"])
+        for c in fields:
+            block[c][rows[found], j] = data[c][found]
+
+    for c in fields:
+        _worker["arrays"][c][:, start:start + len(files)] = block[c]
+        _worker["arrays"][c].flush()
+    return len(files)
+
+
+def build_trajectory_index(output_dir, fields=None, index_dir=None, overwrite=False,
+                           workers=None):
+    """
+    Construye en una sola pasada un índice transpuesto (partícula × frame).
+
+    Para cada campo se guarda un arreglo .npy de forma (n_particles, n_frames)
+    en orden C, de modo que la trayectoria completa de una partícula es una
+    fila contigua en disco. Las filas se indexan por 'id' (ids.npy ordenado).
+    Si la corrida ya tiene un almacén columnar (snapshot_store) se transpone
+    desde ahí sin parsear texto; si no, un único pool de procesos parsea
+    bloques de frames y cada worker escribe su bloque en el índice.
+
+    Parámetros
+    ----------
+    output_dir : Path
+        Carpeta 'Output' con los archivos state_*.txt.
+    fields : list[str] | None
+        Campos a indexar (por defecto DEFAULT_FIELDS).
+    index_dir : Path | None
+        Carpeta destino. Por defecto '<Output>_trajectories'.
+    overwrite : bool
+        Si False y el índice ya existe, lanza FileExistsError.
+    workers : int | None
+        Procesos para parsear los archivos de texto (por defecto todas las CPUs).
+
+    Returns
+    -------
+    Path
+        Ruta del índice generado.
+    """
+    output_dir = Path(output_dir)
+    index_dir = Path(index_dir) if index_dir is not None else default_index_dir(output_dir)
+    fields = list(DEFAULT_FIELDS if fields is None else fields)
+
+    unknown = [c for c in fields if c not in STATE_COLUMNS or c == "id"]
+    if unknown:
+        raise ValueError(f"Campos no indexables: {unknown}")
+
+    archivos = state_files(output_dir)
+    if not archivos:
+        raise FileNotFoundError(f"No se encontraron archivos state_*.txt en {output_dir}")
+    # Huella tomada antes de leer: si la corrida cambia durante la
+    # construcción, el índice queda desactualizado y se rehace
+    signature = source_signature(output_dir)
+
+    if index_dir.exists():
+        if not overwrite:
+            raise FileExistsError(f"El índice ya existe: {index_dir}")
+        shutil.rmtree(index_dir)
+
+    tmp_dir = index_dir.with_name(index_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    store = find_store(output_dir, columns=fields + ["id"])
+
+    n_frames = len(archivos)
+
+    if store is not None:
+        ids_sorted = np.unique(np.asarray(store.field("id")[0]))
+    else:
+        ids_sorted = np.unique(read_state(archivos[0], ["id"])["id"])
+    n_particles = len(ids_sorted)
+
+    arrays = {
+        c: np.lib.format.open_memmap(
+            tmp_dir / f"{c}.npy", mode="w+",
+            dtype=np.float64, shape=(n_particles, n_frames)
+        )
+        for c in fields
+    }
+
+    if store is not None:
+        steps = np.asarray(store.steps, dtype=np.int64)
+        for start in range(0, n_frames, _CHUNK_FRAMES):
+            stop = min(start + _CHUNK_FRAMES, n_frames)
+            block = {c: np.full((n_particles, stop - start), np.nan) for c in fields}
+            for j, i in enumerate(range(start, stop)):
+                data = store.frame(i, ["id"] + fields)
+                rows, found = _rows_for(ids_sorted, data["id"])
+                for c in fields:
+                    block[c][rows[found], j] = data[c][found]
+            for c in fields:
+                arrays[c][:, start:stop] = block[c]
+
+    for arr in arrays.values():
+        arr.flush()
+    del arrays
+
+    if store is None:
+        steps = np.array([step_from_name(a) for a in archivos], dtype=np.int64)
+        workers = default_workers() if workers is None else max(1, int(workers))
+        chunksize = min(_CHUNK_FRAMES, max(1, math.ceil(n_frames / (workers * 4))))
+        starts = list(range(0, n_frames, chunksize))
+        chunks = [archivos[i:i + chunksize] for i in starts]
+
+        if workers == 1 or len(chunks) == 1:
+            _init_index_worker(tmp_dir, fields, ids_sorted)
+            try:
+                for chunk, start in zip(chunks, starts):
+                    _index_chunk(chunk, start)
+            finally:
+                _worker.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                     initializer=_init_index_worker,
+                                     initargs=(tmp_dir, fields, ids_sorted)) as pool:
+                list(pool.map(_index_chunk, chunks, starts))
+
+    np.save(tmp_dir / "ids.npy", ids_sorted)
+    np.save(tmp_dir / "steps.npy", steps)
+
+    meta = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "source": str(output_dir.resolve()),
+        "fields": fields,
+        "n_frames": n_frames,
+        "n_particles": n_particles,
+        "last_file": archivos[-1].name,
+        "source_signature": signature,
+    }
+    with open(tmp_dir / META_FILE, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    tmp_dir.rename(index_dir)
+    print(f"[✓] Índice de trayectorias generado: {index_dir} "
+          f"({n_particles} partículas × {n_frames} frames)")
+    return index_dir
+
+
+class TrajectoryIndex:
+    """Lector del índice transpuesto generado con build_trajectory_index."""
+
+    def __init__(self, index_dir):
+        self.index_dir = Path(index_dir)
+        with open(self.index_dir / META_FILE) as f:
+            self.meta = json.load(f)
+
+        if self.meta.get("format_version") != INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"Versión de índice no soportada: {self.meta.get('format_version')}"
+            )
+
+        self.fields = self.meta["fields"]
+        self.ids = np.load(self.index_dir / "ids.npy")
+        self.steps = np.load(self.index_dir / "steps.npy")
+        self._fields = {}
+
+    def field(self, name):
+        """Arreglo (n_particles, n_frames) del campo pedido, mapeado en memoria."""
+        if name not in self.fields:
+            raise KeyError(
+                f"Campo '{name}' no indexado; reconstruye con fields={self.fields + [name]}"
+            )
+        if name not in self._fields:
+            self._fields[name] = np.load(self.index_dir / f"{name}.npy", mmap_mode="r")
+        return self._fields[name]
+
+    def rows(self, ids):
+        """Fila del índice para cada id pedido."""
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        rows, found = _rows_for(self.ids, ids)
+        if not found.all():
+            raise KeyError(f"ids no presentes en la corrida: {ids[~found].tolist()}")
+        return rows
+
+    def is_current(self, output_dir):
+        """
+        True si el índice corresponde a los state_*.txt actuales de
+        output_dir: misma huella (source_signature), así que una corrida
+        repetida en la misma carpeta con el mismo n_steps lo invalida.
+        """
+        return self.meta.get("source_signature") == source_signature(output_dir)
+
+
+def load_trajectory_index(output_dir, fields=None, rebuild=False, workers=None):
+    """
+    Abre el índice de trayectorias de una corrida, construyéndolo (o
+    reconstruyéndolo) si no existe, está desactualizado o le faltan campos.
+    """
+    output_dir = Path(output_dir)
+    index_dir = default_index_dir(output_dir)
+    fields = list(DEFAULT_FIELDS if fields is None else fields)
+    build_fields = list(dict.fromkeys(DEFAULT_FIELDS + fields))
+
+    if not rebuild and (index_dir / META_FILE).exists():
+        index = TrajectoryIndex(index_dir)
+        if index.is_current(output_dir) and all(c in index.fields for c in fields):
+            return index
+        build_fields = list(dict.fromkeys(index.fields + build_fields))
+
+    build_trajectory_index(output_dir, fields=build_fields, index_dir=index_dir,
+                           overwrite=True, workers=workers)
+    return TrajectoryIndex(index_dir)
+
+
+def track_particles(run, ids, fields=("posx", "posy", "velx", "vely"), workers=None):
+    """
+    Trayectorias de varias partículas a partir del índice transpuesto.
+
+    Parámetros
+    ----------
+    run : Path
+        Carpeta 'Output' de la simulación.
+    ids : list[int]
+        ids de las partículas a seguir.
+    fields : sequence[str]
+        Campos a devolver.
+    workers : int | None
+        Procesos para construir el índice si hace falta.
+
+    Returns
+    -------
+    dict
+        'time_steps' : pasos de cada frame (n_frames,)
+        'ids'        : ids pedidos (len(ids),)
+        <campo>      : arreglo (len(ids), n_frames) por cada campo
+    """
+    fields = list(fields)
+    index = load_trajectory_index(run, fields, workers=workers)
+    rows = index.rows(ids)
+
+    result = {
+        "time_steps": np.asarray(index.steps),
+        "ids": np.atleast_1d(np.asarray(ids, dtype=np.int64)),
+    }
+    for c in fields:
+        result[c] = np.asarray(index.field(c)[rows])
+    return result
+
+
+def track_particle(folder, particle_id):
+    """
+    Rastrea la posición y velocidad de una partícula dada por su id.
+    Mantiene la forma de retorno del helper original del notebook de Torricelli.
+    """
+    traj = track_particles(folder, [particle_id])
+    return {
+        "time_steps": traj["time_steps"],
+        "posx": traj["posx"][0],
+        "posy": traj["posy"][0],
+        "velx": traj["velx"][0],
+        "vely": traj["vely"][0],
+    }
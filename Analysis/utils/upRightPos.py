@@ -1,5 +1,7 @@
 import numpy as np
 
+from .state_files import read_state
+
 def find_part_up_right(file_path, n_altas=1, n_derechas=1):
     """
     Devuelve dos diccionarios:
@@ -7,13 +9,13 @@ def find_part_up_right(file_path, n_altas=1, n_derechas=1):
       - derechas:  {id: x}  → partículas más a la derecha (posx)
     """
 
-    data = np.loadtxt(str(file_path), skiprows=1)
+    data = read_state(file_path, ["id", "posx", "posy", "type"])
 
     # Extraer columnas del archivo
-    ids   = data[:,0]
-    posx  = data[:,1]
-    posy  = data[:,2]
-    types = data[:,12]
+    ids   = data["id"]
+    posx  = data["posx"]
+    posy  = data["posy"]
+    types = data["type"]
 
     # Filtrar partículas con type == 0
     mask = types == 0
@@ -0,0 +1,254 @@
+# Config/Pipeline/adaptive_sweep.py
+import sys
+import json
+import math
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Config.Pipeline.est_tree_pipeline import (
+    C_VALUES,
+    check_preflight,
+    classify_run,
+    logspace_1_4_7,
+    run_ics_pipeline,
+    run_single_simulation,
+    save_results_csv,
+)
+from Config.utils.create_simJSON import create_simulation_config
+from Config.utils.run_resources import RESOURCE_FIELDS
+from Config.utils.sweep_scheduler import SweepScheduler
+from Config.Pipeline.sweep_journal import JOURNAL_FILE, SweepJournal, params_hash
+from Config.Pipeline.runtime_model import DEFAULT_HISTORY, SAFETY_FACTOR, RuntimeModel, plan_runtimes
+
+# Ancho final del intervalo [B_lo, B_hi] en décadas (log10(B_hi / B_lo))
+DEFAULT_LOG_TOL = 0.1
+
+
+def geometric_midpoint(B_lo, B_hi):
+    """Punto medio en log-B."""
+    return math.sqrt(B_lo * B_hi)
+
+
+def bisection_steps(B_min, B_max, log_tol=DEFAULT_LOG_TOL):
+    """Número de corridas de bisección para llevar [B_min, B_max] a log_tol décadas."""
+    width = math.log10(B_max / B_min)
+    return max(0, math.ceil(math.log2(width / log_tol))) if width > log_tol else 0
+
+
+def find_stability_frontier(
+    project_dir: Path,      # <- N_dir
+    input_file: Path,
+    sim_executable: Path,
+    base_json: str,
+    c_values=None,
+    B_min: float = None,
+    B_max: float = None,
+    log_tol: float = DEFAULT_LOG_TOL,
+    steps: int = 4000,
+    timeout_seconds: int = 4000,
+    live_monitor: bool = False,
+    monitor_criteria: dict = None,
+    preflight: bool = True,
+    preflight_options: dict = None,
+    max_parallel: int = None,
+    pin_cpus: bool = False,
+    memory_per_run: int = None,
+    resume: bool = True,
+    runtime_model: RuntimeModel = None,
+    safety_factor: float = SAFETY_FACTOR
+):
+    """
+    Búsqueda adaptativa de la frontera estable/inestable en B para cada c.
+
+    En lugar de recorrer toda la grilla logspace_1_4_7() × C_VALUES, para
+    cada c se corren los extremos [B_min, B_max] y, si uno es estable y el
+    otro no, se biseca en log-B (punto medio geométrico) conservando un
+    extremo de cada lado hasta que log10(B_hi / B_lo) <= log_tol. Son
+    2 + ceil(log2(décadas / log_tol)) corridas por c en vez de una por
+    punto de la grilla. No se supone de qué lado está la región estable.
+
+    Las distintas c son independientes y se ejecutan en paralelo con
+    SweepScheduler (la bisección de cada c es secuencial), limitado por
+    max_parallel, pin_cpus y memory_per_run como en run_stability_sweep.
+    Cada corrida queda en la bitácora propia de esta búsqueda
+    (sweep_B_c_adaptive/sweep_journal.jsonl): con resume=True se retoma
+    una búsqueda interrumpida sin repetir sus corridas, pero no se
+    reutilizan las de un barrido de grilla (otra bitácora y, en general,
+    otros valores de B). Con un runtime_model ajustado el timeout de cada corrida
+    es la duración predicha con margen (RuntimeModel.timeout_for), nunca
+    menor que timeout_seconds.
+
+    Returns
+    -------
+    (frontiers, results, sweep_root)
+        frontiers: un dict por c con el intervalo final
+        {"c", "B_stable", "B_unstable", "log_width", "converged", "n_runs"}
+        (sin frontera en el rango: converged=False y range_status indica
+        si todo el rango fue estable o inestable);
+        results: todas las corridas (mismas columnas que el barrido completo).
+    """
+    grid = logspace_1_4_7()
+    B_min = min(grid) if B_min is None else B_min
+    B_max = max(grid) if B_max is None else B_max
+    c_values = C_VALUES if c_values is None else c_values
+
+    sweep_root = project_dir / "sweep_B_c_adaptive"
+    sweep_root.mkdir(parents=True, exist_ok=True)
+
+    if preflight and not check_preflight(input_file, sweep_root, preflight_options):
+        return [], [], sweep_root
+
+    journal_path = sweep_root / JOURNAL_FILE
+    if not resume and journal_path.exists():
+        journal_path.unlink()
+    journal = SweepJournal(journal_path)
+
+    def _evaluate(B, c, cpu):
+        """Corre (o recupera de la bitácora) el punto (B, c); devuelve su fila."""
+        exp_name = f"B_{B:.3e}_c_{c:.1e}"
+        param_file = create_simulation_config(
+            experiment_name=exp_name,
+            input_file=str(input_file),
+            base_json=base_json,
+            B=B,
+            c=c,
+            steps=steps,
+            dt=5e-6,
+            neighbor_method="quadtree",
+            project_root=PROJECT_ROOT,
+            project_dir=project_dir
+        )
+        key = params_hash(param_file)
+        if journal.is_done(key):
+            row = journal.row(key)
+            print(f"   ↺ {exp_name} → {row['status']} (bitácora)")
+            return row
+
+        exp = {"param_file": param_file}
+        plan_runtimes([exp], runtime_model, timeout_seconds, safety_factor, verbose=False)
+
+        journal.start(key, exp_name)
+        elapsed, last_step, mode, return_code, reason, resources = run_single_simulation(
+            experiment_dir=param_file.parent,
+            sim_executable=sim_executable,
+            timeout_seconds=exp["timeout"],
+            project_root=PROJECT_ROOT,
+            monitor_criteria=monitor_criteria,
+            live_monitor=live_monitor,
+            cpu=cpu
+        )
+        row = {
+            "B": B,
+            "c": c,
+            "status": classify_run(mode, last_step, steps, return_code),
+            "time": elapsed,
+            "last_step": last_step,
+            "exit_code": return_code,
+            "reason": reason,
+            **{k: resources[k] for k in RESOURCE_FIELDS},
+            "predicted_time": exp["predicted"],
+            "timeout": exp["timeout"]
+        }
+        journal.done(key, exp_name, row)
+        print(f"\n🧪 {exp_name} → {row['status']} | step={row['last_step']} "
+              f"| time={row['time']:.2f}s")
+        return row
+
+    def _bisect(c, cpu):
+        rows = [_evaluate(B_min, c, cpu), _evaluate(B_max, c, cpu)]
+        lo_stable = rows[0]["status"] == "STABLE"
+        hi_stable = rows[1]["status"] == "STABLE"
+
+        frontier = {"c": c, "B_stable": None, "B_unstable": None,
+                    "log_width": None, "converged": False, "range_status": None}
+        if lo_stable == hi_stable:
+            # Sin cambio de estabilidad en el rango: no hay frontera que acotar
+            frontier["range_status"] = "STABLE" if lo_stable else "UNSTABLE"
+            frontier["n_runs"] = len(rows)
+            print(f"[INFO] c={c:.1e}: {'estable' if lo_stable else 'inestable'} "
+                  f"en todo [{B_min:.1e}, {B_max:.1e}]; sin frontera")
+            return frontier, rows
+
+        B_lo, B_hi = B_min, B_max
+        while math.log10(B_hi / B_lo) > log_tol:
+            B_mid = geometric_midpoint(B_lo, B_hi)
+            row = _evaluate(B_mid, c, cpu)
+            rows.append(row)
+            if (row["status"] == "STABLE") == lo_stable:
+                B_lo = B_mid
+            else:
+                B_hi = B_mid
+
+        frontier.update(
+            B_stable=B_lo if lo_stable else B_hi,
+            B_unstable=B_hi if lo_stable else B_lo,
+            log_width=math.log10(B_hi / B_lo),
+            converged=True,
+            n_runs=len(rows),
+        )
+        print(f"[✓] c={c:.1e}: frontera entre B={B_lo:.3e} y B={B_hi:.3e} "
+              f"({len(rows)} corridas)")
+        return frontier, rows
+
+    scheduler = SweepScheduler(max_parallel, pin_cpus=pin_cpus, memory_per_run=memory_per_run)
+    n_max = 2 + bisection_steps(B_min, B_max, log_tol)
+    print(f"[INFO] Búsqueda adaptativa en B ∈ [{B_min:.1e}, {B_max:.1e}], "
+          f"tolerancia {log_tol} décadas: ≤ {n_max} corridas por c "
+          f"(grilla completa: {len(grid)})")
+
+    sweep_start = time.time()
+    out = scheduler.map(_bisect, c_values)
+    frontiers = [f for f, _ in out]
+    results = sorted((r for _, rows in out for r in rows), key=lambda r: (r["c"], r["B"]))
+
+    with open(sweep_root / "frontier.json", "w") as f:
+        json.dump({
+            "B_min": B_min,
+            "B_max": B_max,
+            "log_tol": log_tol,
+            "steps": steps,
+            "frontiers": frontiers,
+        }, f, indent=2)
+
+    print("\n" + "-" * 60)
+    for fr in frontiers:
+        if fr["converged"]:
+            print(f"c={fr['c']:.1e} | estable B={fr['B_stable']:.3e} | "
+                  f"inestable B={fr['B_unstable']:.3e} | corridas={fr['n_runs']}")
+        else:
+            print(f"c={fr['c']:.1e} | sin frontera en el rango | corridas={fr['n_runs']}")
+    print("-" * 60)
+    print(f"Corridas: {len(results)} | Tiempo total: {time.time() - sweep_start:.1f}s")
+
+    return frontiers, results, sweep_root
+
+
+def main():
+
+    res = run_ics_pipeline()
+    if res is None:
+        print("[ERROR] Falló la generación de ICS.")
+        return
+
+    input_file, project_dir, N_dir = res
+
+    sim_executable = PROJECT_ROOT / "simulacion"
+
+    frontiers, results, sweep_root = find_stability_frontier(
+        project_dir=N_dir,
+        input_file=input_file,
+        sim_executable=sim_executable,
+        base_json="AndresSimParams.json",
+        runtime_model=RuntimeModel.from_history(list(dict.fromkeys([DEFAULT_HISTORY, project_dir])))
+    )
+
+    save_results_csv(results, sweep_root)
+    print("\n✅ Búsqueda de frontera finalizada")
+
+
+if __name__ == "__main__":
+    main()
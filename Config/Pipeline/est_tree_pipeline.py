@@ -1,17 +1,31 @@
 # Config/Pipeline/est_tree_pipeline.py
 import sys
 import csv
-import subprocess
+import json
 import time
-import re
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
+IC_ROOT = PROJECT_ROOT / "InitialConditions"
+for root in (PROJECT_ROOT, IC_ROOT, IC_ROOT / "src"):
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
 
 from Config.Pipeline.vaciado10_1e_3.main_pipe_ics import run_ics_pipeline
 from Config.utils.create_simJSON import create_simulation_config
+from Config.Pipeline.stability_monitor import StabilityMonitor
+from Config.utils.async_runner import run_process
+from Config.utils.run_resources import RESOURCE_FIELDS, run_resources, save_run_resources
+from src.core.preflight import preflight_ics, print_preflight
+from Config.utils.sweep_scheduler import SweepScheduler, pin_process
+from Config.Pipeline.sweep_journal import JOURNAL_FILE, SweepJournal, params_hash
+from Config.Pipeline.prescreen import (
+    DEFAULT_MAX_SCORE, PRESCREEN_DIR, prescreen_score, promote, savings_report
+)
+from Config.Pipeline.runtime_model import (
+    DEFAULT_HISTORY, SAFETY_FACTOR, RuntimeModel, plan_runtimes, prediction_report
+)
+from Config.Pipeline.retention import retain_experiment
 
 def logspace_1_4_7():
     mantissas = [5]
@@ -23,49 +37,116 @@ def logspace_1_4_7():
 C_VALUES = [1e-5, 1e-4, 1e-3]
 
 
-def extract_last_step(stdout_text: str):
-    matches = re.findall(r"[Ss]tep\s*[:=]?\s*(\d+)", stdout_text)
-    return int(matches[-1]) if matches else None
-
 def run_single_simulation(
     experiment_dir: Path,
     sim_executable: Path,
     timeout_seconds: int,
-    project_root: Path
+    project_root: Path,
+    monitor_criteria: dict = None,
+    live_monitor: bool = False,
+    cpu: int = None
 ):
-    param_file = experiment_dir / "params.json"
-    stdout_path = experiment_dir / "stdout.txt"
-    stderr_path = experiment_dir / "stderr.txt"
+    """
+    Ejecuta el solver para un experimento.
 
-    start = time.time()
+    stdout y stderr se leen a la vez y se vuelcan a stdout.txt / stderr.txt
+    a medida que llegan (async_runner.run_process); el último step se sigue
+    línea a línea sin guardar la salida completa en memoria.
 
-    proc = subprocess.Popen(
-        [str(sim_executable), str(param_file)],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        cwd=project_root
-    )
+    Con cpu (núcleo asignado por SweepScheduler) se fija la afinidad del
+    proceso del solver a ese núcleo.
 
-    try:
-        out, err = proc.communicate(timeout=timeout_seconds)
-        timeout = False
-    except subprocess.TimeoutExpired:
-        proc.kill()
-        out, err = proc.communicate()
-        timeout = True
+    Con live_monitor=True un StabilityMonitor sigue los state_*.txt mientras
+    se escriben y mata el proceso en cuanto se activa un criterio de
+    divergencia; en ese caso el modo devuelto es "DIVERGED" y el motivo
+    queda en monitor.json dentro del experimento.
 
-    elapsed = time.time() - start
+    El uso de recursos del proceso (CPU user/sys, pico de RSS, bytes y
+    state_* escritos en la carpeta de salida) queda en resources.json.
 
-    stdout_path.write_text(out)
-    stderr_path.write_text(err)
+    Returns
+    -------
+    (elapsed, last_step, mode, return_code, reason, resources)
+    """
+    param_file = experiment_dir / "params.json"
+    stdout_path = experiment_dir / "stdout.txt"
+    stderr_path = experiment_dir / "stderr.txt"
 
-    last_step = extract_last_step(out)
+    start = time.time()
 
-    if timeout:
-        return elapsed, last_step, "TIMEOUT", None
+    with open(param_file) as f:
+        output_dir = Path(json.load(f)["io"]["output_dir_simulation"])
+    if not output_dir.is_absolute():
+        output_dir = Path(project_root) / output_dir
+
+    monitor = None
+    stop_check = None
+    poll_interval = 1.0
+    if live_monitor:
+        monitor = StabilityMonitor(output_dir, monitor_criteria, start_time=start)
+        stop_check = monitor.poll
+        poll_interval = monitor.criteria["poll_interval"]
+
+    # stdout/stderr van directo a disco; en memoria solo queda la cola
+    run = run_process(
+        [sim_executable, param_file],
+        stdout_path,
+        stderr_path,
+        timeout=timeout_seconds,
+        cwd=project_root,
+        on_start=lambda pid: pin_process(pid, cpu),
+        stop_check=stop_check,
+        poll_interval=poll_interval
+    )
+    elapsed = run["elapsed"]
+    last_step = run["last_step"]
+
+    resources = run_resources(run, output_dir)
+    save_run_resources(experiment_dir, resources)
+
+    if monitor is not None:
+        if run["stopped"]:
+            print(f"    ⛔ Divergencia detectada ({monitor.reason}); deteniendo solver")
+        # Revisa también los últimos frames escritos antes de terminar
+        monitor.poll(final=True)
+        monitor.save(experiment_dir / "monitor.json")
+        if monitor.tripped:
+            return elapsed, last_step, "DIVERGED", run["returncode"], monitor.reason, resources
+
+    if run["timed_out"]:
+        return elapsed, last_step, "TIMEOUT", None, None, resources
+
+    return elapsed, last_step, "EXIT", run["returncode"], None, resources
+
+def classify_run(mode, last_step, steps, return_code):
+    """Estado de estabilidad de una corrida a partir de cómo terminó el solver."""
+    if mode == "DIVERGED":
+        return "UNSTABLE_DIVERGED"
+    if last_step is None:
+        return "UNSTABLE_NO_OUTPUT"
+    # El solver numera los pasos 0 … n_steps-1
+    if last_step >= steps - 1:
+        return "STABLE"
+    if mode == "TIMEOUT":
+        return "UNSTABLE_TIMEOUT"
+    if return_code == -11:
+        return "UNSTABLE_SEGFAULT"
+    return "UNSTABLE_EARLY_STOP"
+
+
+def check_preflight(input_file, sweep_root, preflight_options=None):
+    """
+    Pre-flight de vecinos del ICS (ver InitialConditions/src/core/preflight.py).
+    Guarda preflight.json en sweep_root y devuelve True si el barrido puede lanzarse.
+    """
+    report = preflight_ics(input_file, **(preflight_options or {}))
+    with open(Path(sweep_root) / "preflight.json", "w") as f:
+        json.dump(report, f, indent=2)
+    print_preflight(report)
+    if not report["ok"]:
+        print("[ERROR] El ICS no pasa el pre-flight de vecinos; no se lanza el barrido.")
+    return report["ok"]
 
-    return elapsed, last_step, "EXIT", proc.returncode
 
 # Barrido B–c + estabilidad (DENTRO de N_dir)
 def run_stability_sweep(
@@ -74,100 +155,282 @@ def run_stability_sweep(
     sim_executable: Path,
     base_json: str,
     steps: int = 4000,
-    timeout_seconds: int = 4000
+    timeout_seconds: int = 4000,
+    live_monitor: bool = False,
+    monitor_criteria: dict = None,
+    preflight: bool = True,
+    preflight_options: dict = None,
+    max_parallel: int = None,
+    pin_cpus: bool = False,
+    memory_per_run: int = None,
+    resume: bool = True,
+    runtime_model: RuntimeModel = None,
+    safety_factor: float = SAFETY_FACTOR,
+    prescreen_steps: int = None,
+    prescreen_options: dict = None,
+    retention: dict = None
 ):
+    """
+    Barrido B–c de estabilidad. Los experimentos se ejecutan en paralelo
+    con SweepScheduler: hasta max_parallel solvers a la vez (por defecto
+    uno por núcleo físico), opcionalmente fijados a un núcleo (pin_cpus) y
+    limitados por memoria disponible (memory_per_run, en bytes).
+
+    Cada experimento terminado queda en sweep_journal.jsonl (sweep_root).
+    Con resume=True, los experimentos cuyo params.json ya figura como
+    terminado en la bitácora no se vuelven a ejecutar.
+
+    Con un runtime_model ajustado (RuntimeModel.from_history), cada
+    experimento recibe como timeout la duración predicha con margen
+    (RuntimeModel.timeout_for), nunca menor que timeout_seconds, y los más
+    largos se lanzan primero para que no queden rezagados al final del
+    barrido. La predicción queda junto al tiempo real en cada fila
+    (predicted_time, timeout).
+
+    Con prescreen_steps el barrido tiene dos etapas: cada (B, c) corre
+    primero prescreen_steps pasos (override de integrator.n_steps, en
+    sweep_root/prescreen) y se puntúa con los diagnósticos de densidad y
+    velocidad (prescreen.prescreen_score); solo los que terminan ese
+    horizonte con puntaje <= prescreen_options["max_score"] pasan a la
+    corrida de steps pasos. El ahorro estimado queda en
+    prescreen_report.json.
+
+    Con retention (política de retention.py, p.ej. {"every": 20}) cada
+    corrida terminada se poda: se guardan sus reducciones por frame y solo
+    se conservan los frames que pide la política.
+
+    Returns
+    -------
+    (results, sweep_root) con una fila por experimento, en orden c → B.
+    """
     sweep_root = project_dir / "sweep_B_c"
     sweep_root.mkdir(parents=True, exist_ok=True)
+
+    results = []
+
+    # Pre-flight: no lanzar el barrido si el ICS desborda (o deja sin) vecinos
+    if preflight and not check_preflight(input_file, sweep_root, preflight_options):
+        return results, sweep_root
     
     # Preguntar o paso automático
     ASK_C_CONFIRMATION = False
     print(f"Preguntar por valor de C {ASK_C_CONFIRMATION}")
-    
-    results = []
+
     B_values = logspace_1_4_7()
 
+    # Con confirmación por c se lanza un lote por c; si no, todo en un lote
+    selected_c = []
     for c in C_VALUES:
-
-        print("\n" + "=" * 60)
-        print(f"🔵 Iniciando barrido para c = {c:.1e}")
-        print(f"   Total simulaciones: {len(B_values)}")
-        print("=" * 60)
-
         if ASK_C_CONFIRMATION:
-            if input("¿Continuar con este valor de c? (Y/N): ").strip().upper() != "Y":
+            if input(f"¿Incluir c = {c:.1e}? (Y/N): ").strip().upper() != "Y":
                 continue
+        selected_c.append(c)
+
+    def _configure(B, c, exp_dir, n_steps=None):
+        exp_name = f"B_{B:.1e}_c_{c:.1e}"
+        param_file = create_simulation_config(
+            experiment_name=exp_name,
+            input_file=str(input_file),
+            base_json=base_json,
+            B=B,
+            c=c,
+            steps=steps,
+            dt=5e-6,                     # Modificación un orden menor
+            neighbor_method="quadtree",
+            project_root=PROJECT_ROOT,   # <- para Config/
+            project_dir=exp_dir,         # <- N_dir
+            overrides={"integrator.n_steps": n_steps} if n_steps else None
+        )
+        return {
+            "name": exp_name, "param_file": param_file, "steps": n_steps or steps,
+            "values": {"B": B, "c": c}, "key": params_hash(param_file)
+        }
+
+    run_options = dict(
+        timeout_seconds=timeout_seconds,
+        live_monitor=live_monitor,
+        monitor_criteria=monitor_criteria,
+        max_parallel=max_parallel,
+        pin_cpus=pin_cpus,
+        memory_per_run=memory_per_run,
+        resume=resume,
+        runtime_model=runtime_model,
+        safety_factor=safety_factor,
+        retention=retention
+    )
+
+    candidates = [(B, c) for c in selected_c for B in B_values]
+    sweep_start = time.time()
 
-        stable_count = 0
-        unstable_count = 0
-        times = []
-        c_start_time = time.time()
-
-        for B in B_values:
-
-            exp_name = f"B_{B:.1e}_c_{c:.1e}"
-            print(f"\n🧪 Ejecutando {exp_name}")
-
-            param_file = create_simulation_config(
-                experiment_name=exp_name,
-                input_file=str(input_file),
-                base_json=base_json,
-                B=B,
-                c=c,
-                steps=steps,
-                dt=5e-6,                     # Modificación un orden menor
-                neighbor_method="quadtree",
-                project_root=PROJECT_ROOT,   # <- para Config/
-                project_dir=project_dir      # <- N_dir
-            )
-
-            elapsed, last_step, mode, return_code = run_single_simulation(
-                experiment_dir=param_file.parent,
-                sim_executable=sim_executable,
-                timeout_seconds=timeout_seconds,
-                project_root=PROJECT_ROOT
-            )
-
-            if last_step is None:
-                status = "UNSTABLE_NO_OUTPUT"
-            elif last_step >= steps:
-                status = "STABLE"
-            elif mode == "TIMEOUT":
-                status = "UNSTABLE_TIMEOUT"
-            elif return_code == -11:
-                status = "UNSTABLE_SEGFAULT"
-            else:
-                status = "UNSTABLE_EARLY_STOP"
-
-            if status == "STABLE":
-                stable_count += 1
-                times.append(elapsed)
-            else:
-                unstable_count += 1
-
-            results.append({
-                "B": B,
-                "c": c,
-                "status": status,
-                "time": elapsed,
-                "last_step": last_step,
-                "exit_code": return_code
-            })
-
-            print(f"    → {status} | step={last_step} | time={elapsed:.2f}s")
+    if prescreen_steps:
+        results = _prescreened_sweep(candidates, _configure, project_dir, sweep_root,
+                                     sim_executable, steps, prescreen_steps,
+                                     prescreen_options, monitor_criteria, run_options)
+    else:
+        experiments = [_configure(B, c, project_dir) for B, c in candidates]
+        results = run_experiments(experiments, sweep_root, sim_executable, **run_options)
 
+    for c in selected_c:
+        rows = [r for r in results if r["c"] == c]
+        stable_count = sum(r["status"] == "STABLE" for r in rows)
         print("\n" + "-" * 60)
-        print(f"Resumen c={c:.1e} | Estables={stable_count} | Inestables={unstable_count}")
-        print(f"Tiempo total: {time.time() - c_start_time:.1f}s")
+        print(f"Resumen c={c:.1e} | Estables={stable_count} | Inestables={len(rows) - stable_count}")
+        print(f"Tiempo de cómputo: {sum(r['time'] for r in rows):.1f}s")
         print("-" * 60)
+    print(f"Tiempo total del barrido: {time.time() - sweep_start:.1f}s")
 
     return results, sweep_root
 
-def save_results_csv(results, output_dir: Path):
+
+def _prescreened_sweep(candidates, configure, project_dir, sweep_root, sim_executable,
+                       steps, prescreen_steps, prescreen_options, monitor_criteria, run_options):
+    """Etapas del barrido con pre-screen (ver run_stability_sweep)."""
+    options = prescreen_options or {}
+    max_score = options.get("max_score", DEFAULT_MAX_SCORE)
+    screen_root = sweep_root / PRESCREEN_DIR
+    screen_root.mkdir(parents=True, exist_ok=True)
+
+    print(f"[INFO] Pre-screen: {len(candidates)} candidatos a {prescreen_steps} pasos")
+    screen = [configure(B, c, screen_root, n_steps=prescreen_steps) for B, c in candidates]
+    screen_rows = run_experiments(screen, screen_root, sim_executable, **run_options)
+
+    for exp, row in zip(screen, screen_rows):
+        with open(exp["param_file"]) as f:
+            output_dir = Path(json.load(f)["io"]["output_dir_simulation"])
+        row["prescreen_score"] = prescreen_score(output_dir, monitor_criteria)
+        row["stage"] = "prescreen"
+    with open(screen_root / "prescreen_scores.json", "w") as f:
+        json.dump(screen_rows, f, indent=2)
+
+    promoted = [i for i, row in enumerate(screen_rows) if promote(row, max_score)]
+    print(f"[INFO] Promovidos a {steps} pasos: {len(promoted)}/{len(candidates)} "
+          f"(puntaje <= {max_score})")
+
+    full = [configure(*candidates[i], project_dir) for i in promoted]
+    full_rows = run_experiments(full, sweep_root, sim_executable, **run_options)
+
+    results = []
+    for i, row in enumerate(screen_rows):
+        if i in promoted:
+            full_row = full_rows[promoted.index(i)]
+            full_row.update(prescreen_score=row["prescreen_score"], stage="full")
+            results.append(full_row)
+        else:
+            rejected = dict(row)
+            if rejected["status"] == "STABLE":
+                rejected["status"] = "PRESCREEN_REJECTED"
+            results.append(rejected)
+
+    savings_report(screen_rows, [screen_rows[i] for i in range(len(screen_rows)) if i not in promoted],
+                   full_rows, steps, prescreen_steps, sweep_root)
+    return results
+
+
+def run_experiments(
+    experiments,
+    sweep_root: Path,
+    sim_executable: Path,
+    timeout_seconds: int = 4000,
+    live_monitor: bool = False,
+    monitor_criteria: dict = None,
+    max_parallel: int = None,
+    pin_cpus: bool = False,
+    memory_per_run: int = None,
+    resume: bool = True,
+    runtime_model: RuntimeModel = None,
+    safety_factor: float = SAFETY_FACTOR,
+    retention: dict = None
+):
+    """
+    Ejecuta una lista de experimentos ya configurados con SweepScheduler,
+    registrándolos en sweep_root/sweep_journal.jsonl.
+
+    Cada experimento es un dict con "name", "param_file", "key"
+    (params_hash), "steps" y "values" (columnas propias del experimento,
+    p.ej. {"B": ..., "c": ...}, que encabezan su fila de resultados).
+
+    Con retention, al terminar cada corrida se aplica esa política de
+    retención (retention.retain_experiment) a su salida; exp["retention"]
+    (opcional) la sobreescribe para un experimento.
+
+    Returns
+    -------
+    list[dict] : una fila por experimento, en el orden de experiments.
+    """
+    journal_path = sweep_root / JOURNAL_FILE
+    if not resume and journal_path.exists():
+        journal_path.unlink()
+    journal = SweepJournal(journal_path)
+
+    scheduler = SweepScheduler(max_parallel, pin_cpus=pin_cpus, memory_per_run=memory_per_run)
+    print(f"[INFO] Ejecutando hasta {scheduler.max_parallel} simulaciones en paralelo")
+
+    pending = [exp for exp in experiments if not journal.is_done(exp["key"])]
+    plan_runtimes(pending, runtime_model, timeout_seconds, safety_factor)
+    print(f"   Total simulaciones: {len(experiments)} "
+          f"({len(experiments) - len(pending)} ya terminadas en la bitácora)")
+
+    def _run(exp, cpu):
+        journal.start(exp["key"], exp["name"])
+        elapsed, last_step, mode, return_code, reason, resources = run_single_simulation(
+            experiment_dir=exp["param_file"].parent,
+            sim_executable=sim_executable,
+            timeout_seconds=exp["timeout"],
+            project_root=PROJECT_ROOT,
+            monitor_criteria=monitor_criteria,
+            live_monitor=live_monitor,
+            cpu=cpu
+        )
+        row = {
+            **exp["values"],
+            "status": classify_run(mode, last_step, exp["steps"], return_code),
+            "time": elapsed,
+            "last_step": last_step,
+            "exit_code": return_code,
+            "reason": reason,
+            **{k: resources[k] for k in RESOURCE_FIELDS},
+            "predicted_time": exp["predicted"],
+            "timeout": exp["timeout"]
+        }
+        if retention is not None:
+            try:
+                retain_experiment(exp["param_file"], retention, exp.get("retention"), workers=1)
+            except Exception as e:
+                print(f"[✗] Retención fallida en {exp['name']}: {e}")
+        journal.done(exp["key"], exp["name"], row)
+        return row
+
+    def _report(i, exp, row):
+        print(f"\n🧪 {exp['name']} → {row['status']} | step={row['last_step']} "
+              f"| time={row['time']:.2f}s | cpu={row['cpu_user'] + row['cpu_sys']:.1f}s "
+              f"| rss={row['max_rss_mb']:.0f}MB | states={row['n_states']}")
+        if row["reason"]:
+            print(f"      motivo: {row['reason']}")
+
+    scheduler.map(_run, pending, on_result=_report)
+    rows = [journal.row(exp["key"]) for exp in experiments]
+    prediction_report(rows)
+    return rows
+
+RESULT_FIELDS = (["B", "c", "status", "time", "last_step", "exit_code", "reason"] + RESOURCE_FIELDS
+                 + ["predicted_time", "timeout"])
+PRESCREEN_FIELDS = ["stage", "prescreen_score"]
+
+
+def _default_fields(results):
+    # Barridos con pre-screen: columnas de etapa y puntaje al final
+    if any("stage" in row for row in results):
+        return RESULT_FIELDS + PRESCREEN_FIELDS
+    return RESULT_FIELDS
+
+
+def save_results_csv(results, output_dir: Path, fields=None):
     csv_file = output_dir / "stability_results.csv"
     with open(csv_file, "w", newline="") as f:
         writer = csv.DictWriter(
             f,
-            fieldnames=["B", "c", "status", "time", "last_step", "exit_code"]
+            fieldnames=fields or _default_fields(results),
+            extrasaction="ignore"
         )
         writer.writeheader()
         writer.writerows(results)
@@ -175,6 +438,17 @@ def save_results_csv(results, output_dir: Path):
     print(f"\n📄 Resultados guardados en {csv_file}")
 
 
+def rebuild_results_csv(sweep_root: Path):
+    """
+    Regenera stability_results.csv desde sweep_journal.jsonl (p.ej. tras una
+    interrupción), con las filas de los experimentos terminados en orden c → B.
+    """
+    journal = SweepJournal(Path(sweep_root) / JOURNAL_FILE)
+    rows = sorted(journal.rows(), key=lambda r: (r["c"], r["B"]))
+    save_results_csv(rows, Path(sweep_root))
+    return rows
+
+
 def main():
 
     res = run_ics_pipeline()
@@ -186,12 +460,22 @@ def main():
 
     sim_executable = PROJECT_ROOT / "simulacion"
 
-    results, sweep_root = run_stability_sweep(
-        project_dir=N_dir,         
-        input_file=input_file,
-        sim_executable=sim_executable,
-        base_json="AndresSimParams.json"
-    )
+    # Tiempos de barridos anteriores -> timeouts por experimento
+    runtime_model = RuntimeModel.from_history(list(dict.fromkeys([DEFAULT_HISTORY, project_dir])))
+
+    try:
+        results, sweep_root = run_stability_sweep(
+            project_dir=N_dir,         
+            input_file=input_file,
+            sim_executable=sim_executable,
+            base_json="AndresSimParams.json",
+            runtime_model=runtime_model
+        )
+    except KeyboardInterrupt:
+        # Lo terminado ya está en la bitácora; volver a ejecutar reanuda
+        print("\n[INFO] Barrido interrumpido; CSV parcial desde la bitácora.")
+        rebuild_results_csv(N_dir / "sweep_B_c")
+        return
 
     save_results_csv(results, sweep_root)
     print("\n✅ Pipeline completo finalizado")
@@ -0,0 +1,113 @@
+# Config/Pipeline/prescreen.py
+import json
+from pathlib import Path
+
+import numpy as np
+
+from Analysis.utils.frame_reductions import frame_reductions
+from Config.Pipeline.stability_monitor import DEFAULT_CRITERIA
+
+# Puntaje máximo (fracción del margen de divergencia) para promover
+DEFAULT_MAX_SCORE = 0.5
+
+PRESCREEN_DIR = "prescreen"
+REPORT_FILE = "prescreen_report.json"
+
+
+def prescreen_score(output_dir, criteria=None):
+    """
+    Puntaje de estabilidad de una corrida corta a partir de sus frames.
+
+    Es la mayor fracción consumida del margen de divergencia del
+    StabilityMonitor a lo largo de la corrida, medida como crecimiento
+    respecto del primer frame y solo sobre el fluido:
+
+        max((rho_max - rho_max_0) / ((rho_max_factor - 1)·rho0),
+            (rho_min_0 - rho_min) / ((1 - rho_min_factor)·rho0),
+            vel_max / max_velocity)
+
+    con rho_max/rho_min las densidades extremas del fluido. El frame 0 ya
+    tiene dispersión de densidad (en vaciado, 813–1173 con densidad
+    normalizada y más aún con la cruda) que no indica inestabilidad; lo que
+    se puntúa es cuánto crece. La frontera no entra porque su densidad no
+    evoluciona.
+
+    0 = sin perturbación; 1 = en el umbral de divergencia. None si no hay
+    frames (la corrida no llegó a escribir salida).
+    """
+    c = {**DEFAULT_CRITERIA, **(criteria or {})}
+    try:
+        df = frame_reductions(output_dir, workers=1)
+    except FileNotFoundError:
+        return None
+
+    # NaN en los diagnósticos = corrida rota
+    rho_max = df["rho_fluid_max"].astype(float)
+    rho_min = df["rho_fluid_min"].astype(float)
+    if rho_max.isna().any() or rho_min.isna().any() or (df["n_nan"] > 0).any():
+        return float("inf")
+
+    rho0 = c["rho0"]
+    ratios = [
+        (rho_max - rho_max.iloc[0]).clip(lower=0.0) / ((c["rho_max_factor"] - 1.0) * rho0),
+        (rho_min.iloc[0] - rho_min).clip(lower=0.0) / ((1.0 - c["rho_min_factor"]) * rho0),
+    ]
+    if c["max_velocity"] is not None:
+        ratios.append(df["vel_max"].astype(float) / c["max_velocity"])
+
+    return float(np.nanmax(np.column_stack(ratios)))
+
+
+def promote(row, max_score):
+    """Una corrida corta pasa si terminó su horizonte y su puntaje es bajo."""
+    return (row["status"] == "STABLE" and row.get("prescreen_score") is not None
+            and row["prescreen_score"] <= max_score)
+
+
+def savings_report(prescreen_rows, rejected_rows, full_rows, full_steps, prescreen_steps,
+                   output_dir):
+    """
+    Cómputo ahorrado por el pre-screen respecto de correr todo a largo completo.
+
+    El costo completo de una corrida descartada se estima con su tiempo por
+    paso del pre-screen × full_steps; si ya divergió en el pre-screen, su
+    corrida completa se habría cortado en el mismo punto (monitor en vivo),
+    así que cuesta lo mismo.
+    """
+    t_prescreen = sum(row["time"] for row in prescreen_rows)
+    t_full = sum(row["time"] for row in full_rows)
+
+    t_rejected_full = 0.0
+    for row in rejected_rows:
+        if row["status"] in ("STABLE", "UNSTABLE_TIMEOUT"):
+            steps_done = (row["last_step"] or 0) + 1
+            t_rejected_full += row["time"] / steps_done * full_steps
+        else:
+            t_rejected_full += row["time"]
+
+    # Sin pre-screen: completas de las promovidas + completas estimadas del resto
+    t_naive = t_full + t_rejected_full
+    t_actual = t_prescreen + t_full
+    report = {
+        "prescreen_steps": prescreen_steps,
+        "full_steps": full_steps,
+        "n_candidates": len(prescreen_rows),
+        "n_promoted": len(full_rows),
+        "time_prescreen": t_prescreen,
+        "time_full": t_full,
+        "time_actual": t_actual,
+        "time_without_prescreen_est": t_naive,
+        "time_saved_est": t_naive - t_actual,
+        "fraction_saved_est": (t_naive - t_actual) / t_naive if t_naive > 0 else 0.0,
+    }
+    with open(Path(output_dir) / REPORT_FILE, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "-" * 60)
+    print(f"Pre-screen ({prescreen_steps} pasos): {report['n_promoted']}/{report['n_candidates']} "
+          f"candidatos promovidos a {full_steps} pasos")
+    print(f"Cómputo: {t_actual:.1f}s (pre-screen {t_prescreen:.1f}s + completas {t_full:.1f}s) "
+          f"vs ~{t_naive:.1f}s sin pre-screen → ahorro ~{report['time_saved_est']:.1f}s "
+          f"({report['fraction_saved_est']:.0%})")
+    print("-" * 60)
+    return report
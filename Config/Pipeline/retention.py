@@ -0,0 +1,259 @@
+# Config/Pipeline/retention.py
+import argparse
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Analysis.utils.frame_reductions import frame_reductions, mark_pruned
+from Analysis.utils.run_archive import ARCHIVE_SUFFIX, archive_run
+from Analysis.utils.state_files import STATIC_FILE, state_files, step_from_name
+from Config.Pipeline.sweep_journal import JOURNAL_FILE, SweepJournal, params_hash
+
+# Política por defecto. Posiciones (every, first, last, peak_window) en
+# frames, no en pasos del solver.
+DEFAULT_POLICY = {
+    "enabled": True,
+    "every": 10,            # conservar 1 de cada k frames
+    "first": 5,             # primeros M frames
+    "last": 5,              # últimos M frames
+    "peak_columns": ["rho_max", "vel_max", "kinetic_energy"],
+    "peaks": 3,             # máximos locales más altos por columna
+    "peak_window": 2,       # frames a cada lado de un pico
+    "action": "delete",     # "delete" | "archive" (los descartados van a un .sphar)
+}
+ACTIONS = ("delete", "archive")
+
+POLICY_FILE = "retention_policy.json"   # override dentro de la carpeta del experimento
+REPORT_SUFFIX = "_retention.json"
+PRUNED_SUFFIX = "_pruned"
+
+
+def resolve_policy(experiment_dir, policy=None, overrides=None):
+    """
+    Política efectiva de un experimento: DEFAULT_POLICY ← policy ←
+    <experimento>/retention_policy.json ← overrides.
+    """
+    resolved = {**DEFAULT_POLICY, **(policy or {})}
+    local = Path(experiment_dir) / POLICY_FILE
+    if local.exists():
+        with open(local) as f:
+            resolved.update(json.load(f))
+    resolved.update(overrides or {})
+
+    if resolved["action"] not in ACTIONS:
+        raise ValueError(f"[ERROR] Acción desconocida: {resolved['action']}. "
+                         f"Opciones válidas: {ACTIONS}")
+    return resolved
+
+
+def _peak_positions(values, n_peaks):
+    """Posiciones de los n_peaks máximos locales más altos (ignora NaN/None)."""
+    x = np.asarray(values, dtype=float)
+    x = np.where(np.isfinite(x), x, -np.inf)
+    if len(x) < 3 or n_peaks <= 0:
+        return []
+    inner = (x[1:-1] >= x[:-2]) & (x[1:-1] >= x[2:]) & np.isfinite(x[1:-1])
+    candidates = np.flatnonzero(inner) + 1
+    best = candidates[np.argsort(x[candidates])[::-1][:n_peaks]]
+    return sorted(int(i) for i in best)
+
+
+def select_frames(df, policy):
+    """
+    Pasos a conservar según la política, a partir de la tabla completa de
+    reducciones (frame_reductions, incluidos los frames ya podados: así
+    aplicar la política dos veces da el mismo resultado).
+
+    También se conservan los frames alrededor del primero con valores no
+    finitos, donde empieza una divergencia.
+
+    Returns
+    -------
+    set[int] : pasos conservados.
+    """
+    steps = df["step"].to_numpy()
+    n = len(steps)
+    keep = set()
+
+    every = int(policy["every"] or 0)
+    if every > 0:
+        keep.update(range(0, n, every))
+    keep.update(range(min(int(policy["first"]), n)))
+    keep.update(range(max(n - int(policy["last"]), 0), n))
+
+    window = int(policy["peak_window"])
+    centers = []
+    for column in policy["peak_columns"]:
+        if column in df:
+            centers += _peak_positions(df[column].to_numpy(dtype=float), int(policy["peaks"]))
+    if "n_nan" in df and (df["n_nan"] > 0).any():
+        centers.append(int(np.argmax(df["n_nan"].to_numpy() > 0)))
+    for i in centers:
+        keep.update(range(max(i - window, 0), min(i + window + 1, n)))
+
+    return {int(steps[i]) for i in keep}
+
+
+def _free_archive_path(output_dir):
+    base = output_dir.parent / f"{output_dir.name}{PRUNED_SUFFIX}"
+    path, i = base.with_name(base.name + ARCHIVE_SUFFIX), 1
+    while path.exists():
+        i += 1
+        path = base.with_name(f"{base.name}_{i}{ARCHIVE_SUFFIX}")
+    return path
+
+
+def apply_retention(output_dir, policy=None, dry_run=False, workers=None):
+    """
+    Aplica una política de retención a la carpeta Output de una corrida
+    terminada.
+
+    Primero se calculan (o se leen del caché) las reducciones de todos los
+    frames; los frames descartados se marcan en el caché como podados, así
+    que frame_reductions, el pre-screen y el análisis de estabilización
+    siguen viendo la serie completa. Luego, según policy["action"]:
+
+    - "delete": se borran los state_*.txt descartados.
+    - "archive": se mueven a '<Output>_pruned.sphar' (run_archive), de
+      donde pueden leerse o extraerse más tarde.
+
+    Parámetros
+    ----------
+    output_dir : Path
+        Carpeta 'Output' de la simulación.
+    policy : dict | None
+        Política ya resuelta (ver resolve_policy); None = DEFAULT_POLICY.
+    dry_run : bool
+        Solo informa qué se conservaría y cuánto espacio se liberaría.
+    workers : int | None
+        Procesos para calcular las reducciones pendientes.
+
+    Returns
+    -------
+    dict : resumen (frames conservados/descartados, bytes liberados, archivo).
+    """
+    output_dir = Path(output_dir)
+    policy = {**DEFAULT_POLICY, **(policy or {})}
+
+    report = {"output_dir": str(output_dir), "policy": policy, "dry_run": dry_run,
+              "n_frames": 0, "n_kept": 0, "n_dropped": 0, "bytes_freed": 0, "archive": None}
+    present = state_files(output_dir) if output_dir.is_dir() else []
+    if not policy["enabled"] or not present:
+        return report
+
+    df = frame_reductions(output_dir, workers=workers)
+    keep = select_frames(df, policy)
+    dropped = [p for p in present if step_from_name(p) not in keep]
+
+    report.update(
+        n_frames=len(df),
+        n_kept=len(present) - len(dropped),
+        n_dropped=len(dropped),
+        bytes_freed=sum(p.stat().st_size for p in dropped),
+    )
+    if dry_run or not dropped:
+        return report
+
+    mark_pruned(output_dir, [p.name for p in dropped])
+
+    if policy["action"] == "archive":
+        archive_path = _free_archive_path(output_dir)
+        staging = archive_path.with_suffix("")
+        staging.mkdir()
+        for p in dropped:
+            p.rename(staging / p.name)
+        if (output_dir / STATIC_FILE).exists():
+            shutil.copy2(output_dir / STATIC_FILE, staging / STATIC_FILE)
+        archive_run(staging, archive_path, remove_source=True)
+        report["archive"] = str(archive_path)
+        report["bytes_freed"] -= archive_path.stat().st_size
+    else:
+        for p in dropped:
+            p.unlink()
+
+    with open(output_dir.parent / f"{output_dir.name}{REPORT_SUFFIX}", "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def retain_experiment(param_file, policy=None, overrides=None, dry_run=False, workers=None):
+    """apply_retention sobre la salida de un experimento (carpeta de su params.json)."""
+    param_file = Path(param_file)
+    with open(param_file) as f:
+        output_dir = Path(json.load(f)["io"]["output_dir_simulation"])
+    if not output_dir.is_absolute():
+        output_dir = PROJECT_ROOT / output_dir
+    resolved = resolve_policy(param_file.parent, policy, overrides)
+    return apply_retention(output_dir, resolved, dry_run=dry_run, workers=workers)
+
+
+def apply_retention_tree(root, policy=None, overrides=None, dry_run=False, workers=None):
+    """
+    Aplica la política a todos los experimentos (params.json) bajo root.
+
+    Si hay bitácoras de barrido (sweep_journal.jsonl) bajo root, solo se
+    tocan los experimentos que figuran como terminados; las corridas en
+    curso o pendientes se dejan intactas.
+
+    overrides : dict | None
+        {nombre_experimento: {clave: valor}} aplicados sobre la política
+        de cada experimento (además de su retention_policy.json).
+    """
+    overrides = overrides or {}
+    journals = [SweepJournal(path) for path in Path(root).rglob(JOURNAL_FILE)]
+    reports = []
+    skipped = 0
+
+    for param_file in sorted(Path(root).rglob("params.json")):
+        key = params_hash(param_file)
+        if journals and not any(journal.is_done(key) for journal in journals):
+            skipped += 1
+            continue
+        report = retain_experiment(param_file, policy, overrides.get(param_file.parent.name),
+                                   dry_run=dry_run, workers=workers)
+        reports.append(report)
+        if report["n_dropped"]:
+            print(f"  {param_file.parent.name}: {report['n_kept']}/{report['n_frames']} frames "
+                  f"conservados, {report['bytes_freed'] / 1e6:.1f} MB liberados")
+
+    freed = sum(r["bytes_freed"] for r in reports)
+    dropped = sum(r["n_dropped"] for r in reports)
+    label = "[INFO] (dry-run) Se liberarían" if dry_run else "[✓] Liberados"
+    print(f"{label} {freed / 1e6:.1f} MB ({dropped} frames) en {len(reports)} experimentos"
+          + (f"; {skipped} sin terminar se omitieron" if skipped else ""))
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Poda de frames de barridos terminados según una política de retención"
+    )
+    parser.add_argument("root", help="Carpeta con experimentos (params.json)")
+    parser.add_argument("--policy", default=None,
+                        help="JSON con la política (claves de DEFAULT_POLICY) y, opcional, "
+                             "'experiments': {nombre: {overrides}}")
+    parser.add_argument("--dry_run", action="store_true", help="Solo informar, sin borrar")
+    parser.add_argument("--action", choices=ACTIONS, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    policy, overrides = {}, {}
+    if args.policy:
+        with open(args.policy) as f:
+            policy = json.load(f)
+        overrides = policy.pop("experiments", {})
+    if args.action:
+        policy["action"] = args.action
+
+    apply_retention_tree(args.root, policy, overrides, dry_run=args.dry_run, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
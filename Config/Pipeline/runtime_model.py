@@ -0,0 +1,351 @@
+# Config/Pipeline/runtime_model.py
+import csv
+import json
+import math
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+IC_ROOT = PROJECT_ROOT / "InitialConditions"
+for root in (PROJECT_ROOT, IC_ROOT, IC_ROOT / "src"):
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+from src.core.ics_writer import count_particles
+from Config.Pipeline.sweep_journal import JOURNAL_FILE
+
+RESULTS_FILE = "stability_results.csv"
+DEFAULT_HISTORY = PROJECT_ROOT / "Config" / "Output"
+DEFAULT_METHOD = "quadtree"
+
+# Timeout = predicción · exp(SIGMA_K · σ_log) · SAFETY_FACTOR, nunca menor
+# que el timeout fijo del barrido y a lo sumo MAX_TIMEOUT [s]. σ_log es la
+# desviación de los residuos del ajuste: con SIGMA_K = 3 una corrida normal
+# casi nunca supera su timeout.
+SIGMA_K = 3.0
+SAFETY_FACTOR = 1.0
+MAX_TIMEOUT = 24 * 3600.0
+
+# Muestras mínimas para ajustar; con menos se usan los timeouts fijos
+MIN_SAMPLES = 3
+
+# Exponente de N supuesto cuando todas las muestras tienen el mismo N
+PRIOR_N_EXPONENT = 1.0
+
+
+@lru_cache(maxsize=1024)
+def _count_particles_cached(path, mtime_ns, size):
+    return count_particles(path)
+
+
+def _ics_particles(path):
+    # La clave incluye mtime y tamaño: un ICS regenerado se vuelve a contar
+    st = os.stat(path)
+    return _count_particles_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+def experiment_features(param_file, project_root=PROJECT_ROOT):
+    """
+    Variables del modelo para un params.json: n_particles (del ICS),
+    n_steps, dt y search_method.
+    """
+    with open(param_file) as f:
+        params = json.load(f)
+    input_file = Path(params["io"]["input_file"])
+    if not input_file.is_absolute():
+        input_file = Path(project_root) / input_file
+    return {
+        "n_particles": _ics_particles(str(input_file)),
+        "n_steps": int(params["integrator"]["n_steps"]),
+        "dt": float(params["integrator"]["dt"]),
+        "search_method": params.get("neighbors", {}).get("search_method", DEFAULT_METHOD),
+    }
+
+
+def _sample(exp_dir, row):
+    """Muestra (variables + tiempo por paso) de un experimento terminado, o None."""
+    time_s, last_step = row.get("time"), row.get("last_step")
+    try:
+        time_s = float(time_s)
+        steps_done = int(float(last_step)) + 1
+    except (TypeError, ValueError):
+        return None
+    param_file = exp_dir / "params.json"
+    if time_s <= 0 or not param_file.exists():
+        return None
+    try:
+        sample = experiment_features(param_file)
+    except (OSError, KeyError, ValueError):
+        # ICS borrado o params.json incompleto
+        return None
+    sample["step_time"] = time_s / steps_done
+    sample["experiment"] = str(exp_dir)
+    return sample
+
+
+def _history_files(roots):
+    """sweep_journal.jsonl y stability_results.csv bajo roots (sin entrar en Output/ de cada corrida)."""
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d != "Output" and not d.startswith(".")]
+            for name in (JOURNAL_FILE, RESULTS_FILE):
+                if name in filenames:
+                    yield Path(dirpath) / name
+
+
+def _experiment_dir(history_file, name):
+    """
+    Carpeta de un experimento registrado en history_file. Según el barrido
+    está junto a la bitácora (pre-screen: sweep_B_c/prescreen/<exp>;
+    sweep_spec: sweep_<name>/<exp>) o junto a la carpeta del barrido
+    (grilla y adaptativo: N_dir/<exp>). Se usa la primera con params.json.
+    """
+    for root in (history_file.parent, history_file.parent.parent):
+        if (root / name / "params.json").exists():
+            return root / name
+    return history_file.parent / name
+
+
+def collect_samples(roots=(DEFAULT_HISTORY,)):
+    """
+    Muestras de tiempo por paso de barridos anteriores.
+
+    Las bitácoras dan el nombre de cada experimento; de los CSV sin
+    bitácora se reconstruye como B_{B:.1e}_c_{c:.1e}. La carpeta de cada
+    experimento se resuelve con _experiment_dir.
+    """
+    samples = {}
+    for path in _history_files(roots):
+        if path.name == JOURNAL_FILE:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get("event") == "done":
+                        exp_dir = _experiment_dir(path, entry["name"])
+                        samples[str(exp_dir)] = (exp_dir, entry["row"])
+        else:
+            with open(path, newline="") as f:
+                for row in csv.DictReader(f):
+                    try:
+                        name = f"B_{float(row['B']):.1e}_c_{float(row['c']):.1e}"
+                    except (KeyError, ValueError):
+                        continue
+                    exp_dir = _experiment_dir(path, name)
+                    samples.setdefault(str(exp_dir), (exp_dir, row))
+
+    out = []
+    for exp_dir, row in samples.values():
+        sample = _sample(exp_dir, row)
+        if sample is not None:
+            out.append(sample)
+    return out
+
+
+class RuntimeModel:
+    """
+    Modelo log-lineal del tiempo por paso del solver:
+
+        log t_paso = a + b·log N + d·log dt + offset(search_method)
+
+    ajustado por mínimos cuadrados sobre corridas anteriores. El tiempo
+    total predicho es t_paso · n_steps. Las variables que no varían en
+    los datos (p.ej. un solo dt) se omiten del ajuste; con un solo N se
+    supone t_paso ∝ N^PRIOR_N_EXPONENT.
+    """
+
+    def __init__(self, coef=None, methods=None, use_dt=False, n_samples=0, residual_std=None):
+        self.coef = coef              # {"intercept", "log_n", "log_dt"}
+        self.methods = methods or {}  # offset por método de búsqueda
+        self.use_dt = use_dt
+        self.n_samples = n_samples
+        self.residual_std = residual_std
+
+    @property
+    def fitted(self):
+        return self.coef is not None
+
+    # ---------------------------------------------------------
+    @classmethod
+    def fit(cls, samples):
+        """Ajusta el modelo; con menos de MIN_SAMPLES muestras queda sin ajustar."""
+        samples = [s for s in samples if s["n_particles"] > 0 and s["step_time"] > 0]
+        if len(samples) < MIN_SAMPLES:
+            return cls(n_samples=len(samples))
+
+        log_n = np.log([s["n_particles"] for s in samples])
+        log_dt = np.log([s["dt"] for s in samples])
+        methods = sorted({s["search_method"] for s in samples})
+        y = np.log([s["step_time"] for s in samples])
+
+        use_n = np.ptp(log_n) > 0
+        use_dt = np.ptp(log_dt) > 0
+        if not use_n:
+            # Un solo N en los datos: se fija el exponente para poder extrapolar
+            y = y - PRIOR_N_EXPONENT * log_n
+        columns = [np.ones(len(samples))]
+        if use_n:
+            columns.append(log_n)
+        if use_dt:
+            columns.append(log_dt)
+        # El primer método es la referencia; el resto, un offset cada uno
+        for m in methods[1:]:
+            columns.append(np.array([s["search_method"] == m for s in samples], dtype=float))
+
+        X = np.column_stack(columns)
+        beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+        residual = y - X @ beta
+
+        i = 1
+        coef = {"intercept": float(beta[0]), "log_n": PRIOR_N_EXPONENT, "log_dt": 0.0}
+        if use_n:
+            coef["log_n"] = float(beta[i])
+            i += 1
+        if use_dt:
+            coef["log_dt"] = float(beta[i])
+            i += 1
+        offsets = {methods[0]: 0.0}
+        offsets.update({m: float(b) for m, b in zip(methods[1:], beta[i:])})
+
+        return cls(coef, offsets, use_dt=bool(use_dt), n_samples=len(samples),
+                   residual_std=float(residual.std()))
+
+    @classmethod
+    def from_history(cls, roots=(DEFAULT_HISTORY,)):
+        """Ajusta el modelo con las bitácoras y CSV encontrados bajo roots."""
+        return cls.fit(collect_samples(roots))
+
+    # ---------------------------------------------------------
+    def predict_step_time(self, n_particles, dt, search_method=DEFAULT_METHOD):
+        """Segundos por paso predichos (None si el modelo no está ajustado)."""
+        if not self.fitted:
+            return None
+        log_t = (self.coef["intercept"]
+                 + self.coef["log_n"] * math.log(n_particles)
+                 + (self.coef["log_dt"] * math.log(dt) if self.use_dt else 0.0)
+                 # Método no visto: se usa el de referencia
+                 + self.methods.get(search_method, 0.0))
+        return math.exp(log_t)
+
+    def predict(self, param_file):
+        """Duración total predicha [s] de un experimento (None sin modelo)."""
+        f = experiment_features(param_file)
+        step_time = self.predict_step_time(f["n_particles"], f["dt"], f["search_method"])
+        return None if step_time is None else step_time * f["n_steps"]
+
+    def timeout_for(self, param_file, default, safety_factor=SAFETY_FACTOR,
+                    sigma_k=SIGMA_K, max_timeout=MAX_TIMEOUT):
+        """
+        Timeout de un experimento:
+
+            max(default, min(max_timeout, predicción · exp(sigma_k · σ) · safety_factor))
+
+        con σ = residual_std (log). El modelo solo alarga timeouts: una
+        predicción optimista nunca mata una corrida antes que el timeout
+        fijo. Sin predicción devuelve default.
+        """
+        predicted = self.predict(param_file)
+        if predicted is None:
+            return default
+        margin = math.exp(sigma_k * (self.residual_std or 0.0)) * safety_factor
+        timeout = min(max_timeout, predicted * margin)
+        return timeout if default is None else max(default, timeout)
+
+    # ---------------------------------------------------------
+    def to_dict(self):
+        return {
+            "coef": self.coef,
+            "methods": self.methods,
+            "use_dt": self.use_dt,
+            "n_samples": self.n_samples,
+            "residual_std": self.residual_std,
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def __repr__(self):
+        if not self.fitted:
+            return f"RuntimeModel(sin ajustar, {self.n_samples} muestras)"
+        return (f"RuntimeModel(t_paso ∝ N^{self.coef['log_n']:.2f}, "
+                f"{self.n_samples} muestras, σ_log={self.residual_std:.2f})")
+
+
+def plan_runtimes(experiments, runtime_model, timeout_seconds, safety_factor=SAFETY_FACTOR,
+                  verbose=True):
+    """
+    Asigna exp["timeout"] y exp["predicted"] a cada experimento (dicts con
+    "param_file") y, si hay predicciones, los ordena (in place) de mayor a
+    menor duración predicha: lanzar primero los largos evita que uno quede
+    corriendo solo al final. Sin modelo ajustado se conserva el orden y el
+    timeout fijo.
+    """
+    fitted = runtime_model is not None and runtime_model.fitted
+    for exp in experiments:
+        exp["predicted"] = runtime_model.predict(exp["param_file"]) if fitted else None
+        exp["timeout"] = (runtime_model.timeout_for(exp["param_file"], timeout_seconds, safety_factor)
+                          if fitted else timeout_seconds)
+    if fitted:
+        experiments.sort(key=lambda exp: exp["predicted"], reverse=True)
+    if fitted and verbose:
+        total = sum(exp["predicted"] for exp in experiments)
+        timeouts = [e["timeout"] for e in experiments if e["timeout"] is not None]
+        print(f"[INFO] {runtime_model}: {total:.0f}s de cómputo predichos; "
+              f"timeouts entre {min(timeouts, default=0):.0f}s "
+              f"y {max(timeouts, default=0):.0f}s")
+
+
+def prediction_report(rows, verbose=True):
+    """
+    Compara la duración real ("time") con la predicha ("predicted_time")
+    en las filas de un barrido, solo para las corridas completas (STABLE):
+    las que divergen o fallan terminan antes y no dicen nada del modelo.
+
+    Returns
+    -------
+    dict | None : n, mediana y máximo de real / predicho y cuántas
+    corridas superaron su predicción (None si no hay filas comparables).
+    """
+    ratios = [
+        float(r["time"]) / float(r["predicted_time"])
+        for r in rows
+        if r.get("predicted_time") and r.get("time") and r.get("status", "STABLE") == "STABLE"
+    ]
+    if not ratios:
+        return None
+    report = {
+        "n": len(ratios),
+        "median_ratio": float(np.median(ratios)),
+        "max_ratio": float(np.max(ratios)),
+        "n_over": sum(x > 1.0 for x in ratios),
+    }
+    if verbose:
+        print(f"[INFO] Tiempo real / predicho en {report['n']} corridas completas: "
+              f"mediana {report['median_ratio']:.2f}, máx {report['max_ratio']:.2f} "
+              f"({report['n_over']} por encima de la predicción)")
+    return report
+
+
+def main():
+    """Ajusta el modelo sobre las carpetas dadas (por defecto Config/Output) y lo muestra."""
+    roots = [Path(p) for p in sys.argv[1:]] or [DEFAULT_HISTORY]
+    model = RuntimeModel.from_history(roots)
+    print(f"[INFO] {model}")
+    if model.fitted:
+        print(json.dumps(model.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# Config/Pipeline/stability_monitor.py
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from Analysis.utils.frame_reductions import REDUCTION_COLUMNS, reduce_frame
+from Analysis.utils.state_files import read_state, state_files, step_from_name
+
+
+# Criterios de divergencia por defecto (todos configurables)
+DEFAULT_CRITERIA = {
+    "rho0": 1000.0,
+    "rho_max_factor": 2.0,           # rho_max > factor * rho0
+    "rho_min_factor": 0.5,           # rho_min < factor * rho0
+    "max_velocity": 10.0,            # |v| máxima del fluido [m/s] (None = sin límite)
+    "domain_margin": 0.25,           # margen relativo sobre la caja de la frontera
+    # Fracción de fluido fuera del dominio (None = sin revisar). Desactivado
+    # por defecto: en geometrías con salida (vaciado) el fluido abandona la
+    # caja de la frontera por el orificio sin que la corrida sea inestable.
+    "max_escaped_fraction": None,
+    "poll_interval": 1.0,            # segundos entre revisiones del directorio
+}
+
+
+def _load_criteria(criteria):
+    merged = dict(DEFAULT_CRITERIA)
+    if criteria:
+        merged.update(criteria)
+    return merged
+
+
+class StabilityMonitor:
+    """
+    Sigue los state_*.txt de una corrida a medida que el solver los escribe
+    y evalúa diagnósticos de densidad, velocidad y posición en cada frame.
+
+    Un frame se considera completo cuando ya existe el siguiente (o cuando
+    el proceso terminó), así nunca se lee un archivo a medio escribir.
+    """
+
+    def __init__(self, output_dir, criteria=None, start_time=None):
+        self.output_dir = Path(output_dir)
+        self.criteria = _load_criteria(criteria)
+        # Ignora frames de una ejecución anterior en la misma carpeta
+        self.start_time = start_time if start_time is not None else time.time()
+
+        self.history = []
+        self.domain = None
+        self.tripped = False
+        self.reason = None
+        self._seen = set()
+
+    # ---------------------------------------------------------
+    def _pending_frames(self, final):
+        archivos = [
+            f for f in state_files(self.output_dir)
+            if f.name not in self._seen and f.stat().st_mtime >= self.start_time - 1.0
+        ]
+        return archivos if final else archivos[:-1]
+
+    def _set_domain(self, data):
+        # El dominio es la caja de las partículas de frontera (type 1), no la
+        # del fluido inicial: el fluido puede ocupar legítimamente todo el
+        # recipiente. Sin frontera se usa el frame completo.
+        walls = data["type"] == 1
+        x = data["posx"][walls] if walls.any() else data["posx"]
+        y = data["posy"][walls] if walls.any() else data["posy"]
+        xmin, xmax = float(np.nanmin(x)), float(np.nanmax(x))
+        ymin, ymax = float(np.nanmin(y)), float(np.nanmax(y))
+        mx = self.criteria["domain_margin"] * (xmax - xmin)
+        my = self.criteria["domain_margin"] * (ymax - ymin)
+        self.domain = (xmin - mx, xmax + mx, ymin - my, ymax + my)
+
+    def _evaluate(self, diag):
+        c = self.criteria
+
+        if diag["n_nan"] > 0:
+            return f"NaN/Inf en {diag['n_nan']} valores"
+
+        if diag["rho_max"] is not None and diag["rho_max"] > c["rho_max_factor"] * c["rho0"]:
+            return f"rho_max={diag['rho_max']:.4g} > {c['rho_max_factor']}·rho0"
+
+        if diag["rho_min"] is not None and diag["rho_min"] < c["rho_min_factor"] * c["rho0"]:
+            return f"rho_min={diag['rho_min']:.4g} < {c['rho_min_factor']}·rho0"
+
+        if (c["max_velocity"] is not None and diag["vel_max"] is not None
+                and diag["vel_max"] > c["max_velocity"]):
+            return f"vel_max={diag['vel_max']:.4g} > {c['max_velocity']} m/s"
+
+        if (c["max_escaped_fraction"] is not None and diag["n_fluid"]
+                and diag["escaped_fraction"] > c["max_escaped_fraction"]):
+            return f"{diag['escaped_fraction']:.2%} del fluido fuera del dominio"
+
+        return None
+
+    def process_frame(self, path):
+        """Calcula los diagnósticos de un frame y devuelve el motivo de divergencia o None."""
+        data = read_state(path, REDUCTION_COLUMNS)
+        if self.domain is None:
+            self._set_domain(data)
+
+        diag = reduce_frame(data)
+        fluid = data["type"] == 0
+        x, y = data["posx"][fluid], data["posy"][fluid]
+        xmin, xmax, ymin, ymax = self.domain
+        escaped = ~((x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax))
+        diag["escaped_fraction"] = float(escaped.mean()) if len(x) else 0.0
+        diag["step"] = step_from_name(path)
+
+        self.history.append(diag)
+        self._seen.add(Path(path).name)
+        return self._evaluate(diag)
+
+    def poll(self, final=False):
+        """
+        Procesa los frames completos nuevos. Devuelve True si algún criterio
+        de divergencia se activó.
+        """
+        if self.tripped:
+            return True
+
+        for archivo in self._pending_frames(final):
+            try:
+                reason = self.process_frame(archivo)
+            except (OSError, ValueError):
+                # Archivo aún en escritura o truncado; se reintenta luego
+                break
+            if reason is not None:
+                self.tripped = True
+                self.reason = f"step {self.history[-1]['step']}: {reason}"
+                return True
+        return False
+
+    @property
+    def last_step(self):
+        return self.history[-1]["step"] if self.history else None
+
+    def summary(self):
+        return {
+            "tripped": self.tripped,
+            "reason": self.reason,
+            "frames_checked": len(self.history),
+            "last_step": self.last_step,
+            "criteria": self.criteria,
+            "last_diagnostics": self.history[-1] if self.history else None,
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
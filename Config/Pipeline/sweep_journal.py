@@ -0,0 +1,107 @@
+# Config/Pipeline/sweep_journal.py
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+JOURNAL_FILE = "sweep_journal.jsonl"
+
+
+def params_hash(params):
+    """
+    Clave de un experimento: sha256 del params.json canonizado (claves
+    ordenadas, sin espacios). Acepta la ruta al archivo o el dict.
+    """
+    if not isinstance(params, dict):
+        with open(params, "r") as f:
+            params = json.load(f)
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SweepJournal:
+    """
+    Bitácora append-only de un barrido (una línea JSON por evento).
+
+    Cada experimento registra "start" al lanzarse y "done" con su fila de
+    resultados al terminar; cada línea se sincroniza a disco (fsync), así
+    que si el pipeline se interrumpe solo se pierde el experimento en curso.
+    Al reanudar, los experimentos con "done" se saltan.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._done = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        line = "\n"
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última línea truncada por una interrupción
+                    continue
+                if entry.get("event") == "done":
+                    self._done[entry["key"]] = entry
+        if not line.endswith("\n"):
+            # Se cierra la línea truncada para que el próximo evento no
+            # quede pegado a ella (y se pierda al volver a cargar)
+            with open(self.path, "a") as f:
+                f.write("\n")
+
+    def _append(self, entry):
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            if entry["event"] == "done":
+                self._done[entry["key"]] = entry
+
+    # ---------------------------------------------------------
+    def start(self, key, name):
+        self._append({"event": "start", "key": key, "name": name, "t": time.time()})
+
+    def done(self, key, name, row):
+        self._append({"event": "done", "key": key, "name": name, "t": time.time(), "row": row})
+
+    def is_done(self, key):
+        return key in self._done
+
+    def row(self, key):
+        return self._done[key]["row"]
+
+    def rows(self):
+        """Filas de resultados de los experimentos terminados (última por clave)."""
+        return [entry["row"] for entry in self._done.values()]
+
+    def __len__(self):
+        return len(self._done)
+
+
+def main():
+    """Reconstruye stability_results.csv a partir de la bitácora de un barrido."""
+    if len(sys.argv) != 2:
+        print("Uso: python sweep_journal.py <carpeta sweep_B_c>")
+        sys.exit(1)
+
+    PROJECT_ROOT = Path(__file__).resolve().parents[2]
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from Config.Pipeline.est_tree_pipeline import rebuild_results_csv
+
+    rebuild_results_csv(Path(sys.argv[1]))
+
+
+if __name__ == "__main__":
+    main()
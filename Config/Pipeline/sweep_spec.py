@@ -0,0 +1,319 @@
+# Config/Pipeline/sweep_spec.py
+import argparse
+import itertools
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Config.Pipeline.est_tree_pipeline import (
+    RESULT_FIELDS,
+    check_preflight,
+    run_experiments,
+    save_results_csv,
+)
+from Config.Pipeline.runtime_model import DEFAULT_HISTORY, RuntimeModel
+from Config.Pipeline.sweep_journal import params_hash
+from Config.Pipeline.vaciado10_1e_3.generate_ics import generate_ics_ladder, ladder_paths
+from Config.utils.create_simJSON import create_simulation_config
+
+# Nombres cortos de ejes -> ruta en params.json
+ALIASES = {
+    "B": "physics.eos_params.monaghan.B",
+    "c": "physics.eos_params.monaghan.c",
+    "g": "physics.gravity_magnitude",
+    "dt": "integrator.dt",
+    "n_steps": "integrator.n_steps",
+    "search_method": "neighbors.search_method",
+    "h_factor": "kernel.h_factor",
+}
+
+# Eje especial: resolución del ICS (se genera con generate_ics_ladder)
+ICS_AXIS = "N"
+
+SAMPLING_MODES = ("cartesian", "zip", "random", "lhs")
+
+
+def _get_param(params, path):
+    node = params
+    for key in path.split("."):
+        node = node[key]
+    return node
+
+
+def axis_path(name, axis=None):
+    """Ruta en params.json de un eje (alias, "path" explícito o el propio nombre)."""
+    if axis and "path" in axis:
+        return axis["path"]
+    return ALIASES.get(name, name)
+
+
+def _cast(axis, value):
+    if axis.get("type") == "int":
+        return int(round(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def axis_values(name, axis):
+    """Valores de un eje para los modos de grilla: "values" o "range" + "num"."""
+    if "values" in axis:
+        return list(axis["values"])
+    if "range" in axis:
+        lo, hi = axis["range"]
+        num = int(axis.get("num", 2))
+        if axis.get("scale", "linear") == "log":
+            grid = np.logspace(np.log10(lo), np.log10(hi), num)
+        else:
+            grid = np.linspace(lo, hi, num)
+        return [_cast(axis, v) for v in grid]
+    raise ValueError(f"[ERROR] El eje '{name}' necesita 'values' o 'range'.")
+
+
+def _from_unit(name, axis, u):
+    """Lleva u ∈ [0, 1) al dominio del eje (muestreo aleatorio / LHS)."""
+    if "values" in axis:
+        values = axis["values"]
+        return values[min(int(u * len(values)), len(values) - 1)]
+    if "range" in axis:
+        lo, hi = axis["range"]
+        if axis.get("scale", "linear") == "log":
+            v = 10 ** (np.log10(lo) + u * (np.log10(hi) - np.log10(lo)))
+        else:
+            v = lo + u * (hi - lo)
+        return _cast(axis, float(v))
+    raise ValueError(f"[ERROR] El eje '{name}' necesita 'values' o 'range'.")
+
+
+def sample_points(spec):
+    """
+    Puntos del barrido como lista de {eje: valor}.
+
+    - cartesian: producto de todos los ejes; los ejes con el mismo "zip"
+      avanzan juntos (p.ej. pares (B, c) emparejados).
+    - zip: todos los ejes avanzan juntos (mismo largo).
+    - random: "n" puntos uniformes (en log si "scale": "log").
+    - lhs: "n" puntos por hipercubo latino: cada eje se divide en n
+      estratos y cada estrato se usa exactamente una vez.
+    """
+    axes = spec["axes"]
+    sampling = spec.get("sampling", {})
+    mode = sampling.get("mode", "cartesian")
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"[ERROR] Muestreo desconocido: {mode}. Opciones válidas: {SAMPLING_MODES}")
+
+    names = list(axes)
+    if mode in ("cartesian", "zip"):
+        groups = {}
+        for name in names:
+            group = "__all__" if mode == "zip" else axes[name].get("zip", name)
+            groups.setdefault(group, []).append(name)
+
+        blocks = []
+        for group, members in groups.items():
+            columns = [axis_values(m, axes[m]) for m in members]
+            if len({len(col) for col in columns}) > 1:
+                raise ValueError(f"[ERROR] Ejes emparejados con distinto largo: {members}")
+            blocks.append([dict(zip(members, row)) for row in zip(*columns)])
+
+        return [
+            {k: v for block in combo for k, v in block.items()}
+            for combo in itertools.product(*blocks)
+        ]
+
+    n = int(sampling["n"])
+    rng = np.random.default_rng(sampling.get("seed"))
+    points = [{} for _ in range(n)]
+    for name in names:
+        if mode == "lhs":
+            u = (rng.permutation(n) + rng.random(n)) / n
+        else:
+            u = rng.random(n)
+        for point, ui in zip(points, u):
+            point[name] = _from_unit(name, axes[name], ui)
+    return points
+
+
+def _fmt(value):
+    if isinstance(value, bool) or isinstance(value, str):
+        return str(value)
+    if isinstance(value, int):
+        return str(value)
+    return f"{value:.3e}"
+
+
+def experiment_name(point):
+    """Nombre determinista del experimento a partir de sus valores (p.ej. N_40_B_5.000e-02)."""
+    parts = [f"{name.split('.')[-1]}_{_fmt(value)}" for name, value in point.items()]
+    return "_".join(parts) or "base"
+
+
+def _resolve(path):
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def load_spec(spec_path):
+    with open(spec_path) as f:
+        spec = json.load(f)
+    for key in ("name", "base_json", "axes"):
+        if key not in spec:
+            raise ValueError(f"[ERROR] Falta '{key}' en la especificación {spec_path}")
+    if ICS_AXIS not in spec["axes"] and "input_file" not in spec.get("ics", {}):
+        raise ValueError("[ERROR] Sin eje 'N' hay que indicar ics.input_file.")
+    return spec
+
+
+def expand_spec(spec):
+    """
+    Crea los experimentos del barrido (params.json vía create_simulation_config)
+    bajo <project_dir>/sweep_<name>/.
+
+    Con eje N, los ICS de cada resolución se generan (o se toman del caché)
+    con generate_ics_ladder dentro de project_dir/N_xxx; si no, todos los
+    experimentos usan ics.input_file.
+
+    Returns
+    -------
+    (campaign_root, experiments) con experiments en el formato de
+    run_experiments (name, param_file, key, steps, values, input_file).
+    """
+    project_dir = _resolve(spec.get("project_dir", "Config/Output/Sweeps"))
+    campaign_root = project_dir / f"sweep_{spec['name']}"
+    campaign_root.mkdir(parents=True, exist_ok=True)
+
+    with open(PROJECT_ROOT / "Config" / "parameters" / "simulation" / spec["base_json"]) as f:
+        base_params = json.load(f)
+
+    points = sample_points(spec)
+    axes = spec["axes"]
+    fixed = spec.get("fixed", {})
+
+    # ICS por N (una sola generación por resolución, en paralelo)
+    ics_files = {}
+    if ICS_AXIS in axes:
+        Ns = sorted({int(p[ICS_AXIS]) for p in points})
+        reports = generate_ics_ladder(project_dir, Ns, workers=spec.get("ics", {}).get("workers"))
+        failed = [N for N, r in reports.items() if not r["ok"]]
+        if failed:
+            raise RuntimeError(f"[ERROR] Falló la generación de ICS para N = {failed}")
+        ics_files = {N: ladder_paths(project_dir, N)["txt"] for N in Ns}
+    default_ics = _resolve(spec["ics"]["input_file"]) if "input_file" in spec.get("ics", {}) else None
+
+    experiments, seen = [], {}
+    for point in points:
+        # Valores por ruta: fijos del spec y luego los del punto
+        values = {axis_path(k): v for k, v in fixed.items()}
+        values.update({axis_path(k, axes[k]): v for k, v in point.items() if k != ICS_AXIS})
+
+        def _value(alias):
+            path = ALIASES[alias]
+            return values.pop(path) if path in values else _get_param(base_params, path)
+
+        name = experiment_name(point)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 0
+
+        input_file = ics_files[int(point[ICS_AXIS])] if ICS_AXIS in point else default_ics
+        steps = int(_value("n_steps"))
+        param_file = create_simulation_config(
+            experiment_name=name,
+            input_file=str(input_file),
+            base_json=spec["base_json"],
+            B=_value("B"),
+            c=_value("c"),
+            steps=steps,
+            g=_value("g"),
+            dt=_value("dt"),
+            project_root=PROJECT_ROOT,
+            project_dir=campaign_root,
+            overrides=values
+        )
+        experiments.append({
+            "name": name, "param_file": param_file, "steps": steps,
+            "values": dict(point), "key": params_hash(param_file),
+            "input_file": input_file
+        })
+
+    with open(campaign_root / "spec.json", "w") as f:
+        json.dump(spec, f, indent=2)
+    with open(campaign_root / "manifest.json", "w") as f:
+        json.dump([{"name": e["name"], "values": e["values"], "input_file": str(e["input_file"])}
+                   for e in experiments], f, indent=2)
+
+    print(f"[✓] {len(experiments)} experimentos en {campaign_root}")
+    return campaign_root, experiments
+
+
+def run_sweep_spec(spec_path, sim_executable=None, expand_only=False, **run_options):
+    """
+    Expande y ejecuta un barrido declarativo sin preguntas por consola.
+
+    run_options (y la sección "run" del spec, con menor prioridad) se pasan
+    a run_experiments: timeout_seconds, live_monitor, max_parallel, etc.
+    Con "preflight": true (por defecto) se descartan los experimentos cuyo
+    ICS no pasa el pre-flight de vecinos.
+
+    Returns
+    -------
+    (results, campaign_root)
+    """
+    spec = load_spec(spec_path)
+    campaign_root, experiments = expand_spec(spec)
+    if expand_only:
+        return [], campaign_root
+
+    options = {**spec.get("run", {}), **run_options}
+    preflight = options.pop("preflight", True)
+    preflight_options = options.pop("preflight_options", None)
+
+    if preflight:
+        ok = {}
+        for ics in {e["input_file"] for e in experiments}:
+            ok[ics] = check_preflight(ics, Path(ics).parent, preflight_options)
+        skipped = [e["name"] for e in experiments if not ok[e["input_file"]]]
+        if skipped:
+            print(f"[ERROR] {len(skipped)} experimentos descartados por el pre-flight de vecinos")
+        experiments = [e for e in experiments if ok[e["input_file"]]]
+
+    sim_executable = Path(sim_executable) if sim_executable else PROJECT_ROOT / "simulacion"
+    runtime_model = options.pop(
+        "runtime_model",
+        RuntimeModel.from_history(list(dict.fromkeys([DEFAULT_HISTORY, campaign_root.parent])))
+    )
+
+    results = run_experiments(experiments, campaign_root, sim_executable,
+                              runtime_model=runtime_model, **options)
+
+    fields = list(spec["axes"]) + [f for f in RESULT_FIELDS if f not in spec["axes"]]
+    save_results_csv(results, campaign_root, fields=fields)
+    return results, campaign_root
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido declarativo de simulaciones SPH")
+    parser.add_argument("spec", help="JSON con la especificación del barrido")
+    parser.add_argument("--expand_only", action="store_true",
+                        help="Solo crea los experimentos (params.json), sin ejecutarlos")
+    parser.add_argument("--sim", default=None, help="Ejecutable del solver")
+    parser.add_argument("--max_parallel", type=int, default=None)
+    args = parser.parse_args()
+
+    options = {}
+    if args.max_parallel is not None:
+        options["max_parallel"] = args.max_parallel
+
+    run_sweep_spec(args.spec, sim_executable=args.sim, expand_only=args.expand_only, **options)
+
+
+if __name__ == "__main__":
+    main()
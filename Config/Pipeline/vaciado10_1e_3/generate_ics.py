@@ -1,10 +1,52 @@
-from Config.utils.create_ics import create_ics_txt
-
-def generate_ics(boundary_json, fluid_json, txt_path, log_path):
-    ret = create_ics_txt(
-        boundary_path=str(boundary_json),
-        fluid_path=str(fluid_json),
-        output_path=str(txt_path),
-        output_log_path=str(log_path)
+from pathlib import Path
+
+from Config.utils.create_ics import create_ics_batch
+from Config.Pipeline.vaciado10_1e_3.create_jsons import create_fluid_json, create_boundary_json
+
+
+def generate_ics(boundary_json, fluid_json, txt_path, log_path, use_cache=True):
+    report, = create_ics_batch(
+        [(fluid_json, boundary_json, txt_path, log_path)],
+        workers=1,
+        use_cache=use_cache
     )
-    return ret == 0
+    return report["ok"]
+
+
+def ladder_paths(project_dir, N):
+    """Rutas de JSON e ICS para un N dentro del proyecto (carpeta N_xxx)."""
+    N_dir = Path(project_dir) / f"N_{N}"
+    return {
+        "N_dir": N_dir,
+        "fluid": N_dir / "json" / f"fluid_{N}.json",
+        "boundary": N_dir / "json" / f"boundary_{N}.json",
+        "txt": N_dir / "txt" / f"ics_{N}.txt",
+        "log": N_dir / "txt" / f"ics_{N}_log.json",
+    }
+
+
+def generate_ics_ladder(project_dir, Ns, workers=None, use_cache=True):
+    """
+    Crea los JSON y genera los ICS de toda una escalera de resoluciones N
+    en una sola llamada (en paralelo). Con use_cache, los N cuya geometría
+    ya se generó antes se copian del caché de ICS.
+
+    Retorna:
+    --------
+    dict : {N: reporte} con las rutas y el resultado de cada N.
+    """
+    jobs = []
+    for N in Ns:
+        paths = ladder_paths(project_dir, N)
+        paths["fluid"].parent.mkdir(parents=True, exist_ok=True)
+        paths["txt"].parent.mkdir(parents=True, exist_ok=True)
+
+        esp = create_fluid_json(N, paths["fluid"])
+        create_boundary_json(esp, paths["boundary"])
+        jobs.append((paths["fluid"], paths["boundary"], paths["txt"], paths["log"]))
+
+    reports = create_ics_batch(jobs, workers=workers, use_cache=use_cache)
+    return {
+        N: {**report, "N_dir": str(ladder_paths(project_dir, N)["N_dir"])}
+        for N, report in zip(Ns, reports)
+    }
@@ -7,7 +7,7 @@ if str(CONFIG_ROOT) not in sys.path:
 
 from Config.Pipeline.vaciado10_1e_3.create_folders import create_project_structure
 from Config.Pipeline.vaciado10_1e_3.create_jsons import create_fluid_json, create_boundary_json
-from Config.Pipeline.vaciado10_1e_3.generate_ics import generate_ics
+from Config.Pipeline.vaciado10_1e_3.generate_ics import generate_ics, generate_ics_ladder
 from Config.Pipeline.vaciado10_1e_3.visualize import show_ics_and_confirm
 
 
@@ -66,9 +66,18 @@ def run_ics_pipeline():
         p.mkdir(parents=True, exist_ok=True)
 
     # Chequeo de archivos existentes (por N)
+    txt_path = paths_N["txt"] / f"ics_{N}.txt"
+    log_path = paths_N["txt"] / f"ics_{N}_log.json"
+
     if files_for_N_exist(paths_N, N):
         print(f"\nYa existen archivos para N = {N}")
-        op = input("¿Deseas sobrescribirlos? (Y/N): ").strip().upper()
+        op = input(
+            "¿Deseas sobrescribirlos? (Y/N, R = reutilizar el ICS existente, "
+            "p.ej. para reanudar un barrido): "
+        ).strip().upper()
+        if op == "R" and txt_path.exists():
+            print(f"Reutilizando {txt_path}")
+            return txt_path, project_dir, N_dir
         if op != "Y":
             print("Ejecución cancelada.")
             return
@@ -80,9 +89,6 @@ def run_ics_pipeline():
     boundary_path = paths_N["json"] / f"boundary_{N}.json"
     create_boundary_json(esp, boundary_path)
 
-    txt_path = paths_N["txt"] / f"ics_{N}.txt"
-    log_path = paths_N["txt"] / f"ics_{N}_log.json"
-
     if not generate_ics(boundary_path, fluid_path, txt_path, log_path):
         print("Error generando ICS.")
         return
@@ -108,5 +114,50 @@ def run_ics_pipeline():
     return txt_path, project_dir, N_dir
 
 
+def run_ics_ladder(base=None, name=None, Ns=None, workers=None):
+    """
+    Genera los ICS de una escalera de N (p.ej. 20,40,80,160) en una sola
+    llamada, en paralelo y sin visualización interactiva.
+
+    Los argumentos que no se pasen se piden por consola.
+
+    Retorna:
+    --------
+    dict : {N: reporte} (ver generate_ics_ladder), o None si se cancela.
+    """
+    DEFAULT_BASE = CONFIG_ROOT / "Output"
+    DEFAULT_NAME = "EstAnalysisRhoNtree"
+
+    if base is None:
+        base = input(f"Ruta base del proyecto [default={DEFAULT_BASE}]: ").strip() or DEFAULT_BASE
+    base = Path(base)
+    if not base.exists():
+        print(f"[ERROR] La ruta base no existe: {base}")
+        return
+
+    if name is None:
+        name = input(f"Nombre del proyecto [default={DEFAULT_NAME}]: ").strip() or DEFAULT_NAME
+
+    if Ns is None:
+        try:
+            Ns = [int(v) for v in input("Valores N separados por coma (ej: 20,40,80): ").split(",")]
+        except ValueError:
+            print("[ERROR] Los N deben ser enteros.")
+            return
+
+    paths = create_project_structure(base, name)
+    reports = generate_ics_ladder(paths["root"], Ns, workers=workers)
+
+    fallidos = [N for N, r in reports.items() if not r["ok"]]
+    if fallidos:
+        print(f"[ERROR] Falló la generación de ICS para N = {fallidos}")
+
+    return reports
+
+
 if __name__ == "__main__":
-    run_ics_pipeline()
+    # python main_pipe_ics.py ladder → escalera de N en paralelo
+    if len(sys.argv) > 1 and sys.argv[1] == "ladder":
+        run_ics_ladder()
+    else:
+        run_ics_pipeline()
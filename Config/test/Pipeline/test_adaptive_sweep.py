@@ -0,0 +1,72 @@
+# test_adaptive_sweep.py
+
+import json
+import math
+
+import Config.Pipeline.adaptive_sweep as adaptive_sweep
+from Config.Pipeline.adaptive_sweep import (
+    bisection_steps, find_stability_frontier, geometric_midpoint
+)
+from Config.Pipeline.sweep_journal import JOURNAL_FILE
+
+
+def test_punto_medio_y_numero_de_pasos():
+    assert math.isclose(geometric_midpoint(1e-2, 1.0), 0.1)
+    assert bisection_steps(1e-3, 10, log_tol=0.5) == 3      # 4 décadas → 0.5
+    assert bisection_steps(1.0, 1.2, log_tol=0.1) == 0
+
+
+def _frontier(tmp_path, fake_solver, **kwargs):
+    return find_stability_frontier(
+        project_dir=tmp_path / "N_10",
+        input_file=tmp_path / "ics.txt",
+        sim_executable=fake_solver,
+        base_json="AndresSimParams.json",
+        c_values=[1e-3],
+        B_min=1e-3,
+        B_max=10.0,
+        log_tol=0.5,
+        steps=3,
+        preflight=False,
+        max_parallel=1,
+        **kwargs,
+    )
+
+
+def test_biseccion_acota_la_frontera(tmp_path, fake_solver, monkeypatch):
+    monkeypatch.setenv("FAKE_STABLE_B_MIN", "0.1")
+    frontiers, results, sweep_root = _frontier(tmp_path, fake_solver)
+
+    (fr,) = frontiers
+    assert fr["converged"]
+    assert fr["B_unstable"] < 0.1 <= fr["B_stable"]
+    assert fr["log_width"] <= 0.5
+    assert fr["n_runs"] == len(results) == 2 + bisection_steps(1e-3, 10.0, 0.5)
+    assert {r["status"] for r in results} == {"STABLE", "UNSTABLE_SEGFAULT"}
+    assert json.loads((sweep_root / "frontier.json").read_text())["frontiers"] == frontiers
+
+    # Reanudar no vuelve a correr nada
+    n_lines = len((sweep_root / JOURNAL_FILE).read_text().splitlines())
+    again, _, _ = _frontier(tmp_path, fake_solver)
+    assert again == frontiers
+    assert len((sweep_root / JOURNAL_FILE).read_text().splitlines()) == n_lines
+
+
+def test_sin_frontera_en_el_rango(tmp_path, fake_solver):
+    frontiers, results, _ = _frontier(tmp_path, fake_solver)
+    assert frontiers[0]["converged"] is False
+    assert frontiers[0]["range_status"] == "STABLE"
+    assert len(results) == 2
+
+
+def test_memoria_por_corrida_llega_al_scheduler(tmp_path, fake_solver, monkeypatch):
+    usados = []
+
+    class _Scheduler(adaptive_sweep.SweepScheduler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            usados.append(self.memory_per_run)
+
+    monkeypatch.setattr(adaptive_sweep, "SweepScheduler", _Scheduler)
+    _frontier(tmp_path, fake_solver, memory_per_run=1024)
+    assert usados == [1024]
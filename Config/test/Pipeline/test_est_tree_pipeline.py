@@ -0,0 +1,20 @@
+# test_est_tree_pipeline.py
+
+from Config.Pipeline.est_tree_pipeline import classify_run
+
+
+def test_corrida_completa_es_estable():
+    """El solver imprime los pasos 0 … n_steps-1: el último paso es steps - 1."""
+    assert classify_run("EXIT", 3999, 4000, 0) == "STABLE"
+    assert classify_run("EXIT", 4, 5, 0) == "STABLE"
+
+
+def test_corrida_incompleta():
+    assert classify_run("EXIT", 3998, 4000, 0) == "UNSTABLE_EARLY_STOP"
+    assert classify_run("TIMEOUT", 100, 4000, -9) == "UNSTABLE_TIMEOUT"
+    assert classify_run("EXIT", 100, 4000, -11) == "UNSTABLE_SEGFAULT"
+
+
+def test_divergencia_y_sin_salida():
+    assert classify_run("DIVERGED", 3999, 4000, -9) == "UNSTABLE_DIVERGED"
+    assert classify_run("EXIT", None, 4000, 1) == "UNSTABLE_NO_OUTPUT"
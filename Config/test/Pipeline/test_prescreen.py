@@ -0,0 +1,40 @@
+# test_prescreen.py
+
+import pytest
+
+from Config.Pipeline.est_tree_pipeline import run_experiments
+from Config.Pipeline.prescreen import DEFAULT_MAX_SCORE, prescreen_score, promote
+from conftest import make_experiment
+
+
+def _screen(tmp_path, fake_solver, fake):
+    exp = make_experiment(tmp_path / "prescreen", "exp", steps=4, fake=fake)
+    row, = run_experiments([exp], tmp_path / "prescreen", fake_solver,
+                           timeout_seconds=60, max_parallel=1)
+    row["prescreen_score"] = prescreen_score(exp["param_file"].parent / "Output")
+    return row
+
+
+@pytest.mark.parametrize("rho_fluid", [
+    [813.0, 1173.0],        # vaciado, densidad normalizada en el paso 0
+    [700.0, 1500.0],        # densidad cruda: dispersión inicial mayor
+])
+def test_corrida_estable_se_promueve(tmp_path, fake_solver, rho_fluid):
+    """La dispersión de densidad del frame 0 no cuenta como inestabilidad."""
+    row = _screen(tmp_path, fake_solver, {"rho_fluid": rho_fluid})
+    assert row["status"] == "STABLE"
+    assert row["prescreen_score"] == pytest.approx(0.0)
+    assert promote(row, DEFAULT_MAX_SCORE)
+
+
+def test_densidad_que_crece_no_se_promueve(tmp_path, fake_solver):
+    row = _screen(tmp_path, fake_solver, {"rho_fluid": [813.0, 1173.0], "diverge_at": 2})
+    assert row["status"] == "STABLE"                # terminó su horizonte corto
+    assert row["prescreen_score"] > 1.0
+    assert not promote(row, DEFAULT_MAX_SCORE)
+
+
+def test_corrida_caida_no_se_promueve(tmp_path, fake_solver):
+    row = _screen(tmp_path, fake_solver, {"crash_at": 2})
+    assert row["status"] == "UNSTABLE_SEGFAULT"
+    assert not promote(row, DEFAULT_MAX_SCORE)
@@ -0,0 +1,96 @@
+# test_retention.py
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Analysis.utils.frame_reductions import frame_reductions
+from Analysis.utils.run_archive import open_archive
+from Analysis.utils.state_files import state_files, step_from_name, write_state
+from Config.Pipeline.retention import (
+    POLICY_FILE, apply_retention, apply_retention_tree, resolve_policy, select_frames,
+)
+from Config.Pipeline.sweep_journal import JOURNAL_FILE, SweepJournal, params_hash
+from conftest import tank_frame
+
+POLICY = {"every": 10, "first": 2, "last": 2, "peaks": 1, "peak_window": 1,
+          "peak_columns": ["rho_max"]}
+
+
+def _run(output_dir, n_frames=30, peak=17):
+    """Frames con densidad constante salvo un pico en el paso peak."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for s in range(n_frames):
+        write_state(output_dir / f"state_{s:04d}.txt",
+                    tank_frame(rho=1500.0 if s == peak else 1000.0 + 0.1 * (s % 2)))
+    return output_dir
+
+
+def _steps(output_dir):
+    return [step_from_name(p) for p in state_files(output_dir)]
+
+
+def test_seleccion_de_frames():
+    df = pd.DataFrame({"step": np.arange(0, 300, 10),
+                       "rho_max": np.r_[np.zeros(17), 5.0, np.zeros(12)],
+                       "n_nan": np.r_[np.zeros(25), np.ones(5)]})
+    keep = select_frames(df, POLICY)
+    # 1 de cada 10 frames, primeros/últimos 2, pico en la posición 17 ± 1 y
+    # primer NaN (posición 25) ± 1
+    posiciones = {0, 10, 20, 1, 28, 29, 16, 17, 18, 24, 25, 26}
+    assert keep == {int(10 * i) for i in posiciones}
+
+
+def test_borrar_conserva_las_reducciones(tmp_path):
+    output_dir = _run(tmp_path / "Output")
+    completa = frame_reductions(output_dir, workers=1)
+
+    report = apply_retention(output_dir, POLICY)
+    esperados = [0, 1, 10, 16, 17, 18, 20, 28, 29]
+    assert _steps(output_dir) == esperados
+    assert report["n_kept"] == len(esperados) and report["n_dropped"] == 30 - len(esperados)
+    assert report["bytes_freed"] > 0
+
+    # La serie completa sigue disponible y la política es idempotente
+    pd.testing.assert_frame_equal(frame_reductions(output_dir, workers=1), completa)
+    assert apply_retention(output_dir, POLICY)["n_dropped"] == 0
+    assert _steps(output_dir) == esperados
+
+
+def test_archivar_los_descartados(tmp_path):
+    output_dir = _run(tmp_path / "Output")
+    originales = {p.name: p.read_bytes() for p in state_files(output_dir)}
+
+    report = apply_retention(output_dir, {**POLICY, "action": "archive"})
+    archive = open_archive(report["archive"])
+    assert len(archive) == report["n_dropped"]
+    assert set(_steps(output_dir)).isdisjoint(archive.steps)
+    assert archive.read_bytes("state_0005.txt") == originales["state_0005.txt"]
+
+
+def test_arbol_solo_toca_corridas_terminadas(tmp_path):
+    root = tmp_path / "sweep"
+    param_files = []
+    for name in ("terminada", "en_curso"):
+        exp_dir = root / name
+        _run(exp_dir / "Output")
+        param_file = exp_dir / "params.json"
+        param_file.write_text(json.dumps({"io": {"output_dir_simulation": str(exp_dir / "Output")}}))
+        param_files.append(param_file)
+    (root / "terminada" / POLICY_FILE).write_text(json.dumps({"every": 0}))
+
+    journal = SweepJournal(root / JOURNAL_FILE)
+    journal.done(params_hash(param_files[0]), "terminada", {"status": "STABLE"})
+    journal.start(params_hash(param_files[1]), "en_curso")
+
+    reports = apply_retention_tree(root, POLICY)
+    assert len(reports) == 1
+    assert _steps(root / "terminada" / "Output") == [0, 1, 16, 17, 18, 28, 29]
+    assert len(_steps(root / "en_curso" / "Output")) == 30
+
+
+def test_politica_invalida(tmp_path):
+    with pytest.raises(ValueError):
+        resolve_policy(tmp_path, overrides={"action": "comprimir"})
@@ -0,0 +1,124 @@
+# test_runtime_model.py
+
+import json
+import math
+import os
+from pathlib import Path
+
+import pytest
+
+from Config.Pipeline.runtime_model import (
+    RuntimeModel, collect_samples, experiment_features, plan_runtimes, prediction_report,
+)
+from Config.Pipeline.sweep_journal import JOURNAL_FILE, SweepJournal
+
+
+def _write_ics(path, n):
+    path.write_text("id type posx posy\n" + "".join(f"{i} 0 0.0 0.0\n" for i in range(n)))
+
+
+def _write_params(tmp_path, ics, n_steps=100, dt=1e-5, name="params.json"):
+    param_file = tmp_path / name
+    param_file.write_text(json.dumps({
+        "io": {"input_file": str(ics)},
+        "integrator": {"n_steps": n_steps, "dt": dt},
+        "neighbors": {"search_method": "quadtree"},
+    }))
+    return param_file
+
+
+def _samples(residual=0.0):
+    # t_paso = 1e-6 · N, con un residuo alterno de ±residual en log
+    return [
+        {"n_particles": n, "dt": 1e-5, "search_method": "quadtree",
+         "step_time": 1e-6 * n * math.exp(residual * (-1) ** i)}
+        for i, n in enumerate([100, 200, 400, 800])
+    ]
+
+
+def test_ajuste_recupera_el_exponente():
+    model = RuntimeModel.fit(_samples())
+    assert model.fitted
+    assert model.coef["log_n"] == pytest.approx(1.0)
+    assert model.residual_std == pytest.approx(0.0, abs=1e-9)
+    assert model.predict_step_time(1000, 1e-5) == pytest.approx(1e-3)
+    assert not RuntimeModel.fit(_samples()[:2]).fitted
+
+
+def test_timeout_nunca_menor_que_el_fijo(tmp_path):
+    ics = tmp_path / "ics.txt"
+    _write_ics(ics, 1000)
+    param_file = _write_params(tmp_path, ics, n_steps=100)      # predicción: 0.1 s
+
+    exacto = RuntimeModel.fit(_samples())
+    assert exacto.timeout_for(param_file, 60) == 60
+    assert exacto.timeout_for(param_file, None) == pytest.approx(0.1)
+
+    # Con dispersión en los residuos el margen crece como exp(k·σ)
+    disperso = RuntimeModel.fit(_samples(residual=0.5))
+    assert disperso.residual_std > 0
+    largo = _write_params(tmp_path, ics, n_steps=10**6, name="largo.json")
+    assert (disperso.timeout_for(largo, 60)
+            == pytest.approx(disperso.predict(largo) * math.exp(3 * disperso.residual_std)))
+    assert disperso.timeout_for(largo, 60) > exacto.timeout_for(largo, 60)
+
+
+def test_ics_regenerado_se_vuelve_a_contar(tmp_path):
+    ics = tmp_path / "ics.txt"
+    _write_ics(ics, 10)
+    param_file = _write_params(tmp_path, ics)
+    assert experiment_features(param_file)["n_particles"] == 10
+
+    _write_ics(ics, 25)
+    st = os.stat(ics)
+    os.utime(ics, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert experiment_features(param_file)["n_particles"] == 25
+
+
+def test_plan_ordena_y_guarda_la_prediccion(tmp_path):
+    ics_chico, ics_grande = tmp_path / "chico.txt", tmp_path / "grande.txt"
+    _write_ics(ics_chico, 10)
+    _write_ics(ics_grande, 40)
+    experiments = [
+        {"param_file": _write_params(tmp_path, ics_chico, name="chico.json")},
+        {"param_file": _write_params(tmp_path, ics_grande, name="grande.json")},
+    ]
+    plan_runtimes(experiments, RuntimeModel.fit(_samples()), None, verbose=False)
+    assert [e["param_file"].name for e in experiments] == ["grande.json", "chico.json"]
+    assert experiments[0]["predicted"] == pytest.approx(40 * 1e-6 * 100)
+
+
+def test_reporte_de_prediccion_solo_corridas_completas():
+    rows = [
+        {"status": "STABLE", "time": 12.0, "predicted_time": 10.0},
+        {"status": "STABLE", "time": 8.0, "predicted_time": 10.0},
+        {"status": "UNSTABLE_DIVERGED", "time": 1.0, "predicted_time": 10.0},
+        {"status": "STABLE", "time": 5.0, "predicted_time": None},
+    ]
+    report = prediction_report(rows, verbose=False)
+    assert report["n"] == 2
+    assert report["median_ratio"] == pytest.approx(1.0)
+    assert report["max_ratio"] == pytest.approx(1.2)
+    assert report["n_over"] == 1
+    assert prediction_report(rows[2:], verbose=False) is None
+
+
+def test_historial_con_bitacoras_anidadas(tmp_path):
+    """Experimentos junto a la bitácora (pre-screen) y junto a la carpeta del barrido (grilla)."""
+    ics = tmp_path / "ics.txt"
+    _write_ics(ics, 50)
+    N_dir = tmp_path / "N_50"
+    sweep_root = N_dir / "sweep_B_c"
+    screen_root = sweep_root / "prescreen"
+    for exp_root, journal_root, name in ((N_dir, sweep_root, "completa"),
+                                         (screen_root, screen_root, "corta")):
+        (exp_root / name).mkdir(parents=True)
+        _write_params(exp_root / name, ics, n_steps=10)
+        journal_root.mkdir(parents=True, exist_ok=True)
+        SweepJournal(journal_root / JOURNAL_FILE).done("k" + name, name,
+                                                       {"time": 2.0, "last_step": 9})
+
+    samples = {Path(s["experiment"]).name: s for s in collect_samples([tmp_path])}
+    assert set(samples) == {"completa", "corta"}
+    assert samples["corta"]["experiment"] == str(screen_root / "corta")
+    assert samples["corta"]["step_time"] == pytest.approx(0.2)
@@ -0,0 +1,55 @@
+# test_stability_monitor.py
+
+import numpy as np
+
+from Analysis.utils.state_files import write_state
+from Config.Pipeline.stability_monitor import StabilityMonitor
+from conftest import tank_frame
+
+
+def _run(tmp_path, frames):
+    output_dir = tmp_path / "Output"
+    output_dir.mkdir(parents=True)
+    for step, data in enumerate(frames):
+        write_state(output_dir / f"state_{step:04d}.txt", data)
+    return output_dir
+
+
+def test_corrida_estable_no_se_detiene(tmp_path):
+    output_dir = _run(tmp_path, [tank_frame(fluid_y=0.08 - 0.01 * s) for s in range(5)])
+    monitor = StabilityMonitor(output_dir, start_time=0)
+
+    assert monitor.poll() is False
+    assert len(monitor.history) == 4          # el último frame aún puede estar en escritura
+    assert monitor.poll(final=True) is False
+    assert monitor.last_step == 4
+
+
+def test_divergencia_de_densidad_y_nan(tmp_path):
+    rho = np.full(9, 1000.0)
+    rho[3] = 2500.0
+    output_dir = _run(tmp_path, [tank_frame(), tank_frame(rho=rho), tank_frame()])
+    monitor = StabilityMonitor(output_dir, start_time=0)
+    assert monitor.poll(final=True) is True
+    assert monitor.reason.startswith("step 1: rho_max")
+
+    rho[3] = np.nan
+    output_dir = _run(tmp_path / "nan", [tank_frame(), tank_frame(rho=rho)])
+    monitor = StabilityMonitor(output_dir, start_time=0)
+    assert monitor.poll(final=True) is True
+    assert "NaN" in monitor.reason
+
+
+def test_fluido_que_sale_por_el_orificio_no_detiene_por_defecto(tmp_path):
+    """El dominio es la caja de la frontera; el escape solo se revisa si se pide."""
+    frames = [tank_frame(fluid_y=0.05), tank_frame(fluid_y=-0.5)]
+    output_dir = _run(tmp_path, frames)
+
+    monitor = StabilityMonitor(output_dir, start_time=0)
+    assert monitor.poll(final=True) is False
+    assert monitor.domain == (-0.025, 0.125, -0.025, 0.125)
+    assert monitor.history[-1]["escaped_fraction"] == 1.0
+
+    monitor = StabilityMonitor(output_dir, {"max_escaped_fraction": 0.01}, start_time=0)
+    assert monitor.poll(final=True) is True
+    assert "fuera del dominio" in monitor.reason
@@ -0,0 +1,54 @@
+# test_sweep_journal.py
+
+import json
+
+from Config.Pipeline.est_tree_pipeline import rebuild_results_csv, run_experiments
+from Config.Pipeline.sweep_journal import JOURNAL_FILE, SweepJournal, params_hash
+from conftest import make_experiment
+
+
+def test_params_hash_canonico(tmp_path):
+    params = {"b": 1, "a": {"y": 2, "x": 3}}
+    path = tmp_path / "params.json"
+    path.write_text(json.dumps(params, indent=4))
+    assert params_hash(path) == params_hash({"a": {"x": 3, "y": 2}, "b": 1})
+    assert params_hash(params) != params_hash({**params, "b": 2})
+
+
+def test_recarga_y_linea_truncada(tmp_path):
+    path = tmp_path / JOURNAL_FILE
+    journal = SweepJournal(path)
+    journal.start("k1", "exp1")
+    journal.done("k1", "exp1", {"B": 1, "c": 2, "status": "STABLE"})
+    journal.start("k2", "exp2")                     # sin terminar
+    with open(path, "a") as f:
+        f.write('{"event": "done", "key": "k3"')    # interrupción a mitad de línea
+
+    journal = SweepJournal(path)
+    assert len(journal) == 1
+    assert journal.is_done("k1") and not journal.is_done("k2") and not journal.is_done("k3")
+    assert journal.row("k1")["status"] == "STABLE"
+
+    journal.done("k1", "exp1", {"B": 1, "c": 2, "status": "UNSTABLE_TIMEOUT"})
+    assert SweepJournal(path).rows() == [{"B": 1, "c": 2, "status": "UNSTABLE_TIMEOUT"}]
+
+
+def test_reanudar_salta_los_terminados(tmp_path, fake_solver):
+    sweep_root = tmp_path / "sweep"
+    exps = [make_experiment(sweep_root, f"exp{i}", steps=3, values={"B": float(i), "c": 1e-3})
+            for i in range(3)]
+
+    rows = run_experiments(exps[:2], sweep_root, fake_solver, timeout_seconds=60, max_parallel=1)
+    assert [r["status"] for r in rows] == ["STABLE", "STABLE"]
+    primera = (exps[0]["param_file"].parent / "stdout.txt").stat().st_mtime_ns
+
+    rows = run_experiments(exps, sweep_root, fake_solver, timeout_seconds=60, max_parallel=1)
+    assert len(rows) == 3
+    assert (exps[0]["param_file"].parent / "stdout.txt").stat().st_mtime_ns == primera
+
+    eventos = [json.loads(line)["event"] for line in open(sweep_root / JOURNAL_FILE)]
+    assert eventos.count("start") == 3 and eventos.count("done") == 3
+
+    (sweep_root / "stability_results.csv").unlink(missing_ok=True)
+    assert [r["B"] for r in rebuild_results_csv(sweep_root)] == [0.0, 1.0, 2.0]
+    assert (sweep_root / "stability_results.csv").exists()
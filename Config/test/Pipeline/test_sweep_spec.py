@@ -0,0 +1,67 @@
+# test_sweep_spec.py
+
+import json
+
+import pytest
+
+from Config.Pipeline.sweep_spec import PROJECT_ROOT, expand_spec, sample_points
+
+EXAMPLE_SPEC = PROJECT_ROOT / "Config" / "parameters" / "sweeps" / "example_sweep.json"
+
+
+def _example_spec(tmp_path):
+    """El barrido de ejemplo con un ICS fijo (sin eje N) dentro de tmp_path."""
+    spec = json.loads(EXAMPLE_SPEC.read_text())
+    del spec["axes"]["N"]
+    spec["axes"]["B"]["num"] = 2
+    spec["ics"] = {"input_file": str(tmp_path / "ics.txt")}
+    spec["project_dir"] = str(tmp_path / "Sweeps")
+    return spec
+
+
+def test_muestreo_cartesiano_y_emparejado():
+    axes = {"B": {"values": [1, 2]}, "c": {"values": [3, 4], "zip": "Bc"},
+            "dt": {"values": [5, 6], "zip": "Bc"}}
+    assert len(sample_points({"axes": axes})) == 4
+    pares = {(p["c"], p["dt"]) for p in sample_points({"axes": axes})}
+    assert pares == {(3, 5), (4, 6)}
+
+    with pytest.raises(ValueError):
+        sample_points({"axes": {"B": {"values": [1, 2]}, "c": {"values": [1]}},
+                       "sampling": {"mode": "zip"}})
+
+
+def test_hipercubo_latino_usa_cada_estrato_una_vez():
+    spec = {"axes": {"B": {"range": [0.0, 1.0]}}, "sampling": {"mode": "lhs", "n": 8, "seed": 1}}
+    estratos = sorted(int(p["B"] * 8) for p in sample_points(spec))
+    assert estratos == list(range(8))
+
+
+def test_ejemplo_desactiva_tests_del_solver(tmp_path):
+    """Las corridas del ejemplo no escriben en el Output/tests compartido."""
+    _, experiments = expand_spec(_example_spec(tmp_path))
+    assert len(experiments) == 2 * 3 * 2
+
+    for exp in experiments:
+        params = json.loads(exp["param_file"].read_text())
+        assert params["kernel"]["test_enabled"] is False
+        assert params["simulation"]["enable_neighbor_test"] is False
+        assert params["neighbors"]["search_method"] == "quadtree"
+        assert params["integrator"]["n_steps"] == 4000
+
+
+def test_salidas_de_tests_en_la_carpeta_del_experimento(tmp_path):
+    spec = _example_spec(tmp_path)
+    del spec["fixed"]["kernel.test_enabled"]
+    del spec["fixed"]["simulation.enable_neighbor_test"]
+    _, experiments = expand_spec(spec)
+
+    tests_dirs = set()
+    for exp in experiments:
+        params = json.loads(exp["param_file"].read_text())
+        assert params["kernel"]["test_enabled"] is True
+        experiment_root = exp["param_file"].parent
+        assert params["kernel"]["output_dir"] == str(experiment_root / "tests")
+        assert params["neighbors"]["test_NN_output_dir"] == str(experiment_root / "tests")
+        tests_dirs.add(params["kernel"]["output_dir"])
+    assert len(tests_dirs) == len(experiments)
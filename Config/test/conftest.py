@@ -0,0 +1,127 @@
+# conftest.py
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from Analysis.utils.state_files import STATE_COLUMNS, write_state
+
+
+def tank_frame(rho=1000.0, vel=0.0, fluid_y=0.05, n_fluid=9):
+    """
+    Recipiente de 0.1 × 0.1 (frontera en las cuatro esquinas) con el fluido
+    en una fila a altura fluid_y. rho puede ser escalar o un arreglo por
+    partícula de fluido.
+    """
+    n_boundary = 4
+    n = n_boundary + n_fluid
+    data = {c: np.zeros(n) for c in STATE_COLUMNS}
+    data["id"] = np.arange(n)
+    data["type"] = np.r_[np.ones(n_boundary), np.zeros(n_fluid)]
+    data["posx"] = np.r_[[0.0, 0.1, 0.0, 0.1], np.linspace(0.01, 0.09, n_fluid)]
+    data["posy"] = np.r_[[0.0, 0.0, 0.1, 0.1], np.full(n_fluid, fluid_y)]
+    data["vely"] = np.r_[np.zeros(n_boundary), np.full(n_fluid, -vel)]
+    data["rho"] = np.r_[np.full(n_boundary, 1000.0), np.broadcast_to(rho, n_fluid)]
+    data["mass"] = np.full(n, 1e-4)
+    data["h"] = np.full(n, 1e-3)
+    return data
+
+
+def ics_params(n=8):
+    """Parámetros (fluido, frontera) de un recipiente pequeño con orificio de salida."""
+    esp = 9e-4 / n
+    fluid = {
+        "nx": n, "ny": n, "flag_N": "True", "espaciado": esp,
+        "vertices": {
+            "inf-izq": [5e-05, -0.00045], "inf-der": [0.00095, -0.00045],
+            "sup-der": [0.00095, 0.00045], "sup-izq": [5e-05, 0.00045],
+        },
+    }
+    boundary = {
+        "quadrilateros": [{
+            "d1": 0.001, "d2": 0.001, "d3": 0.001,
+            "a1": -90, "a2": 0, "a3": 90,
+            "spacing": esp / 2,
+            "agujeros": [{"lado": "DA", "tam": 0.001, "offset": 0}],
+        }],
+        "free_lines": [],
+    }
+    return fluid, boundary
+
+
+@pytest.fixture
+def ics_jsons(tmp_path):
+    """Escribe fluid_<n>.json y boundary_<n>.json y devuelve sus rutas."""
+    def _write(n=8):
+        fluid, boundary = ics_params(n)
+        paths = tmp_path / f"fluid_{n}.json", tmp_path / f"boundary_{n}.json"
+        for path, params in zip(paths, (fluid, boundary)):
+            path.write_text(json.dumps(params, indent=2))
+        return paths
+    return _write
+
+
+FAKE_SOLVER = '''#!{python}
+# Solver falso: escribe state_XXXX.txt e imprime "Step N completado" como
+# AlgoritmSPH. Opciones en params["fake"]: sleep, diverge_at, crash_at, exit_code
+# y rho_fluid ([min, max] de la densidad del fluido, constante en el tiempo).
+# Con FAKE_STABLE_B_MIN en el entorno, las corridas con B menor se caen.
+import json, os, signal, sys, time
+from pathlib import Path
+
+params = json.load(open(sys.argv[1]))
+fake = params.get("fake", {{}})
+B = params.get("physics", {{}}).get("eos_params", {{}}).get("monaghan", {{}}).get("B")
+if B is not None and B < float(os.environ.get("FAKE_STABLE_B_MIN", "-inf")):
+    fake.setdefault("crash_at", 1)
+out = Path(params["io"]["output_dir_simulation"])
+out.mkdir(parents=True, exist_ok=True)
+for s in range(params["integrator"]["n_steps"]):
+    if s == fake.get("crash_at"):
+        os.kill(os.getpid(), signal.SIGSEGV)
+    rho_lo, rho_hi = fake.get("rho_fluid", [1000.0, 1000.0])
+    diverged = s >= fake.get("diverge_at", 10**9)
+    with open(out / f"state_{{s:04d}}.txt", "w") as f:
+        f.write("id posx posy velx vely accelx accely rho mass pressure h internalE type\\n")
+        for i in range(12):
+            t = 1 if i < 4 else 0
+            rho = 5000.0 if diverged else rho_lo + (rho_hi - rho_lo) * max(i - 4, 0) / 7
+            f.write(f"{{i}} {{i * 1e-3:.10f}} {{(i % 3) * 1e-3:.10f}} 0.0 0.0 0.0 0.0 "
+                    f"{{rho if t == 0 else 1000.0:.10f}} 0.0001 0.0 0.001 0.0 {{t}}\\n")
+    print(f"Step {{s}} completado, tiempo = {{s}}", flush=True)
+    time.sleep(fake.get("sleep", 0.0))
+sys.exit(fake.get("exit_code", 0))
+'''
+
+
+@pytest.fixture
+def fake_solver(tmp_path):
+    """Ejecutable que imita al solver (ver FAKE_SOLVER)."""
+    import sys
+
+    path = tmp_path / "fake_solver"
+    path.write_text(FAKE_SOLVER.format(python=sys.executable))
+    path.chmod(0o755)
+    return path
+
+
+def make_experiment(root, name, steps=5, fake=None, values=None):
+    """
+    Carpeta de experimento con su params.json, en el formato que espera
+    run_experiments (dict con name, param_file, key, steps y values).
+    """
+    from Config.Pipeline.sweep_journal import params_hash
+
+    exp_dir = Path(root) / name
+    exp_dir.mkdir(parents=True, exist_ok=True)
+    params = {
+        "io": {"output_dir_simulation": str(exp_dir / "Output")},
+        "integrator": {"n_steps": steps, "dt": 1e-5},
+        "fake": fake or {},
+    }
+    param_file = exp_dir / "params.json"
+    param_file.write_text(json.dumps(params, indent=2))
+    return {"name": name, "param_file": param_file, "key": params_hash(param_file),
+            "steps": steps, "values": values or {"B": 1.0, "c": 1e-3}}
@@ -0,0 +1,107 @@
+# test_async_runner.py
+
+import asyncio
+import gc
+import os
+import sys
+import time
+
+import pytest
+
+from Config.utils.async_runner import run_process, run_streaming
+
+PRINT_STEPS = "import sys, time\nfor s in range(5): print(f'Step {s} completado', flush=True)\n" \
+              "print('aviso', file=sys.stderr)"
+SLEEP = "import time\nprint('Step 0 completado', flush=True)\ntime.sleep(60)"
+
+
+def _cmd(code):
+    return [sys.executable, "-c", code]
+
+
+def _dead(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    return False
+
+
+def test_salidas_a_disco_y_ultimo_paso(tmp_path):
+    run = run_process(_cmd(PRINT_STEPS), tmp_path / "out.txt", tmp_path / "err.txt")
+
+    assert run["returncode"] == 0 and not run["timed_out"] and not run["stopped"]
+    assert run["last_step"] == 4
+    assert (tmp_path / "out.txt").read_text().count("completado") == 5
+    assert run["stderr_tail"] == "aviso\n"
+    assert run["stdout_bytes"] == (tmp_path / "out.txt").stat().st_size
+    assert run["max_rss_kb"] > 0
+
+
+def test_timeout_mata_al_proceso(tmp_path):
+    run = run_process(_cmd(SLEEP), tmp_path / "out.txt", tmp_path / "err.txt", timeout=0.5)
+    assert run["timed_out"] and run["returncode"] == -9
+    assert run["last_step"] == 0 and run["elapsed"] < 10
+
+
+def test_stop_check(tmp_path):
+    run = run_process(_cmd(SLEEP), tmp_path / "out.txt", tmp_path / "err.txt",
+                      stop_check=lambda: True, poll_interval=0.05)
+    assert run["stopped"] and run["returncode"] == -9
+
+
+def test_stop_check_que_falla_no_detiene(tmp_path, capsys):
+    def _falla():
+        raise RuntimeError("monitor roto")
+
+    run = run_process(_cmd(PRINT_STEPS + "\nimport time; time.sleep(0.3)"),
+                      tmp_path / "out.txt", tmp_path / "err.txt",
+                      stop_check=_falla, poll_interval=0.05)
+    assert run["returncode"] == 0 and not run["stopped"]
+    assert "monitor roto" in capsys.readouterr().out
+
+
+def test_excepcion_en_on_start_mata_al_hijo(tmp_path):
+    pids = []
+
+    def _on_start(pid):
+        pids.append(pid)
+        raise RuntimeError("afinidad")
+
+    with pytest.raises(RuntimeError, match="afinidad"):
+        run_process(_cmd(SLEEP), tmp_path / "out.txt", tmp_path / "err.txt", on_start=_on_start)
+    assert _dead(pids[0])
+
+
+def test_cancelacion_mata_al_hijo(tmp_path):
+    pids = []
+
+    async def _main():
+        task = asyncio.ensure_future(run_streaming(
+            _cmd(SLEEP), tmp_path / "out.txt", tmp_path / "err.txt", on_start=pids.append
+        ))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    t0 = time.time()
+    asyncio.run(_main())
+    assert _dead(pids[0])
+    assert time.time() - t0 < 10        # no esperó a que el hijo terminara solo
+
+
+def test_error_al_volcar_salida_se_relanza_sin_avisos(tmp_path):
+    """Un error en las tuberías se relanza, sin 'exception was never retrieved'."""
+    avisos = []
+
+    async def _main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: avisos.append(ctx))
+        with pytest.raises(FileNotFoundError):
+            await run_streaming(_cmd(PRINT_STEPS), tmp_path / "no_existe" / "out.txt",
+                                tmp_path / "err.txt")
+        gc.collect()
+        await asyncio.sleep(0)
+
+    asyncio.run(_main())
+    assert avisos == []
@@ -0,0 +1,44 @@
+# test_create_ics.py
+
+from Config.utils.create_ics import create_ics_batch, create_ics_txt
+
+
+def test_lote_en_paralelo_igual_al_secuencial(tmp_path, ics_jsons):
+    jobs = []
+    for n in (6, 8, 10):
+        fluid, boundary = ics_jsons(n)
+        jobs.append((fluid, boundary, tmp_path / "{}" / f"ics_{n}.txt"))
+
+    def _run(carpeta, workers):
+        trabajos = [(f, b, str(out).format(carpeta)) for f, b, out in jobs]
+        return create_ics_batch(trabajos, workers=workers)
+
+    seq, par = _run("seq", 1), _run("par", 2)
+
+    for r_seq, r_par, n in zip(seq, par, (6, 8, 10)):
+        assert r_seq["ok"] and r_par["ok"]
+        assert r_seq["nFluid"] == n * n
+        assert r_seq["nParticles"] == r_seq["nFluid"] + r_seq["nBoundaries"]
+        assert (tmp_path / "seq" / f"ics_{n}.txt").read_bytes() == \
+            (tmp_path / "par" / f"ics_{n}.txt").read_bytes()
+        assert (tmp_path / "seq" / f"ics_{n}_log.json").exists()
+
+
+def test_igual_que_main_py(tmp_path, ics_jsons):
+    """El camino en proceso escribe lo mismo que lanzar InitialConditions/main.py."""
+    fluid, boundary = ics_jsons(8)
+    create_ics_batch([(fluid, boundary, tmp_path / "lote" / "ics.txt")], workers=1)
+    assert create_ics_txt(boundary, fluid, tmp_path / "cli" / "ics.txt",
+                          tmp_path / "cli" / "ics_log.json") == 0
+    assert (tmp_path / "lote" / "ics.txt").read_bytes() == (tmp_path / "cli" / "ics.txt").read_bytes()
+
+
+def test_un_trabajo_fallido_no_detiene_el_lote(tmp_path, ics_jsons):
+    fluid, boundary = ics_jsons(6)
+    reports = create_ics_batch([
+        (tmp_path / "no_existe.json", boundary, tmp_path / "out" / "malo.txt"),
+        {"fluid": fluid, "boundary": boundary, "output": tmp_path / "out" / "bueno.txt"},
+    ], workers=2)
+
+    assert not reports[0]["ok"] and "no_existe.json" in reports[0]["error"]
+    assert reports[1]["ok"] and (tmp_path / "out" / "bueno.txt").exists()
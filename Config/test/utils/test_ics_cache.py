@@ -0,0 +1,79 @@
+# test_ics_cache.py
+
+import json
+
+import Config.utils.ics_cache as ics_cache
+from Config.utils.ics_cache import (
+    PROJECT_ROOT, cache_entries, default_cache_dir, evict, get_or_create_ics, ics_key
+)
+from conftest import ics_params
+
+
+def test_cache_por_defecto_fuera_del_repositorio(monkeypatch):
+    monkeypatch.delenv("SPH_ICS_CACHE", raising=False)
+    assert PROJECT_ROOT not in default_cache_dir().parents
+    monkeypatch.setenv("SPH_ICS_CACHE", "/tmp/otro_cache")
+    assert str(default_cache_dir()) == "/tmp/otro_cache"
+
+
+def test_clave_canonica():
+    fluid, boundary = ics_params(6)
+    reordenado = json.loads(json.dumps(fluid, sort_keys=True))
+    reordenado = dict(reversed(list(reordenado.items())))
+    assert ics_key(fluid, boundary) == ics_key(reordenado, boundary)
+    assert ics_key(fluid, boundary) != ics_key(fluid, boundary, ordering="hilbert")
+    assert ics_key(fluid, boundary) != ics_key(ics_params(8)[0], boundary)
+
+
+def test_acierto_copia_el_mismo_archivo(tmp_path):
+    fluid, boundary = ics_params(6)
+    cache = tmp_path / "cache"
+
+    summary, hit = get_or_create_ics(fluid, boundary, tmp_path / "a" / "ics.txt", cache_dir=cache)
+    assert not hit and summary["nFluid"] == 36
+    summary, hit = get_or_create_ics(fluid, boundary, tmp_path / "b" / "ics.txt", cache_dir=cache)
+    assert hit and summary["cache_key"] == ics_key(fluid, boundary)
+
+    assert (tmp_path / "a" / "ics.txt").read_bytes() == (tmp_path / "b" / "ics.txt").read_bytes()
+    log = json.loads((tmp_path / "b" / "ics_log.json").read_text())
+    assert log["output_file"] == str(tmp_path / "b" / "ics.txt")
+
+
+def test_evict_lru(tmp_path):
+    cache = tmp_path / "cache"
+    claves = []
+    for n in (4, 5, 6):
+        fluid, boundary = ics_params(n)
+        get_or_create_ics(fluid, boundary, tmp_path / f"ics_{n}.txt", cache_dir=cache)
+        claves.append(ics_key(fluid, boundary))
+
+    # La más antigua vuelve a usarse: la menos reciente pasa a ser la de n=5
+    get_or_create_ics(*ics_params(4), tmp_path / "otra.txt", cache_dir=cache)
+
+    sizes = {e.name: size for e, size, _ in cache_entries(cache)}
+    removed = evict(cache, max_bytes=sum(sizes.values()) - 1)
+    assert removed == [claves[1]]
+    assert sorted(e.name for e, _, _ in cache_entries(cache)) == sorted([claves[0], claves[2]])
+    assert not any(p.name.startswith(".") for p in cache.iterdir())
+
+
+def test_entrada_retirada_durante_la_copia_se_regenera(tmp_path, monkeypatch):
+    """Si otro proceso hace evict entre la comprobación y la copia, se regenera."""
+    fluid, boundary = ics_params(6)
+    cache = tmp_path / "cache"
+    get_or_create_ics(fluid, boundary, tmp_path / "a.txt", cache_dir=cache)
+
+    original = ics_cache._copy_entry
+    llamadas = []
+
+    def _copia_con_evict(entry, output_path):
+        if not llamadas:
+            evict(cache, max_bytes=0)
+        llamadas.append(entry)
+        return original(entry, output_path)
+
+    monkeypatch.setattr(ics_cache, "_copy_entry", _copia_con_evict)
+    summary, hit = get_or_create_ics(fluid, boundary, tmp_path / "b.txt", cache_dir=cache)
+
+    assert not hit and len(llamadas) == 2
+    assert (tmp_path / "a.txt").read_bytes() == (tmp_path / "b.txt").read_bytes()
@@ -0,0 +1,40 @@
+# test_run_resources.py
+
+import json
+
+import pytest
+
+from Config.Pipeline.est_tree_pipeline import run_single_simulation
+from Config.utils.run_resources import RESOURCES_FILE, output_usage, run_resources
+from conftest import make_experiment
+
+
+def test_output_usage_recursivo(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "state_0000.txt").write_bytes(b"x" * 10)
+    (tmp_path / "sub" / "state_0001.txt").write_bytes(b"x" * 20)
+    (tmp_path / "static_state.txt").write_bytes(b"x" * 5)
+    assert output_usage(tmp_path) == (35, 2)
+    assert output_usage(tmp_path / "no_existe") == (0, 0)
+
+
+def test_run_resources_fraccion_de_cpu(tmp_path):
+    run = {"elapsed": 2.0, "cpu_user": 1.5, "cpu_sys": 0.1, "max_rss_kb": 2048,
+           "stdout_bytes": 7, "stderr_bytes": 0, "returncode": 0}
+    res = run_resources(run, tmp_path)
+    assert res["cpu_fraction"] == pytest.approx(0.8)
+    assert res["max_rss_mb"] == 2.0
+    assert run_resources({**run, "elapsed": 0.0}, tmp_path)["cpu_fraction"] is None
+
+
+def test_run_single_simulation_guarda_resources_json(tmp_path, fake_solver):
+    exp = make_experiment(tmp_path, "exp", steps=4)
+    elapsed, last_step, mode, rc, reason, resources = run_single_simulation(
+        exp["param_file"].parent, fake_solver, timeout_seconds=60, project_root=tmp_path
+    )
+
+    assert (mode, last_step, rc, reason) == ("EXIT", 3, 0, None)
+    assert resources["n_states"] == 4
+    assert resources["output_bytes"] > 0 and resources["max_rss_mb"] > 0
+    guardado = json.loads((exp["param_file"].parent / RESOURCES_FILE).read_text())
+    assert guardado == resources
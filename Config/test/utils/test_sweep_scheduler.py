@@ -0,0 +1,65 @@
+# test_sweep_scheduler.py
+
+import threading
+import time
+
+import pytest
+
+import Config.utils.sweep_scheduler as sweep_scheduler
+from Config.utils.sweep_scheduler import SweepScheduler
+
+GB = 1024**3
+
+
+def _max_concurrency(scheduler, n_items):
+    """Corre n_items tareas que esperan un poco y devuelve el máximo en vuelo."""
+    lock = threading.Lock()
+    state = {"now": 0, "max": 0}
+
+    def _task(item, cpu):
+        with lock:
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+        time.sleep(0.05)
+        with lock:
+            state["now"] -= 1
+        return item * 2
+
+    results = scheduler.map(_task, range(n_items))
+    assert results == [i * 2 for i in range(n_items)]
+    return state["max"]
+
+
+def test_reserva_memoria_de_las_corridas_en_vuelo(monkeypatch):
+    """Con 10 GB libres, 3 GB por corrida y 1 GB de reserva caben 3 a la vez."""
+    monkeypatch.setattr(sweep_scheduler, "available_memory", lambda: 10 * GB)
+    scheduler = SweepScheduler(max_parallel=8, memory_per_run=3 * GB,
+                               memory_reserve=1 * GB, poll_interval=0.01)
+    assert _max_concurrency(scheduler, 8) == 3
+
+
+def test_siempre_admite_una_corrida(monkeypatch):
+    monkeypatch.setattr(sweep_scheduler, "available_memory", lambda: 1 * GB)
+    scheduler = SweepScheduler(max_parallel=4, memory_per_run=3 * GB,
+                               memory_reserve=1 * GB, poll_interval=0.01)
+    assert _max_concurrency(scheduler, 3) == 1
+
+
+def test_sin_memory_per_run_limita_max_parallel(monkeypatch):
+    monkeypatch.setattr(sweep_scheduler, "available_memory", lambda: None)
+    assert _max_concurrency(SweepScheduler(max_parallel=2, poll_interval=0.01), 6) == 2
+
+
+def test_error_detiene_nuevas_tareas():
+    scheduler = SweepScheduler(max_parallel=1, poll_interval=0.01)
+    vistos = []
+
+    def _task(item, cpu):
+        vistos.append(item)
+        if item == 1:
+            raise RuntimeError("falla")
+        return item
+
+    with pytest.raises(RuntimeError):
+        scheduler.map(_task, range(5))
+    assert vistos == [0, 1]
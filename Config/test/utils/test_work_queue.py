@@ -0,0 +1,58 @@
+# test_work_queue.py
+
+import json
+
+from Config.utils.work_queue import DONE, FAILED, WorkQueue, run_local_workers, run_worker
+from conftest import make_experiment
+
+
+def _results(queue):
+    return {j["param_file"].split("/")[-2]: j for j in queue.jobs()}
+
+
+def test_varios_workers_locales(tmp_path, fake_solver):
+    """Cada trabajo corre una sola vez; solo los errores de infraestructura se reintentan."""
+    root = tmp_path / "sweep"
+    exps = [make_experiment(root, f"estable{i}", steps=4) for i in range(3)]
+    exps.append(make_experiment(root, "segfault", steps=4, fake={"crash_at": 2}))
+    roto = root / "roto" / "params.json"          # params.json ilegible
+    roto.parent.mkdir()
+    roto.write_text("{")
+
+    db = tmp_path / "cola.db"
+    queue = WorkQueue(db)
+    assert queue.enqueue([e["param_file"] for e in exps] + [roto]) == 5
+
+    exitcodes = run_local_workers(db, 2, sim_executable=str(fake_solver), project_root=tmp_path,
+                                  timeout_seconds=60, max_attempts=3, idle_poll=0.1)
+    assert exitcodes == [0, 0]
+    assert queue.counts()[DONE] == 4 and queue.counts()[FAILED] == 1
+
+    jobs = _results(queue)
+    for name in ("estable0", "estable1", "estable2"):
+        result = json.loads(jobs[name]["result"])
+        assert result["status"] == "STABLE" and result["last_step"] == 3
+        assert jobs[name]["attempts"] == 1
+
+    # El segfault es un resultado de estabilidad: no se reintenta
+    result = json.loads(jobs["segfault"]["result"])
+    assert jobs["segfault"]["state"] == DONE and jobs["segfault"]["attempts"] == 1
+    assert result["status"] == "UNSTABLE_SEGFAULT"
+    assert result["last_step"] == 1 and result["returncode"] == -11
+
+    assert jobs["roto"]["state"] == FAILED and jobs["roto"]["attempts"] == 3
+
+
+def test_timeout_se_completa_sin_reintentos(tmp_path, fake_solver):
+    exp = make_experiment(tmp_path / "sweep", "lento", steps=100, fake={"sleep": 0.2})
+    db = tmp_path / "cola.db"
+    queue = WorkQueue(db)
+    queue.enqueue([exp["param_file"]], timeouts=[1.0])
+
+    assert run_worker(db, str(fake_solver), project_root=tmp_path, heartbeat_interval=0.2) == 1
+
+    job, = queue.jobs()
+    result = json.loads(job["result"])
+    assert job["state"] == DONE and job["attempts"] == 1
+    assert result["status"] == "UNSTABLE_TIMEOUT" and result["timed_out"]
+    assert 0 <= result["last_step"] < 99
@@ -0,0 +1,231 @@
+# Config/utils/async_runner.py
+import asyncio
+import os
+import re
+import signal
+import subprocess
+import time
+from collections import deque
+from pathlib import Path
+
+# Último "Step N" de la salida del solver (sobre bytes)
+STEP_PATTERN = re.compile(rb"[Ss]tep\s*[:=]?\s*(\d+)")
+
+# Líneas de cada salida que se conservan en memoria
+DEFAULT_TAIL_LINES = 200
+READ_CHUNK = 64 * 1024
+
+# Tras matar el proceso, espera máxima para vaciar las tuberías [s]
+DRAIN_TIMEOUT = 5.0
+
+
+class StreamCapture:
+    """
+    Copia una salida del proceso a disco a medida que llega y guarda en
+    memoria solo las últimas tail_lines líneas (buffer circular).
+
+    Si track_steps=True lleva el último "Step N" visto, línea a línea, sin
+    volver a recorrer la salida completa.
+    """
+
+    def __init__(self, path, tail_lines=DEFAULT_TAIL_LINES, track_steps=False, on_line=None):
+        self.path = Path(path)
+        self.tail = deque(maxlen=tail_lines)
+        self.track_steps = track_steps
+        self.on_line = on_line
+        self.last_step = None
+        self.n_bytes = 0
+        self.n_lines = 0
+
+    def _line(self, raw):
+        self.n_lines += 1
+        if self.track_steps:
+            matches = STEP_PATTERN.findall(raw)
+            if matches:
+                self.last_step = int(matches[-1])
+        text = raw.decode("utf-8", errors="replace")
+        self.tail.append(text)
+        if self.on_line is not None:
+            self.on_line(text)
+
+    async def pump(self, stream):
+        """Lee stream hasta EOF en bloques de READ_CHUNK (sin límite de largo de línea)."""
+        partial = b""
+        with open(self.path, "wb") as f:
+            while True:
+                chunk = await stream.read(READ_CHUNK)
+                if not chunk:
+                    break
+                f.write(chunk)
+                self.n_bytes += len(chunk)
+
+                lines = (partial + chunk).split(b"\n")
+                partial = lines.pop()
+                for raw in lines:
+                    self._line(raw + b"\n")
+            if partial:
+                self._line(partial)
+
+    def text(self):
+        """Últimas líneas capturadas."""
+        return "".join(self.tail)
+
+
+async def _pipe_reader(loop, pipe):
+    """StreamReader asíncrono sobre una tubería de Popen."""
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    return reader
+
+
+async def _check_stop(stop_check):
+    """
+    Evalúa stop_check en un hilo aparte. Si lanza una excepción se informa
+    y se sigue como si hubiera devuelto False: un fallo del monitor no debe
+    matar una corrida sana.
+    """
+    try:
+        return bool(await asyncio.to_thread(stop_check))
+    except Exception as e:
+        print(f"[✗] stop_check falló ({type(e).__name__}: {e}); la corrida continúa")
+        return False
+
+
+async def run_streaming(
+    cmd,
+    stdout_path,
+    stderr_path,
+    timeout=None,
+    cwd=None,
+    tail_lines=DEFAULT_TAIL_LINES,
+    on_start=None,
+    on_stdout=None,
+    stop_check=None,
+    poll_interval=1.0
+):
+    """
+    Ejecuta cmd leyendo stdout y stderr a la vez y copiándolos a disco.
+
+    Parámetros
+    ----------
+    cmd : list
+        Comando y argumentos.
+    stdout_path, stderr_path : Path
+        Archivos donde se vuelca cada salida completa.
+    timeout : float | None
+        Tiempo máximo [s]; al vencerse se mata el proceso.
+    cwd : Path | None
+        Directorio de trabajo del proceso.
+    tail_lines : int
+        Líneas de cada salida que se conservan en memoria.
+    on_start : callable | None
+        on_start(pid), apenas se lanza el proceso (p.ej. pin_process).
+    on_stdout : callable | None
+        on_stdout(line) por cada línea de stdout (p.ej. eco en consola).
+    stop_check : callable | None
+        Se evalúa cada poll_interval segundos en un hilo aparte (no frena
+        la lectura de las tuberías); si devuelve True se mata el proceso.
+        Si lanza una excepción se informa y la corrida sigue.
+
+    Returns
+    -------
+    dict
+        returncode, elapsed, timed_out, stopped (por stop_check), last_step,
+        stdout_tail / stderr_tail, bytes escritos de cada salida y el uso de
+        recursos del proceso según os.wait4: cpu_user, cpu_sys [s] y
+        max_rss_kb (pico de memoria residente).
+    """
+    start = time.time()
+    # Popen + os.wait4 (en lugar de create_subprocess_exec) para obtener el
+    # uso de recursos de este hijo en particular, aunque haya otros en vuelo
+    proc = subprocess.Popen(
+        [str(c) for c in cmd],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd
+    )
+    wait = asyncio.ensure_future(asyncio.to_thread(os.wait4, proc.pid, 0))
+
+    out = StreamCapture(stdout_path, tail_lines, track_steps=True, on_line=on_stdout)
+    err = StreamCapture(stderr_path, tail_lines)
+    pumps = None
+    timed_out = False
+    stopped = False
+    deadline = start + timeout if timeout is not None else None
+
+    try:
+        if on_start is not None:
+            on_start(proc.pid)
+
+        loop = asyncio.get_running_loop()
+        stdout = await _pipe_reader(loop, proc.stdout)
+        stderr = await _pipe_reader(loop, proc.stderr)
+        # return_exceptions: un error al volcar una salida queda en el
+        # resultado (se relanza abajo) y no como excepción nunca recuperada
+        pumps = asyncio.gather(out.pump(stdout), err.pump(stderr), return_exceptions=True)
+
+        while not wait.done():
+            step = poll_interval if stop_check is not None else None
+            if deadline is not None:
+                remaining = deadline - time.time()
+                step = remaining if step is None else min(step, remaining)
+                if remaining <= 0:
+                    timed_out = True
+                    break
+            await asyncio.wait({wait}, timeout=step)
+            if wait.done():
+                break
+            if stop_check is not None and await _check_stop(stop_check):
+                stopped = True
+                break
+    finally:
+        # Pase lo que pase (timeout, stop_check, excepción o cancelación)
+        # el hijo muere antes de esperarlo: nunca queda un solver huérfano
+        if not wait.done():
+            # os.kill y no proc.kill(): Popen.poll() podría cosechar al hijo
+            # antes que os.wait4 y se perdería su uso de recursos
+            try:
+                os.kill(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        _, status, usage = await wait
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        if pumps is None:
+            proc.stdout.close()
+            proc.stderr.close()
+            drained = []
+        else:
+            # Las tuberías se cierran al morir el proceso (salvo que un hijo
+            # las herede)
+            try:
+                drained = await asyncio.wait_for(pumps, DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                drained = []
+
+    for result in drained:
+        if isinstance(result, Exception):
+            raise result
+
+    return {
+        "returncode": proc.returncode,
+        "elapsed": time.time() - start,
+        "timed_out": timed_out,
+        "stopped": stopped,
+        "last_step": out.last_step,
+        "stdout_tail": out.text(),
+        "stderr_tail": err.text(),
+        "stdout_bytes": out.n_bytes,
+        "stderr_bytes": err.n_bytes,
+        "cpu_user": usage.ru_utime,
+        "cpu_sys": usage.ru_stime,
+        "max_rss_kb": usage.ru_maxrss,
+    }
+
+
+def run_process(cmd, stdout_path, stderr_path, **kwargs):
+    """
+    Versión síncrona de run_streaming (un event loop propio por llamada;
+    se puede usar desde los hilos de SweepScheduler).
+    """
+    return asyncio.run(run_streaming(cmd, stdout_path, stderr_path, **kwargs))
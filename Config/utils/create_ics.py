@@ -1,7 +1,24 @@
+import contextlib
+import io
 import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+IC_ROOT = PROJECT_ROOT / "InitialConditions"
+# Mismos accesos que InitialConditions/main.py (src y sus subpaquetes)
+for root in (PROJECT_ROOT, IC_ROOT, IC_ROOT / "src"):
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+from Analysis.utils.parallel_frames import default_workers
+from src.core.export import export_all_particles
+from src.core.ics_writer import ICS_COLUMNS, column_dtypes, write_ics
+from Config.utils.ics_cache import get_or_create_ics
+
 def create_ics_txt(
     boundary_path: str,
     fluid_path: str,
@@ -22,7 +39,7 @@ def create_ics_txt(
     fluid_path = Path(fluid_path)
     output_path = Path(output_path)
     output_log_path = Path(output_log_path)
-    main_script_path = Path("/media/hvarkaed/a2e590e8-6eb4-4da7-a766-06b1247531ca/NeighboorsFloodSPH/InitialConditions/main.py")
+    main_script_path = IC_ROOT / "main.py"
 
     output_dir = output_path.parent
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -35,7 +52,7 @@ def create_ics_txt(
     print(f"  output log:   {output_log_path}")
 
     result = subprocess.run([
-        "python", str(main_script_path),
+        sys.executable, str(main_script_path),
         "export",
         "--boundary", str(boundary_path),
         "--fluid", str(fluid_path),
@@ -56,17 +73,158 @@ def create_ics_txt(
     return result.returncode
 
 
+def _normalize_job(job):
+    """
+    Acepta (fluid, boundary, output), (fluid, boundary, output, log) o un
+    dict con esas claves. El log por defecto es '<output>_log.json'.
+    """
+    if isinstance(job, dict):
+        fluid, boundary, output = job["fluid"], job["boundary"], job["output"]
+        log = job.get("log")
+    else:
+        fluid, boundary, output, *rest = job
+        log = rest[0] if rest else None
+
+    output = Path(output)
+    log = Path(log) if log is not None else output.with_name(f"{output.stem}_log.json")
+    return {"fluid": Path(fluid), "boundary": Path(boundary), "output": output, "log": log}
+
+
+def _run_ics_job(job, output_format="txt", ordering="none", quiet=True,
+                 use_cache=False, cache_dir=None):
+    """Genera un ICS dentro del proceso actual y devuelve su reporte."""
+    t0 = time.time()
+    report = {**{k: str(v) for k, v in job.items()}, "ok": False, "error": None,
+              "cached": False}
+
+    salida = io.StringIO() if quiet else None
+    try:
+        if use_cache:
+            summary, hit = get_or_create_ics(
+                job["fluid"], job["boundary"], job["output"], job["log"],
+                output_format=output_format, ordering=ordering, cache_dir=cache_dir,
+            )
+            report.update(
+                ok=True,
+                cached=hit,
+                nParticles=summary["nParticles"],
+                nFluid=summary["nFluid"],
+                nBoundaries=summary["nBoundaries"],
+            )
+            report["time"] = time.time() - t0
+            return report
+
+        with contextlib.redirect_stdout(salida) if quiet else contextlib.nullcontext():
+            particles = export_all_particles(
+                boundary_param_file=job["boundary"],
+                fluid_param_file=job["fluid"],
+                output_dir=job["output"].parent,
+                output_filename=job["output"].name,
+                output_logname=job["log"].name,
+                output_format=output_format,
+                ordering=ordering,
+            )
+        n_fluid = int((particles["type"] == 0).sum())
+        report.update(
+            ok=True,
+            nParticles=len(particles),
+            nFluid=n_fluid,
+            nBoundaries=len(particles) - n_fluid,
+        )
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+
+    report["time"] = time.time() - t0
+    return report
+
+
+def create_ics_batch(jobs, workers=None, output_format="txt", ordering="none",
+                     use_cache=False, cache_dir=None):
+    """
+    Genera varios ICS en paralelo importando export_all_particles en el
+    propio proceso (sin lanzar un intérprete nuevo por archivo).
+
+    Parámetros:
+    ----------
+    jobs : list
+        Trabajos (fluid_json, boundary_json, output_txt[, log_json]) o dicts
+        con las claves fluid/boundary/output/log.
+    workers : int | None
+        Procesos del pool (por defecto, las CPUs disponibles). Con 1 se
+        ejecuta todo en el proceso actual.
+    output_format : str
+        "txt" o "bin" (ver ics_writer).
+    ordering : str
+        Ordenamiento espacial ("none", "morton", "hilbert").
+    use_cache : bool
+        Si True, los ICS se obtienen del caché por contenido (ics_cache)
+        y solo se generan los que no estén.
+    cache_dir : Path | None
+        Directorio del caché (por defecto ics_cache.default_cache_dir()).
+
+    Retorna:
+    --------
+    list[dict] : un reporte por trabajo, en el orden de entrada, con
+    ok/error, tiempo [s] y número de partículas (total, fluido, frontera).
+    """
+    jobs = [_normalize_job(j) for j in jobs]
+    for job in jobs:
+        job["output"].parent.mkdir(parents=True, exist_ok=True)
+
+    workers = default_workers() if workers is None else max(1, int(workers))
+    workers = min(workers, len(jobs)) if jobs else 1
+
+    t0 = time.time()
+    print(f"[INFO] Generando {len(jobs)} ICS con {workers} procesos")
+
+    reports = [None] * len(jobs)
+
+    def _log(report):
+        if report["ok"]:
+            origen = " [caché]" if report["cached"] else ""
+            print(f"  [✓] {Path(report['output']).name}: {report['nParticles']} partículas "
+                  f"({report['nFluid']} fluido, {report['nBoundaries']} frontera) "
+                  f"en {report['time']:.2f}s{origen}")
+        else:
+            print(f"  [✗] {Path(report['output']).name}: {report['error']}")
+
+    if workers == 1:
+        for i, job in enumerate(jobs):
+            reports[i] = _run_ics_job(job, output_format, ordering,
+                                      use_cache=use_cache, cache_dir=cache_dir)
+            _log(reports[i])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_run_ics_job, job, output_format, ordering,
+                            use_cache=use_cache, cache_dir=cache_dir): i
+                for i, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                reports[i] = future.result()
+                _log(reports[i])
+
+    n_ok = sum(r["ok"] for r in reports)
+    print(f"[✓] {n_ok}/{len(jobs)} ICS generados en {time.time() - t0:.2f}s")
+    return reports
+
 
 def clean_walls_ics(
     ruta_ics: Path,
     nombre_salida: str,
     project_root: Path,
-    subcarpeta_salida="Output/init_cond"
+    subcarpeta_salida="Output/init_cond",
+    formato: str = "txt",
+    chunk_size: int = 100_000,
 ):
     """
     Limpia un archivo ICS eliminando partículas con type == -1
     y escribe un nuevo archivo con formateo exacto.
 
+    El archivo se procesa por bloques de chunk_size filas, así que la
+    memoria usada no depende del tamaño del ICS.
+
     Parámetros:
     ----------
     ruta_ics : Path
@@ -77,6 +235,10 @@ def clean_walls_ics(
         Ruta raíz del proyecto donde se generará la carpeta Output/init_cond.
     subcarpeta_salida : str
         Carpeta relativa dentro del proyecto donde guardar el archivo.
+    formato : str
+        "txt" (texto '%.10f') o "bin" (binario, ver ics_writer).
+    chunk_size : int
+        Filas leídas y escritas por bloque.
     
     Retorna:
     --------
@@ -90,44 +252,31 @@ def clean_walls_ics(
     ruta_final = ruta_salida / nombre_salida
 
     print(f"Leyendo archivo ICS: {ruta_ics}")
-    df = pd.read_csv(str(ruta_ics), delim_whitespace=True)
+    conteo = {"total": 0, "eliminadas": 0}
 
-    df_limpio = df[df["type"] != -1].copy()
+    def bloques_limpios():
+        lector = pd.read_csv(
+            str(ruta_ics), sep=r"\s+", usecols=ICS_COLUMNS,
+            dtype=column_dtypes(), chunksize=chunk_size
+        )
+        for df in lector:
+            df_limpio = df[df["type"] != -1]
+            conteo["total"] += len(df)
+            conteo["eliminadas"] += len(df) - len(df_limpio)
+            yield df_limpio
+
+    print(f"💾 Guardando archivo limpio en: {ruta_final}")
+    n_restantes = write_ics(ruta_final, bloques_limpios(), fmt=formato)
 
-    print(f"Partículas originales: {len(df)}")
-    print(f"Partículas eliminadas (type == -1): {len(df) - len(df_limpio)}")
-    print(f"Partículas restantes: {len(df_limpio)}")
+    print(f"Partículas originales: {conteo['total']}")
+    print(f"Partículas eliminadas (type == -1): {conteo['eliminadas']}")
+    print(f"Partículas restantes: {n_restantes}")
 
-    if (df_limpio["type"] == -1).any():
-        print("❌ ERROR: aún quedan partículas con type == -1")
+    if n_restantes != conteo["total"] - conteo["eliminadas"]:
+        print("❌ ERROR: el número de partículas escritas no coincide")
         return None
     else:
         print("✔ Verificación OK: no quedan partículas de tipo -1")
 
-    print(f"💾 Guardando archivo limpio en: {ruta_final}")
-
-    with open(ruta_final, "w") as f:
-        
-        # Cabecera
-        f.write("id posx posy velx vely accelx accely rho mass pressure h internalE type\n")
-        
-        # Filas formateadas
-        for _, row in df_limpio.iterrows():
-            f.write(
-                f"{int(row['id'])} "
-                f"{row['posx']:.10f} "
-                f"{row['posy']:.10f} "
-                f"{row['velx']:.10f} "
-                f"{row['vely']:.10f} "
-                f"{row['accelx']:.10f} "
-                f"{row['accely']:.10f} "
-                f"{row['rho']:.10f} "
-                f"{row['mass']:.10f} "
-                f"{row['pressure']:.10f} "
-                f"{row['h']:.10f} "
-                f"{row['internalE']:.10f} "
-                f"{int(row['type'])}\n"
-            )
-
     print("🎉 Archivo ICS limpio generado correctamente.")
     return ruta_final
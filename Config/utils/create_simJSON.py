@@ -3,6 +3,20 @@ import json
 from pathlib import Path
 
 
+def set_param(params: dict, path: str, value):
+    """
+    Asigna params[a][b][c] = value para path = "a.b.c". Las secciones
+    intermedias deben existir en el JSON base (evita typos silenciosos).
+    """
+    *parents, leaf = path.split(".")
+    node = params
+    for key in parents:
+        if not isinstance(node.get(key), dict):
+            raise KeyError(f"[ERROR] Ruta inexistente en params.json: {path}")
+        node = node[key]
+    node[leaf] = value
+
+
 def create_simulation_config(
     experiment_name: str,
     input_file: str,
@@ -15,10 +29,15 @@ def create_simulation_config(
     project_root: Path = None,
     project_dir: Path = None,
     output_tests: str = None,
-    neighbor_method: str = None
+    neighbor_method: str = None,
+    snapshot_mode: str = None,
+    overrides: dict = None
 ):
     """
     Genera params.json dentro de un experimento perteneciente a un proyecto.
+
+    overrides: {"ruta.con.puntos": valor} aplicados al final sobre
+    cualquier entrada de params.json (p.ej. "kernel.h_factor": 1.3).
     """
 
     # --- 1. Validaciones ---
@@ -66,8 +85,22 @@ def create_simulation_config(
     if neighbor_method is not None:
         params["neighbors"]["search_method"] = str(neighbor_method)
 
-    if output_tests is not None:
-        params["kernel"]["output_dir"] = str(output_tests)
+    # Salidas de los tests del kernel y de vecinos: por defecto en la carpeta
+    # del experimento, para que corridas en paralelo no escriban en el mismo
+    # Output/tests compartido
+    tests_dir = Path(output_tests) if output_tests is not None else experiment_root / "tests"
+    if "output_dir" in params.get("kernel", {}):
+        params["kernel"]["output_dir"] = str(tests_dir)
+    if "test_NN_output_dir" in params.get("neighbors", {}):
+        params["neighbors"]["test_NN_output_dir"] = str(tests_dir)
+
+    # "full" (por defecto) o "dedup": estáticas una sola vez + fluido por step
+    if snapshot_mode is not None:
+        params["io"]["snapshot_mode"] = str(snapshot_mode)
+
+    # --- 6b. Overrides por ruta ---
+    for path, value in (overrides or {}).items():
+        set_param(params, path, value)
 
     # --- 7. IO ---
     sim_output_dir = experiment_root / "Output"
@@ -0,0 +1,281 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+IC_ROOT = PROJECT_ROOT / "InitialConditions"
+# Mismos accesos que InitialConditions/main.py (src y sus subpaquetes)
+for root in (PROJECT_ROOT, IC_ROOT, IC_ROOT / "src"):
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+from src.core.export import GENERATOR_VERSION, export_all_particles
+
+
+# Caché por defecto, fuera del repositorio (se puede cambiar con la variable
+# de entorno SPH_ICS_CACHE)
+DEFAULT_CACHE_DIR = (Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+                     / "sph" / "ics_cache")
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+ICS_FILE = "ics"
+SUMMARY_FILE = "summary.json"
+META_FILE = "meta.json"
+FLUID_FILE = "fluid.json"
+BOUNDARY_FILE = "boundary.json"
+
+
+def default_cache_dir():
+    return Path(os.environ.get("SPH_ICS_CACHE", DEFAULT_CACHE_DIR))
+
+
+def _load_params(params):
+    """Parámetros como dict, ya sea que se pase un dict o la ruta a un JSON."""
+    if isinstance(params, dict):
+        return params
+    with open(params, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ics_key(fluid_params, boundary_params, output_format="txt", ordering="none"):
+    """
+    Clave de contenido (sha256) de un ICS: parámetros de fluido y frontera
+    canonizados (claves ordenadas, sin espacios), formato, ordenamiento y
+    versión del generador. Dos JSON equivalentes dan la misma clave aunque
+    difieran en el orden de las claves o en el formato del archivo.
+    """
+    payload = {
+        "fluid": _load_params(fluid_params),
+        "boundary": _load_params(boundary_params),
+        "output_format": output_format,
+        "ordering": ordering,
+        "generator_version": GENERATOR_VERSION,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _entry_size(entry):
+    return sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+
+
+def cache_entries(cache_dir=None):
+    """Entradas del caché como [(ruta, tamaño, último uso)], de la más antigua a la más nueva."""
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    if not cache_dir.exists():
+        return []
+    entries = [
+        (e, _entry_size(e), e.stat().st_mtime)
+        for e in cache_dir.iterdir()
+        if e.is_dir() and (e / META_FILE).exists()
+    ]
+    return sorted(entries, key=lambda x: x[2])
+
+
+def evict(cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, keep=()):
+    """
+    Elimina las entradas usadas hace más tiempo (LRU) hasta que el caché
+    ocupe como máximo max_bytes. Las claves en keep no se eliminan.
+
+    Retorna:
+    --------
+    list[str] : claves eliminadas.
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+
+    # Directorios temporales abandonados (generación interrumpida)
+    if cache_dir.exists():
+        for tmp in cache_dir.glob(".*-*"):
+            if tmp.is_dir() and time.time() - tmp.stat().st_mtime > 3600:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+    entries = cache_entries(cache_dir)
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for entry, size, _ in entries:
+        if total <= max_bytes:
+            break
+        if entry.name in keep:
+            continue
+        # Primero se retira la entrada con un rename atómico: desde ese
+        # momento ningún proceso la ve como acierto, y quien ya la estaba
+        # leyendo conserva sus archivos abiertos (ver _copy_entry). Solo
+        # entonces se borra.
+        trash = cache_dir / f".{entry.name[:12]}-evict-{os.getpid()}-{time.time_ns()}"
+        try:
+            os.rename(entry, trash)
+        except OSError:
+            continue        # otro proceso ya la retiró
+        shutil.rmtree(trash, ignore_errors=True)
+        total -= size
+        removed.append(entry.name)
+    return removed
+
+
+def _generate_entry(cache_dir, key, fluid_json, boundary_json, output_format, ordering):
+    """Genera el ICS en un directorio temporal y lo publica de forma atómica."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=cache_dir))
+    try:
+        # Copia de los parámetros junto al ICS (y admite dicts como entrada)
+        for name, params in ((FLUID_FILE, fluid_json), (BOUNDARY_FILE, boundary_json)):
+            with open(tmp / name, "w", encoding="utf-8") as f:
+                json.dump(_load_params(params), f, indent=2)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            export_all_particles(
+                boundary_param_file=tmp / BOUNDARY_FILE,
+                fluid_param_file=tmp / FLUID_FILE,
+                output_dir=tmp,
+                output_filename=ICS_FILE,
+                output_logname=SUMMARY_FILE,
+                output_format=output_format,
+                ordering=ordering,
+            )
+        with open(tmp / META_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                "key": key,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "output_format": output_format,
+                "ordering": ordering,
+                "generator_version": GENERATOR_VERSION,
+            }, f, indent=2)
+
+        try:
+            os.rename(tmp, cache_dir / key)
+        except OSError:
+            # Otro proceso publicó la misma clave primero: se usa la suya
+            shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return cache_dir / key
+
+
+def _copy_entry(entry, output_path):
+    """
+    Copia el ICS de una entrada en output_path y devuelve su resumen, o
+    None si la entrada ya no existe.
+
+    Ambos archivos se abren antes de copiar: si evict retira la entrada a
+    mitad de la copia, los descriptores abiertos siguen siendo válidos.
+    """
+    try:
+        ics = open(entry / ICS_FILE, "rb")
+    except FileNotFoundError:
+        return None
+    with ics:
+        try:
+            with open(entry / SUMMARY_FILE, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+        except FileNotFoundError:
+            return None
+        # Copia (no enlace): el destino puede reescribirse sin tocar el caché
+        with open(output_path, "wb") as out:
+            shutil.copyfileobj(ics, out)
+    return summary
+
+
+def get_or_create_ics(fluid_json, boundary_json, output_path, log_path=None,
+                      output_format="txt", ordering="none",
+                      cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Copia en output_path el ICS correspondiente a (fluid_json, boundary_json),
+    generándolo solo si no está en el caché.
+
+    Parámetros:
+    ----------
+    fluid_json, boundary_json : Path | dict
+        Parámetros de fluido y frontera (ruta a JSON o dict).
+    output_path : Path
+        Archivo ICS de destino.
+    log_path : Path | None
+        Resumen JSON de destino (por defecto '<output>_log.json').
+    output_format, ordering : str
+        Igual que en export_all_particles; forman parte de la clave.
+    cache_dir : Path | None
+        Directorio del caché (por defecto default_cache_dir()).
+    max_bytes : int
+        Tamaño máximo del caché; al superarlo se eliminan las entradas
+        usadas hace más tiempo.
+
+    Retorna:
+    --------
+    (dict, bool) : resumen del ICS y True si se obtuvo del caché.
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    output_path = Path(output_path)
+    log_path = (Path(log_path) if log_path is not None
+                else output_path.with_name(f"{output_path.stem}_log.json"))
+
+    key = ics_key(fluid_json, boundary_json, output_format, ordering)
+    entry = cache_dir / key
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    hit = (entry / META_FILE).exists()
+    summary = _copy_entry(entry, output_path) if hit else None
+    if summary is None:
+        # Sin entrada, o retirada por evict de otro proceso entre la
+        # comprobación y la copia: se genera de nuevo
+        hit = False
+        entry = _generate_entry(cache_dir, key, fluid_json, boundary_json,
+                                output_format, ordering)
+        summary = _copy_entry(entry, output_path)
+        if summary is None:
+            raise FileNotFoundError(f"La entrada {key[:12]} del caché desapareció al copiarla")
+
+    summary.update(
+        output_file=str(output_path),
+        fluid_param_file=str(fluid_json) if not isinstance(fluid_json, dict) else None,
+        boundary_param_file=str(boundary_json) if not isinstance(boundary_json, dict) else None,
+        cache_key=key,
+    )
+    with open(log_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=4)
+
+    # Marca de último uso para la política LRU
+    try:
+        os.utime(entry)
+    except FileNotFoundError:
+        pass
+    evict(cache_dir, max_bytes, keep={key})
+    return summary, hit
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Caché de condiciones iniciales (ICS)")
+    parser.add_argument("command", choices=["info", "evict", "clear"])
+    parser.add_argument("--cache_dir", default=None)
+    parser.add_argument("--max_bytes", type=int, default=DEFAULT_MAX_BYTES)
+    args = parser.parse_args()
+
+    cache_dir = Path(args.cache_dir) if args.cache_dir else default_cache_dir()
+
+    if args.command == "info":
+        entries = cache_entries(cache_dir)
+        total = sum(size for _, size, _ in entries)
+        print(f"Caché: {cache_dir}")
+        print(f"Entradas: {len(entries)} ({total / 1e6:.1f} MB)")
+        for entry, size, used in entries:
+            print(f"  {entry.name[:16]}  {size / 1e6:8.2f} MB  "
+                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(used))}")
+
+    elif args.command == "evict":
+        removed = evict(cache_dir, args.max_bytes)
+        print(f"[✓] {len(removed)} entradas eliminadas")
+
+    elif args.command == "clear":
+        removed = evict(cache_dir, 0)
+        print(f"[✓] Caché vaciado ({len(removed)} entradas)")
+
+
+if __name__ == "__main__":
+    main()
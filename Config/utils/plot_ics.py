@@ -1,9 +1,17 @@
-import pandas as pd
+import sys
+from pathlib import Path
 import matplotlib.pyplot as plt
 from matplotlib.ticker import ScalarFormatter
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Analysis.utils.state_files import read_state_df
+
 def plot_ics(archivo_txt, particle_size=6, xlim=None, ylim=None):
-    df = pd.read_csv(archivo_txt, sep=" ")
+    # read_state_df reconstruye frames completos también en modo 'dedup'
+    df = read_state_df(archivo_txt)
 
     df_fluid = df[df["type"] == 0]
     df_boundary = df[df["type"] == 1]
@@ -0,0 +1,79 @@
+# Config/utils/run_resources.py
+import json
+import os
+from pathlib import Path
+
+RESOURCES_FILE = "resources.json"
+
+# Columnas extra de stability_results.csv
+RESOURCE_FIELDS = ["cpu_user", "cpu_sys", "cpu_fraction", "max_rss_mb",
+                   "output_bytes", "n_states"]
+
+
+def output_usage(output_dir):
+    """
+    Bytes escritos en la carpeta de salida del solver (recursivo) y
+    número de archivos state_*.
+    """
+    total, n_states = 0, 0
+    stack = [Path(output_dir)]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+                if entry.name.startswith("state_"):
+                    n_states += 1
+    return total, n_states
+
+
+def run_resources(run, output_dir):
+    """
+    Uso de recursos de una corrida a partir del resultado de
+    async_runner.run_process y de su carpeta de salida.
+
+    cpu_fraction = (user + sys) / tiempo de pared: cerca de 1 indica una
+    corrida limitada por CPU; valores bajos, esperas de E/S (o un proceso
+    fijado a un núcleo compartido).
+    """
+    output_bytes, n_states = output_usage(output_dir)
+    cpu = run["cpu_user"] + run["cpu_sys"]
+    return {
+        "elapsed": run["elapsed"],
+        "cpu_user": run["cpu_user"],
+        "cpu_sys": run["cpu_sys"],
+        "cpu_fraction": cpu / run["elapsed"] if run["elapsed"] > 0 else None,
+        "max_rss_mb": run["max_rss_kb"] / 1024,
+        "output_bytes": output_bytes,
+        "n_states": n_states,
+        "stdout_bytes": run["stdout_bytes"],
+        "stderr_bytes": run["stderr_bytes"],
+        "returncode": run["returncode"],
+    }
+
+
+def save_run_resources(experiment_dir, resources):
+    """Guarda resources.json dentro del experimento."""
+    path = Path(experiment_dir) / RESOURCES_FILE
+    with open(path, "w") as f:
+        json.dump(resources, f, indent=2)
+    return path
+
+
+def record_run_resources(run, param_file, project_root):
+    """
+    Uso de recursos de la corrida de param_file (la carpeta de salida se
+    toma de su params.json); lo guarda en resources.json y lo devuelve.
+    """
+    with open(param_file) as f:
+        output_dir = Path(json.load(f)["io"]["output_dir_simulation"])
+    if not output_dir.is_absolute():
+        output_dir = Path(project_root) / output_dir
+    resources = run_resources(run, output_dir)
+    save_run_resources(Path(param_file).parent, resources)
+    return resources
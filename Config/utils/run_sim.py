@@ -1,6 +1,14 @@
-import subprocess
+import sys
 from pathlib import Path
-import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Config.utils.sweep_scheduler import SweepScheduler, pin_process
+from Config.utils.async_runner import run_process
+from Config.utils.run_resources import record_run_resources
+from Config.Pipeline.runtime_model import SAFETY_FACTOR, plan_runtimes
 
 def run_single_simulation(
     experiment_dir: Path,
@@ -36,135 +44,132 @@ def run_single_simulation(
     stdout_path = experiment_dir / "stdout.txt"
     stderr_path = experiment_dir / "stderr.txt"
 
-    err_log = open(stderr_path, "w")
-
     cmd = [str(sim_executable), str(param_file)]
-    start_time = time.time()
-
-    # Función interna para manejar el timeout
-    def run_with_timeout(proc, timeout):
-        try:
-            proc.wait(timeout=timeout)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            raise
-
-    try:
-        # --- 2. Ejecutar simulación ---
-        proc = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            cwd=project_root
-        )
-
-        # --- 3. Leer stdout en tiempo real ---
-        with open(stdout_path, "w") as out_file:
-            for line in iter(proc.stdout.readline, ""):
-                print(line, end="")
-                out_file.write(line)
-
-        # --- 4. Leer stderr al final ---
-        stderr_output = proc.stderr.read()
-        if stderr_output:
-            print("\n[STDERR]\n" + stderr_output)
-            err_log.write(stderr_output)
-
-        # --- 5. Timeout ---
-        run_with_timeout(proc, timeout_seconds)
-
-        elapsed = time.time() - start_time
-
-        if proc.returncode == 0:
-            print(f"\n  ✅ Simulación completada ({elapsed:.1f} s)\n")
-        else:
-            print(f"\n  ⚠️ Terminó con código {proc.returncode} ({elapsed:.1f} s)\n")
-
-    except subprocess.TimeoutExpired:
+
+    # --- 2. Ejecutar simulación (stdout en tiempo real, stderr a disco) ---
+    run = run_process(
+        cmd,
+        stdout_path,
+        stderr_path,
+        timeout=timeout_seconds,
+        cwd=project_root,
+        on_stdout=lambda line: print(line, end="")
+    )
+
+    record_run_resources(run, param_file, project_root)
+
+    # --- 3. Cola de stderr ---
+    if run["stderr_tail"]:
+        print("\n[STDERR]\n" + run["stderr_tail"])
+
+    # --- 4. Timeout ---
+    if run["timed_out"]:
         print(f"\n  ❌ TIMEOUT: simulación detenida tras {timeout_seconds}s")
-        err_log.write(f"\n[ERROR] Timeout a los {timeout_seconds}s\n")
+        with open(stderr_path, "a") as err_log:
+            err_log.write(f"\n[ERROR] Timeout a los {timeout_seconds}s\n")
+        return
 
-    finally:
-        err_log.close()
+    elapsed = run["elapsed"]
+    if run["returncode"] == 0:
+        print(f"\n  ✅ Simulación completada ({elapsed:.1f} s)\n")
+    else:
+        print(f"\n  ⚠️ Terminó con código {run['returncode']} ({elapsed:.1f} s)\n")
 
 
 
-def run_all_simulations(
-    experiment_root: Path,
-    sim_executable: Path,
-    timeout_seconds: int = 6000,
-    pattern: str = "experiment_B*/params.json",
-    project_root: Path = None
-):
-    if project_root is None:
-        project_root = Path().resolve().parent
+def _run_param_file(param_file, sim_executable, timeout_seconds, project_root,
+                    cpu=None, echo=True):
+    """Ejecuta una simulación de run_all_simulations; devuelve el tiempo o None (timeout)."""
+    run_dir = param_file.parent
+    run_name = run_dir.name
 
-    param_files = sorted(experiment_root.glob(pattern))
+    print(f"\n🚀 Ejecutando {run_name} ...\n")
 
-    print(f"\n🔍 Se encontraron {len(param_files)} simulaciones para ejecutar.\n")
-    if not param_files:
-        return []
+    stdout_path = run_dir / "stdout.txt"
+    stderr_path = run_dir / "stderr.txt"
 
-    def run_with_timeout(proc, timeout):
-        try:
-            proc.wait(timeout=timeout)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            raise
+    cmd = [str(sim_executable), str(param_file)]
 
-    elapsed_times = []
+    run = run_process(
+        cmd,
+        stdout_path,
+        stderr_path,
+        timeout=timeout_seconds,
+        cwd=project_root,
+        on_start=lambda pid: pin_process(pid, cpu),
+        on_stdout=(lambda line: print(line, end="")) if echo else None
+    )
 
-    for param_file in param_files:
-        run_dir = param_file.parent
-        run_name = run_dir.name
+    resources = record_run_resources(run, param_file, project_root)
 
-        print(f"\n🚀 Ejecutando {run_name} ...\n")
+    if echo and run["stderr_tail"]:
+        print("\n[STDERR]\n" + run["stderr_tail"])
 
-        stdout_path = run_dir / "stdout.txt"
-        stderr_path = run_dir / "stderr.txt"
+    if run["timed_out"]:
+        print(f"\n  ❌ {run_name}: TIMEOUT tras {timeout_seconds}s — simulación detenida")
+        with open(stderr_path, "a") as err_log:
+            err_log.write(f"\n[ERROR] Timeout tras {timeout_seconds}s\n")
+        return None
 
-        err_log = open(stderr_path, "w")
+    elapsed = run["elapsed"]
+    usage = (f"cpu {resources['cpu_user'] + resources['cpu_sys']:.1f} s, "
+             f"rss {resources['max_rss_mb']:.0f} MB, {resources['n_states']} states")
+    if run["returncode"] == 0:
+        print(f"\n  ✅ {run_name}: finalizado correctamente ({elapsed:.1f} s; {usage})\n")
+    else:
+        print(f"\n  ⚠️ {run_name}: código de salida {run['returncode']} ({elapsed:.1f} s; {usage})\n")
+    return elapsed
 
-        cmd = [str(sim_executable), str(param_file)]
-        start_time = time.time()
 
-        try:
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=project_root
-            )
+def run_all_simulations(
+    experiment_root: Path,
+    sim_executable: Path,
+    timeout_seconds: int = 6000,
+    pattern: str = "experiment_B*/params.json",
+    project_root: Path = None,
+    max_parallel: int = None,
+    pin_cpus: bool = False,
+    memory_per_run: int = None,
+    runtime_model=None,
+    safety_factor: float = SAFETY_FACTOR
+):
+    """
+    Ejecuta todas las simulaciones que coinciden con pattern, hasta
+    max_parallel a la vez (por defecto, una por núcleo físico).
 
-            # Leer stdout en tiempo real
-            with open(stdout_path, "w") as out_file:
-                for line in iter(proc.stdout.readline, ""):
-                    print(line, end="")
-                    out_file.write(line)
+    Con una sola simulación en vuelo la salida del solver se muestra en
+    consola; en paralelo solo se guarda en stdout.txt de cada experimento.
 
-            stderr_output = proc.stderr.read()
-            if stderr_output:
-                print("\n[STDERR]\n" + stderr_output)
-                err_log.write(stderr_output)
+    Con un runtime_model ajustado (Config/Pipeline/runtime_model.py) cada
+    simulación recibe como timeout la duración predicha con margen
+    (RuntimeModel.timeout_for, nunca menor que timeout_seconds) y las más
+    largas se lanzan primero.
 
-            run_with_timeout(proc, timeout_seconds)
-            elapsed = time.time() - start_time
+    Retorna:
+        list: tiempo de cada simulación (None si hubo timeout), en el
+        orden de los params.json encontrados.
+    """
+    if project_root is None:
+        project_root = Path().resolve().parent
 
-            elapsed_times.append(elapsed)
+    param_files = sorted(experiment_root.glob(pattern))
 
-            if proc.returncode == 0:
-                print(f"\n  ✅ Finalizado correctamente ({elapsed:.1f} s)\n")
-            else:
-                print(f"\n  ⚠️ Código de salida {proc.returncode} ({elapsed:.1f} s)\n")
+    print(f"\n🔍 Se encontraron {len(param_files)} simulaciones para ejecutar.\n")
+    if not param_files:
+        return []
 
-        except subprocess.TimeoutExpired:
-            print(f"\n  ❌ TIMEOUT tras {timeout_seconds}s — simulación detenida")
-            err_log.write(f"\n[ERROR] Timeout tras {timeout_seconds}s\n")
-            elapsed_times.append(None)
+    scheduler = SweepScheduler(max_parallel, pin_cpus=pin_cpus, memory_per_run=memory_per_run)
+    echo = scheduler.max_parallel == 1
+
+    runs = [{"index": i, "param_file": p} for i, p in enumerate(param_files)]
+    plan_runtimes(runs, runtime_model, timeout_seconds, safety_factor)
 
-        finally:
-            err_log.close()
+    def _run(run, cpu):
+        return _run_param_file(run["param_file"], sim_executable, run["timeout"],
+                               project_root, cpu=cpu, echo=echo)
 
-    return elapsed_times
+    # Resultados en el orden de param_files aunque se lancen en otro orden
+    times = [None] * len(runs)
+    for run, elapsed in zip(runs, scheduler.map(_run, runs)):
+        times[run["index"]] = elapsed
+    return times
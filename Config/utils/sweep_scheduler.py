@@ -0,0 +1,170 @@
+# Config/utils/sweep_scheduler.py
+import os
+import threading
+from pathlib import Path
+
+
+def _affinity():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def core_cpus():
+    """
+    Una CPU lógica por núcleo físico disponible para este proceso.
+
+    Agrupa los hilos hermanos (SMT / hyper-threading) según
+    /sys/devices/system/cpu/cpuN/topology; sin esa información cada CPU
+    lógica cuenta como un núcleo.
+    """
+    allowed = _affinity()
+    seen, cpus = set(), []
+    for cpu in allowed:
+        siblings = Path(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list")
+        try:
+            core = siblings.read_text().strip()
+        except OSError:
+            core = str(cpu)
+        if core not in seen:
+            seen.add(core)
+            cpus.append(cpu)
+    return cpus
+
+
+def physical_cores():
+    """Número de núcleos físicos disponibles (el solver es de un solo hilo)."""
+    return max(1, len(core_cpus()))
+
+
+def available_memory():
+    """Memoria disponible en bytes (MemAvailable de /proc/meminfo) o None."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class SweepScheduler:
+    """
+    Ejecuta tareas independientes (cada una lanza un proceso del solver)
+    con hasta max_parallel en vuelo.
+
+    Parámetros
+    ----------
+    max_parallel : int | None
+        Tareas simultáneas; por defecto, el número de núcleos físicos.
+    pin_cpus : bool
+        Si True, cada tarea recibe un núcleo propio (cpu) para fijar la
+        afinidad de su proceso con pin_process.
+    memory_per_run : int | None
+        Memoria estimada por corrida [bytes]. Una tarea nueva solo arranca
+        si MemAvailable, descontando memory_per_run por cada tarea en
+        vuelo, alcanza para ella más memory_reserve.
+    memory_reserve : int
+        Memoria que se deja libre para el sistema [bytes].
+    poll_interval : float
+        Segundos entre reintentos cuando falta memoria.
+    """
+
+    def __init__(self, max_parallel=None, pin_cpus=False, memory_per_run=None,
+                 memory_reserve=512 * 1024**2, poll_interval=2.0):
+        self.cpus = core_cpus()
+        self.max_parallel = max(1, int(max_parallel or len(self.cpus)))
+        self.pin_cpus = pin_cpus
+        self.memory_per_run = memory_per_run
+        self.memory_reserve = memory_reserve
+        self.poll_interval = poll_interval
+
+        self._cond = threading.Condition()
+        self._running = 0
+        self._free_cpus = list(self.cpus)
+
+    # ---------------------------------------------------------
+    def _memory_ok(self):
+        if self._running == 0:
+            return True           # siempre se admite al menos una corrida
+        available = available_memory()
+        if available is None:
+            return True
+        # Las corridas en vuelo pueden no haber reservado aún su memoria
+        # (el solver la pide al leer el ICS), así que MemAvailable no las
+        # refleja: se descuenta lo estimado para cada una.
+        per_run = self.memory_per_run or 0
+        in_flight = self._running * per_run
+        return available - in_flight >= per_run + self.memory_reserve
+
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._running < self.max_parallel and self._memory_ok():
+                    self._running += 1
+                    cpu = None
+                    if self.pin_cpus and self._free_cpus:
+                        cpu = self._free_cpus.pop(0)
+                    return cpu
+                self._cond.wait(timeout=self.poll_interval)
+
+    def _release(self, cpu):
+        with self._cond:
+            self._running -= 1
+            if cpu is not None:
+                self._free_cpus.append(cpu)
+            self._cond.notify_all()
+
+    # ---------------------------------------------------------
+    def map(self, fn, items, on_result=None):
+        """
+        Aplica fn(item, cpu) a cada item y devuelve los resultados en el
+        orden de items. cpu es el núcleo asignado (o None sin pin_cpus).
+
+        on_result(index, item, result) se llama apenas termina cada tarea
+        (útil para registrar progreso). Si una tarea lanza una excepción,
+        no se lanzan tareas nuevas, se espera a las que están en vuelo y
+        luego se relanza la primera.
+        """
+        items = list(items)
+        results = [None] * len(items)
+        errors = []
+        threads = []
+
+        def _worker(i, item, cpu):
+            try:
+                results[i] = fn(item, cpu)
+                if on_result is not None:
+                    on_result(i, item, results[i])
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                self._release(cpu)
+
+        for i, item in enumerate(items):
+            cpu = self._acquire()
+            if errors:
+                self._release(cpu)
+                break
+            t = threading.Thread(target=_worker, args=(i, item, cpu), daemon=True)
+            t.start()
+            threads.append(t)
+
+        for t in threads:
+            t.join()
+
+        if errors:
+            raise errors[0]
+        return results
+
+
+def pin_process(pid, cpu):
+    """Fija la afinidad de un proceso a un núcleo (sin efecto si cpu es None)."""
+    if cpu is None or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(pid, {cpu})
+    except OSError:
+        # El proceso ya terminó o la CPU no está disponible
+        pass
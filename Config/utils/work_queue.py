@@ -0,0 +1,400 @@
+# Config/utils/work_queue.py
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Config.utils.async_runner import run_process
+from Config.utils.run_resources import record_run_resources
+
+# Estados de un trabajo
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+DEFAULT_HEARTBEAT = 30.0      # segundos entre latidos de un worker
+DEFAULT_STALE_AFTER = 120.0   # sin latido por más de esto -> el worker se da por muerto
+DEFAULT_MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    param_file  TEXT UNIQUE NOT NULL,
+    state       TEXT NOT NULL DEFAULT 'pending',
+    priority    REAL NOT NULL DEFAULT 0,
+    timeout     REAL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    claimed_at  REAL,
+    heartbeat   REAL,
+    finished_at REAL,
+    result      TEXT,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, priority);
+"""
+
+
+def worker_name():
+    """Identificador de un worker: host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Cola de trabajos en un archivo SQLite compartido (sin servicio externo).
+
+    Cada trabajo es un params.json (ver create_simulation_config). Los
+    workers, en esta u otras máquinas con el mismo sistema de archivos,
+    reclaman trabajos con una transacción BEGIN IMMEDIATE (un trabajo nunca
+    se entrega a dos workers), envían latidos mientras corren y, si un
+    worker deja de latir por más de stale_after segundos, su trabajo vuelve
+    a quedar pendiente.
+
+    Se usa el journal clásico de SQLite (no WAL), que solo necesita locks
+    de archivo; en NFS esos locks deben estar habilitados.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.db_path, timeout=60.0)
+        try:
+            db.executescript(_SCHEMA)
+        finally:
+            db.close()
+
+    @contextmanager
+    def _tx(self, immediate=False):
+        # Una conexión por operación: se puede usar desde varios hilos
+        db = sqlite3.connect(self.db_path, timeout=60.0, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            yield db
+            db.execute("COMMIT")
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    # ---------------------------------------------------------
+    def enqueue(self, param_files, priorities=None, timeouts=None):
+        """
+        Agrega trabajos (rutas absolutas a params.json). Los que ya estaban
+        en la cola no se duplican. Mayor prioridad = se reclama antes.
+
+        Retorna:
+            int: trabajos nuevos.
+        """
+        param_files = [str(Path(p).resolve()) for p in param_files]
+        priorities = priorities or [0.0] * len(param_files)
+        timeouts = timeouts or [None] * len(param_files)
+        with self._tx(immediate=True) as db:
+            before = db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (param_file, priority, timeout) VALUES (?, ?, ?)",
+                zip(param_files, priorities, timeouts)
+            )
+            return db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] - before
+
+    def claim(self, worker):
+        """Reclama el trabajo pendiente de mayor prioridad; None si no hay."""
+        now = time.time()
+        with self._tx(immediate=True) as db:
+            row = db.execute(
+                "SELECT * FROM jobs WHERE state = ? ORDER BY priority DESC, id LIMIT 1",
+                (PENDING,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET state = ?, worker = ?, claimed_at = ?, heartbeat = ?, "
+                "attempts = attempts + 1, error = NULL WHERE id = ?",
+                (RUNNING, worker, now, now, row["id"])
+            )
+        job = dict(row)
+        job.update(state=RUNNING, worker=worker, attempts=row["attempts"] + 1)
+        return job
+
+    def heartbeat(self, job_id, worker):
+        """Renueva el latido; False si el trabajo ya no pertenece a este worker."""
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ? AND state = ?",
+                (time.time(), job_id, worker, RUNNING)
+            )
+            return cur.rowcount == 1
+
+    def complete(self, job_id, worker, result):
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, result = ? "
+                "WHERE id = ? AND worker = ? AND state = ?",
+                (DONE, time.time(), json.dumps(result), job_id, worker, RUNNING)
+            )
+            return cur.rowcount == 1
+
+    def fail(self, job_id, worker, error, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """Registra un error; el trabajo vuelve a la cola hasta max_attempts intentos."""
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+                "worker = NULL, finished_at = ?, error = ? "
+                "WHERE id = ? AND worker = ? AND state = ?",
+                (max_attempts, PENDING, FAILED, time.time(), str(error), job_id, worker, RUNNING)
+            )
+            return cur.rowcount == 1
+
+    def requeue_stale(self, stale_after=DEFAULT_STALE_AFTER, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Devuelve a la cola los trabajos cuyo worker no late hace más de
+        stale_after segundos (o los marca fallidos si agotaron sus intentos).
+
+        Retorna:
+            int: trabajos recuperados.
+        """
+        limit = time.time() - stale_after
+        with self._tx(immediate=True) as db:
+            cur = db.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+                "error = 'worker ' || worker || ' sin latido', worker = NULL "
+                "WHERE state = ? AND heartbeat < ?",
+                (max_attempts, PENDING, FAILED, RUNNING, limit)
+            )
+            return cur.rowcount
+
+    def reset(self, states=(FAILED,)):
+        """Vuelve a poner como pendientes los trabajos en states (p.ej. fallidos)."""
+        marks = ",".join("?" * len(states))
+        with self._tx(immediate=True) as db:
+            cur = db.execute(
+                f"UPDATE jobs SET state = ?, attempts = 0, worker = NULL WHERE state IN ({marks})",
+                (PENDING, *states)
+            )
+            return cur.rowcount
+
+    def counts(self):
+        """Número de trabajos por estado."""
+        with self._tx() as db:
+            rows = db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({state: n for state, n in rows})
+        return counts
+
+    def jobs(self, state=None):
+        with self._tx() as db:
+            if state is None:
+                rows = db.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+            else:
+                rows = db.execute("SELECT * FROM jobs WHERE state = ? ORDER BY id", (state,)).fetchall()
+        return [dict(r) for r in rows]
+
+
+def enqueue_experiments(db_path, experiment_root, pattern="**/params.json",
+                        runtime_model=None, timeout_seconds=None, safety_factor=None):
+    """
+    Encola los params.json bajo experiment_root. Con un runtime_model
+    ajustado, la prioridad es la duración predicha (los largos primero) y
+    el timeout, la predicción con margen (RuntimeModel.timeout_for).
+    """
+    from Config.Pipeline.runtime_model import SAFETY_FACTOR, plan_runtimes
+
+    param_files = sorted(Path(experiment_root).glob(pattern))
+    runs = [{"param_file": p} for p in param_files]
+    plan_runtimes(runs, runtime_model, timeout_seconds, safety_factor or SAFETY_FACTOR)
+
+    queue = WorkQueue(db_path)
+    added = queue.enqueue(
+        [r["param_file"] for r in runs],
+        priorities=[r["predicted"] or 0.0 for r in runs],
+        timeouts=[r["timeout"] for r in runs]
+    )
+    print(f"[✓] {added} trabajos nuevos en {db_path} ({len(runs) - added} ya estaban)")
+    return added
+
+
+def run_worker(db_path, sim_executable, project_root=None, timeout_seconds=6000,
+               heartbeat_interval=DEFAULT_HEARTBEAT, stale_after=DEFAULT_STALE_AFTER,
+               max_attempts=DEFAULT_MAX_ATTEMPTS, wait=True, idle_poll=5.0, worker=None):
+    """
+    Reclama y ejecuta trabajos hasta vaciar la cola.
+
+    Mientras corre una simulación el worker late cada heartbeat_interval
+    segundos; si pierde el trabajo (otro worker lo dio por muerto y lo
+    reencoló) mata su proceso.
+
+    Toda corrida que llega a ejecutarse se completa con su estado de
+    estabilidad (classify_run, como en stability_results.csv): un timeout,
+    una divergencia o un segfault del solver son resultados, no errores, y
+    repetirlos no cambia nada. Solo se reintentan (hasta max_attempts) los
+    errores del worker o de la infraestructura (ejecutable o params.json
+    ilegibles, fallos de E/S) y los trabajos de workers muertos. Con
+    wait=True, si no quedan pendientes
+    pero sí trabajos en curso en otros workers, espera por si alguno se
+    reencola; termina cuando no queda nada pendiente ni en curso.
+
+    Retorna:
+        int: trabajos completados por este worker.
+    """
+    from Config.Pipeline.est_tree_pipeline import classify_run
+
+    queue = WorkQueue(db_path)
+    worker = worker or worker_name()
+    project_root = Path(project_root) if project_root else PROJECT_ROOT
+    n_done = 0
+
+    while True:
+        queue.requeue_stale(stale_after, max_attempts)
+        job = queue.claim(worker)
+        if job is None:
+            counts = queue.counts()
+            if wait and counts[RUNNING]:
+                time.sleep(idle_poll)
+                continue
+            break
+
+        param_file = Path(job["param_file"])
+        run_dir = param_file.parent
+        print(f"🚀 [{worker}] {run_dir.name} (intento {job['attempts']})")
+
+        try:
+            with open(param_file) as f:
+                steps = int(json.load(f)["integrator"]["n_steps"])
+            run = run_process(
+                [sim_executable, param_file],
+                run_dir / "stdout.txt",
+                run_dir / "stderr.txt",
+                timeout=job["timeout"] or timeout_seconds,
+                cwd=project_root,
+                # Si el latido falla, el trabajo ya es de otro: se corta
+                stop_check=lambda: not queue.heartbeat(job["id"], worker),
+                poll_interval=heartbeat_interval
+            )
+            if run["stopped"]:
+                print(f"  ⚠️ [{worker}] {run_dir.name}: trabajo reasignado, se abandona")
+                continue
+
+            resources = record_run_resources(run, param_file, project_root)
+            mode = "TIMEOUT" if run["timed_out"] else "EXIT"
+            status = classify_run(mode, run["last_step"], steps, run["returncode"])
+            result = {
+                "status": status,
+                "elapsed": run["elapsed"],
+                "last_step": run["last_step"],
+                "steps": steps,
+                "returncode": run["returncode"],
+                "timed_out": run["timed_out"],
+                **resources,
+            }
+            queue.complete(job["id"], worker, result)
+            n_done += 1
+            icon = "✅" if status == "STABLE" else "⚠️"
+            print(f"  {icon} [{worker}] {run_dir.name}: {status} ({run['elapsed']:.1f} s)")
+        except Exception as e:
+            # Error del worker o de la infraestructura: se reintenta
+            queue.fail(job["id"], worker, repr(e), max_attempts)
+            print(f"  ❌ [{worker}] {run_dir.name}: {e!r}")
+
+    return n_done
+
+
+def run_local_workers(db_path, n_workers, **worker_options):
+    """Lanza n_workers procesos worker en esta máquina y espera a que terminen."""
+    procs = [
+        multiprocessing.Process(target=run_worker, args=(db_path,), kwargs=worker_options)
+        for _ in range(n_workers)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    return [p.exitcode for p in procs]
+
+
+def print_status(db_path):
+    queue = WorkQueue(db_path)
+    counts = queue.counts()
+    print(f"Cola: {db_path}")
+    print("  " + " | ".join(f"{state}: {n}" for state, n in counts.items()))
+    for job in queue.jobs(RUNNING):
+        age = time.time() - job["heartbeat"]
+        print(f"  ▶ {Path(job['param_file']).parent.name} en {job['worker']} "
+              f"(último latido hace {age:.0f}s)")
+    for job in queue.jobs(FAILED):
+        print(f"  ✗ {Path(job['param_file']).parent.name}: {job['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cola de simulaciones en SQLite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enqueue", help="Encola los params.json de una carpeta")
+    p.add_argument("db")
+    p.add_argument("experiment_root")
+    p.add_argument("--pattern", default="**/params.json")
+    p.add_argument("--predict", action="store_true",
+                   help="Prioridad y timeout según el modelo de tiempos (runtime_model)")
+
+    p = sub.add_parser("worker", help="Ejecuta trabajos de la cola")
+    p.add_argument("db")
+    p.add_argument("--sim", default=str(PROJECT_ROOT / "simulacion"))
+    p.add_argument("--project_root", default=None)
+    p.add_argument("--timeout", type=float, default=6000)
+    p.add_argument("--workers", type=int, default=1, help="Procesos worker locales")
+    p.add_argument("--heartbeat", type=float, default=DEFAULT_HEARTBEAT)
+    p.add_argument("--stale_after", type=float, default=DEFAULT_STALE_AFTER)
+    p.add_argument("--max_attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+
+    p = sub.add_parser("status", help="Estado de la cola")
+    p.add_argument("db")
+
+    p = sub.add_parser("requeue", help="Reencola trabajos fallidos (y de workers muertos)")
+    p.add_argument("db")
+    p.add_argument("--stale_after", type=float, default=DEFAULT_STALE_AFTER)
+
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        model = None
+        if args.predict:
+            from Config.Pipeline.runtime_model import RuntimeModel
+            model = RuntimeModel.from_history()
+        enqueue_experiments(args.db, args.experiment_root, args.pattern, runtime_model=model)
+
+    elif args.command == "worker":
+        options = dict(
+            sim_executable=args.sim,
+            project_root=args.project_root,
+            timeout_seconds=args.timeout,
+            heartbeat_interval=args.heartbeat,
+            stale_after=args.stale_after,
+            max_attempts=args.max_attempts,
+        )
+        if args.workers > 1:
+            run_local_workers(args.db, args.workers, **options)
+        else:
+            run_worker(args.db, **options)
+
+    elif args.command == "status":
+        print_status(args.db)
+
+    elif args.command == "requeue":
+        queue = WorkQueue(args.db)
+        stale = queue.requeue_stale(args.stale_after)
+        failed = queue.reset()
+        print(f"[✓] {stale} trabajos de workers muertos y {failed} fallidos reencolados")
+
+
+if __name__ == "__main__":
+    main()
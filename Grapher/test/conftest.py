@@ -0,0 +1,29 @@
+# conftest.py
+
+import numpy as np
+import pytest
+
+from Analysis.utils.state_files import write_state
+
+
+@pytest.fixture
+def make_run(tmp_path):
+    """
+    Carpeta Output con n_frames frames: frontera fija en las esquinas y
+    fluido que cae, con rho = 1000 + paso (el resto de las columnas en cero).
+    """
+    def _make(n_frames=4):
+        output_dir = tmp_path / "Output"
+        output_dir.mkdir()
+        n_boundary, n_fluid = 4, 9
+        for step in range(n_frames):
+            n = n_boundary + n_fluid
+            data = {"id": np.arange(n)}
+            data["type"] = np.r_[np.ones(n_boundary), np.zeros(n_fluid)]
+            data["posx"] = np.r_[[0.0, 0.1, 0.0, 0.1], np.linspace(0.01, 0.09, n_fluid)]
+            data["posy"] = np.r_[[0.0, 0.0, 0.1, 0.1], np.full(n_fluid, 0.08 - 0.01 * step)]
+            data["vely"] = np.r_[np.zeros(n_boundary), np.full(n_fluid, -0.1 * step)]
+            data["rho"] = np.full(n, 1000.0 + step)
+            write_state(output_dir / f"state_{step:04d}.txt", data)
+        return output_dir
+    return _make
@@ -0,0 +1,34 @@
+# test_gnuplot_colorbar.py
+
+import pytest
+
+from Analysis.utils.run_archive import archive_run
+from Analysis.utils.state_files import STATIC_FILE
+from Grapher.utils.gnuplotColorbar import color_bar_script_gnuplot
+
+
+def test_script_con_rango_de_toda_la_corrida(make_run, tmp_path):
+    output_dir = make_run(n_frames=4)
+    script = tmp_path / "anim.gp"
+    color_bar_script_gnuplot(output_dir, "densidad", nombre_salida=script, workers=1)
+
+    texto = script.read_text()
+    assert "set cbrange [1000.0:1003.0]" in texto
+    # Frontera (filas 0-3) en negro y fluido (4-12) coloreado por la columna 8
+    assert 'every ::0::3 u 2:3 w p ps 1 pt 5 lc rgb "black"' in texto
+    assert "every ::4::12 u 2:3:($8) w p ps 1 pt 7 palette" in texto
+
+
+def test_rechaza_corridas_que_gnuplot_no_puede_leer(make_run, tmp_path):
+    output_dir = make_run(n_frames=2)
+    with pytest.raises(ValueError):
+        color_bar_script_gnuplot(output_dir, "vel", nombre_salida=tmp_path / "a.gp")
+
+    (output_dir / STATIC_FILE).write_text("")
+    with pytest.raises(ValueError):
+        color_bar_script_gnuplot(output_dir, "rho", nombre_salida=tmp_path / "a.gp")
+    (output_dir / STATIC_FILE).unlink()
+
+    archivo = archive_run(output_dir)
+    with pytest.raises(ValueError):
+        color_bar_script_gnuplot(archivo, "rho", nombre_salida=tmp_path / "a.gp")
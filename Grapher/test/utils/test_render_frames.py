@@ -0,0 +1,92 @@
+# test_render_frames.py
+
+import json
+import shutil
+
+import pytest
+from PIL import Image
+
+import Grapher.utils.render_frames as rf
+from Grapher.utils.render_frames import SETTINGS_FILE, assemble_video, render_frames
+
+
+def test_png_por_frame_con_stride(make_run):
+    output_dir = make_run(n_frames=5)
+    pngs = render_frames(output_dir, stride=2, workers=1, dpi=30)
+
+    assert [p.name for p in pngs] == ["state_0000.png", "state_0002.png", "state_0004.png"]
+    assert pngs[0].parent == output_dir.parent / "Output_frames"
+    for png in pngs:
+        with Image.open(png) as im:
+            assert im.size == (6 * 30, 8 * 30)
+    assert not list(pngs[0].parent.glob("*.tmp.png"))
+
+
+def test_rango_de_color_de_toda_la_corrida(make_run):
+    output_dir = make_run(n_frames=4)
+    pngs = render_frames(output_dir, prop="rho", workers=1, dpi=30)
+    assert pngs[0].parent.name == "Output_frames_rho"
+
+    settings = json.loads((pngs[0].parent / SETTINGS_FILE).read_text())
+    assert (settings["vmin"], settings["vmax"]) == (pytest.approx(1000.0), pytest.approx(1003.0))
+
+    settings = json.loads((render_frames(output_dir, prop="rho", vmax=1001.0, workers=1, dpi=30)[0]
+                           .parent / SETTINGS_FILE).read_text())
+    assert (settings["vmin"], settings["vmax"]) == (pytest.approx(1000.0), 1001.0)
+
+
+def test_reanudar_y_redibujar(make_run, monkeypatch):
+    output_dir = make_run(n_frames=4)
+    pngs = render_frames(output_dir, workers=1, dpi=30)
+    pngs[2].unlink()
+
+    dibujados = []
+    original = rf.render_frame
+
+    def _contar(path, png_path, settings):
+        dibujados.append(png_path.name)
+        return original(path, png_path, settings)
+
+    monkeypatch.setattr(rf, "render_frame", _contar)
+    render_frames(output_dir, workers=1, dpi=30)
+    assert dibujados == ["state_0002.png"]
+
+    # Otra configuración invalida los PNG existentes
+    dibujados.clear()
+    render_frames(output_dir, workers=1, dpi=40)
+    assert len(dibujados) == 4
+
+
+def test_varios_procesos(make_run, tmp_path):
+    output_dir = make_run(n_frames=6)
+    uno = render_frames(output_dir, tmp_path / "uno", workers=1, dpi=30)
+    dos = render_frames(output_dir, tmp_path / "dos", workers=2, dpi=30)
+    assert [p.name for p in uno] == [p.name for p in dos]
+    for a, b in zip(uno, dos):
+        with Image.open(a) as ia, Image.open(b) as ib:
+            assert ia.tobytes() == ib.tobytes()
+
+
+def test_gif(make_run, tmp_path):
+    output_dir = make_run(n_frames=3)
+    gif = tmp_path / "corrida.gif"
+    render_frames(output_dir, workers=1, dpi=30, video=gif, fps=10)
+    with Image.open(gif) as im:
+        assert im.n_frames == 3
+
+
+def test_sin_ffmpeg_falla_antes_de_renderizar(make_run, monkeypatch):
+    output_dir = make_run(n_frames=2)
+    monkeypatch.setattr(rf.shutil, "which", lambda name: None)
+    with pytest.raises(RuntimeError):
+        render_frames(output_dir, workers=1, video=output_dir.parent / "corrida.mp4")
+    assert not (output_dir.parent / "Output_frames").exists()
+    with pytest.raises(ValueError):
+        assemble_video([], output_dir.parent / "corrida.gif")
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg no está instalado")
+def test_mp4(make_run, tmp_path):
+    output_dir = make_run(n_frames=3)
+    mp4 = render_frames(output_dir, workers=1, dpi=30, video=tmp_path / "corrida.mp4")
+    assert (tmp_path / "corrida.mp4").stat().st_size > 0 and len(mp4) == 3
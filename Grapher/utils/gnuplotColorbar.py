@@ -1,5 +1,13 @@
-import os
-import glob
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Analysis.utils.column_ranges import column_range
+from Analysis.utils.run_archive import is_archive
+from Analysis.utils.state_files import is_dedup, read_state, state_files
 
 def color_bar_script_gnuplot(
     carpeta,
@@ -8,11 +16,25 @@ def color_bar_script_gnuplot(
     vmax=None,
     lim=3000,
     retardo=0.001,
-    nombre_salida="plot_animacion.gp"
+    nombre_salida="plot_animacion.gp",
+    percentiles=None,
+    workers=None
 ):
     """
     Genera un script .gp con paleta tipo 'turbo' válida para gnuplot.
     La paleta se genera con N stops en valores absolutos entre cmin y cmax.
+
+    Si vmin/vmax no se pasan, el rango se calcula sobre todos los frames
+    con Analysis.utils.column_ranges (solo la columna pedida, en paralelo y
+    con caché '<carpeta>_ranges.json': la segunda vez es inmediato). Con
+    percentiles=(1, 99) se usa el rango entre esos percentiles en lugar
+    de min/max, para que unas pocas partículas extremas no aplasten la
+    paleta.
+
+    El script lee los state_XXXX.txt directamente con gnuplot, así que la
+    corrida debe estar en texto plano: se rechazan los archivos .sphar
+    (extraerlos antes con run_archive) y las carpetas en modo 'dedup'
+    (sus frames no incluyen las partículas estáticas).
     """
 
     # -------------------------
@@ -40,44 +62,28 @@ def color_bar_script_gnuplot(
         raise ValueError(f"Propiedad no reconocida: {variable_color}")
 
     col_gp = columnas[variable_color]
+    variable_rango = {"densidad": "rho", "presion": "pressure"}.get(variable_color, variable_color)
 
     # -------------------------
     # 2) Listar archivos y detectar rango (si no definido)
     # -------------------------
-    archivos = sorted(glob.glob(os.path.join(carpeta, "state_*.txt")))
+    if is_archive(carpeta) or is_dedup(carpeta):
+        raise ValueError(
+            f"{carpeta} no es una carpeta de state_XXXX.txt completos (archivo .sphar o "
+            "modo dedup); gnuplot necesita los frames en texto plano."
+        )
+
+    archivos = state_files(carpeta)
     if not archivos:
         raise FileNotFoundError("No se encontraron archivos state_XXXX.txt")
 
-    # Si vmin/vmax se pasan, no hace falta leer todo
+    # Si vmin/vmax se pasan, no hace falta leer nada
+    cmin, cmax = vmin, vmax
     if vmin is None or vmax is None:
-        valores_min = None
-        valores_max = None
-        # Lee sólo un subconjunto para acelerar si hay muchos archivos:
-        # aquí muestreamos cada k-ésimo archivo hasta 300 archivos muestreados
-        MAX_SAMPLE_FILES = 300
-        step = max(1, len(archivos) // MAX_SAMPLE_FILES)
-        sample_files = archivos[::step]
-
-        for arch in sample_files:
-            with open(arch) as f:
-                for line in f.readlines()[1:]:
-                    if not line.strip():
-                        continue
-                    cols = line.split()
-                    try:
-                        val = float(cols[col_gp - 1])
-                    except Exception:
-                        continue
-                    if valores_min is None or val < valores_min:
-                        valores_min = val
-                    if valores_max is None or val > valores_max:
-                        valores_max = val
-
-        cmin = vmin if vmin is not None else valores_min
-        cmax = vmax if vmax is not None else valores_max
-    else:
-        cmin = vmin
-        cmax = vmax
+        rango = column_range(carpeta, variable_rango, percentiles=percentiles, workers=workers)
+        bajo, alto = ("p_low", "p_high") if percentiles is not None else ("min", "max")
+        cmin = vmin if vmin is not None else rango[bajo]
+        cmax = vmax if vmax is not None else rango[alto]
 
     if cmin is None or cmax is None:
         raise RuntimeError("No se pudo determinar cmin/cmax. Pasa vmin/vmax o asegúrate de tener archivos legibles.")
@@ -110,11 +116,7 @@ def color_bar_script_gnuplot(
     # -------------------------
     # 4) Leer primer archivo para detectar grupos por tipo
     # -------------------------
-    with open(archivos[0], "r") as f_in:
-        lineas = f_in.readlines()
-
-    datos = [linea.strip().split() for linea in lineas[1:] if linea.strip()]
-    tipos = [int(linea[-1]) for linea in datos]
+    tipos = read_state(archivos[0], ["type"])["type"].tolist()
 
     grupos = []
     inicio = 0
@@ -183,6 +185,6 @@ do for [i=0:lim] {{
         f_out.write(contenido)
 
     print("\nScript Gnuplot generado correctamente:", nombre_salida)
-    print(f"\nVariable usada para color: {variable_color} (columna ${col_gp})")
+    print(f"\nVariable usada para color: {variable_color} ({expr_color})")
     print(f"\nRango usado para colorbar: [{cmin}, {cmax}]")
     print("\nPaleta: TURBO-like (stops generados en valores absolutos)")
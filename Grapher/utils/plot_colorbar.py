@@ -1,8 +1,15 @@
-import pandas as pd
+import sys
+from pathlib import Path
 import matplotlib.pyplot as plt
 from matplotlib.ticker import ScalarFormatter
 import matplotlib.colors as colors
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Analysis.utils.state_files import read_state_df
+
 def plot_ics_color(
         archivo_txt,
         prop="pressure",
@@ -17,7 +24,7 @@ def plot_ics_color(
         raise ValueError("Debes definir vmin y vmax manualmente.")
 
     # --- Cargar datos ---
-    df = pd.read_csv(archivo_txt, sep=" ")
+    df = read_state_df(archivo_txt)
 
     df_fluid    = df[df["type"] == 0]
     df_boundary = df[df["type"] == 1]
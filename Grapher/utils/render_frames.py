@@ -0,0 +1,294 @@
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib.colors as colors
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import ScalarFormatter
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from Analysis.utils.column_ranges import DERIVED, column_range, variable_values
+from Analysis.utils.parallel_frames import default_workers
+from Analysis.utils.state_files import read_state, state_files, step_from_name
+
+SETTINGS_FILE = "render.json"
+
+# Estilo de plot_ics (sin color) y plot_ics_color (con prop)
+TYPE_STYLE = {
+    1: ("black", "Frontera (type=1)"),
+    0: ("blue", "Fluido (type=0)"),
+    -1: ("red", "Agujero (type=-1)"),
+}
+COLOR_STYLE = {1: "black", -1: "gray"}
+UNDER_COLOR = "#4B0082"   # morado
+OVER_COLOR = "#800000"    # vinotinto
+
+
+def _sci_axes(ax):
+    # Notación científica, como en plot_ics
+    for axis, eje in ((ax.xaxis, "x"), (ax.yaxis, "y")):
+        axis.set_major_formatter(ScalarFormatter(useMathText=True))
+        ax.ticklabel_format(style="sci", axis=eje, scilimits=(0, 0))
+
+
+def render_frame(path, png_path, settings):
+    """
+    Dibuja un frame en PNG sin pantalla (canvas Agg, sin pyplot: no cambia
+    el backend de quien lo llama). settings es el dict de render_frames.
+    """
+    prop = settings["prop"]
+    columns = ["posx", "posy", "type"]
+    if prop is not None:
+        columns += [c for c in DERIVED.get(prop, [prop]) if c not in columns]
+    data = read_state(path, columns)
+
+    fig = Figure(figsize=settings["figsize"], constrained_layout=True)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    s = settings["particle_size"]
+
+    if prop is None:
+        for tipo, (color, label) in TYPE_STYLE.items():
+            mask = data["type"] == tipo
+            ax.scatter(data["posx"][mask], data["posy"][mask], s=s, c=color, label=label)
+    else:
+        for tipo, color in COLOR_STYLE.items():
+            mask = data["type"] == tipo
+            ax.scatter(data["posx"][mask], data["posy"][mask], s=s, color=color)
+        fluid = data["type"] == 0
+        cmap = colormaps[settings["cmap"]].copy()
+        cmap.set_under(UNDER_COLOR)
+        cmap.set_over(OVER_COLOR)
+        sc = ax.scatter(data["posx"][fluid], data["posy"][fluid], s=s,
+                        c=variable_values(data, prop)[fluid], cmap=cmap,
+                        norm=colors.Normalize(vmin=settings["vmin"], vmax=settings["vmax"], clip=False))
+        fig.colorbar(sc, ax=ax, orientation="vertical", extend="both").set_label(prop)
+
+    step = step_from_name(path)
+    titulo = f"paso = {step:04d}"
+    if settings["dt"] is not None:
+        titulo += f" - tiempo = {step * settings['dt']:.5f}"
+    ax.set_title(titulo)
+    ax.set_xlabel("x [m]")
+    ax.set_ylabel("y [m]")
+    ax.grid(True)
+    if prop is None:
+        ax.legend(loc="upper right", markerscale=2)
+
+    # Límites fijos para todos los frames: el video no "salta"
+    ax.set_xlim(settings["xlim"])
+    ax.set_ylim(settings["ylim"])
+    ax.set_aspect("equal", adjustable="box")
+    _sci_axes(ax)
+
+    # Escritura atómica: un PNG a medias nunca cuenta como hecho al reanudar
+    tmp_path = png_path.with_name(png_path.stem + ".tmp.png")
+    fig.savefig(tmp_path, dpi=settings["dpi"])
+    os.replace(tmp_path, png_path)
+    return png_path
+
+
+def _render_chunk(jobs, settings):
+    return [render_frame(path, png, settings) for path, png in jobs]
+
+
+def _limits(path, margin=0.02):
+    data = read_state(path, ["posx", "posy"])
+    limits = []
+    for c in ("posx", "posy"):
+        lo, hi = float(data[c].min()), float(data[c].max())
+        pad = (hi - lo) * margin or 1e-6
+        limits.append([lo - pad, hi + pad])
+    return limits
+
+
+def render_frames(output_dir, dest_dir=None, prop=None, stride=1, workers=None,
+                  resume=True, vmin=None, vmax=None, percentiles=None, cmap="turbo",
+                  xlim=None, ylim=None, particle_size=6, figsize=None, dpi=100,
+                  dt=None, video=None, fps=30):
+    """
+    Renderiza los frames de una corrida a PNG en un pool de procesos y,
+    opcionalmente, arma un video (.mp4 con ffmpeg) o un GIF.
+
+    Parámetros
+    ----------
+    output_dir : Path
+        Carpeta 'Output' con los state_*.txt (o archivo .sphar).
+    dest_dir : Path | None
+        Carpeta de los PNG. Por defecto '<Output>_frames' (o
+        '<Output>_frames_<prop>' si se colorea por prop).
+    prop : str | None
+        None = estilo de plot_ics (color por tipo); una columna o 'vel'
+        = fluido coloreado como en plot_ics_color.
+    stride : int
+        Renderizar uno de cada stride frames.
+    workers : int | None
+        Procesos (por defecto todas las CPUs disponibles).
+    resume : bool
+        Si True no se vuelven a dibujar los PNG que ya existen con la
+        misma configuración (render.json); sirve para seguir tras un corte.
+    vmin, vmax, percentiles :
+        Rango de color. Si falta, se toma de column_range (todos los
+        frames, con caché), entre percentiles si se indican (p.ej. (1, 99)).
+    xlim, ylim : list | None
+        Límites de los ejes. Por defecto, la caja del primer frame.
+    figsize : tuple | None
+        Por defecto (6, 8) como plot_ics, o (7, 6) con colorbar.
+    dt : float | None
+        Paso de tiempo, para mostrar el tiempo en el título.
+    video : Path | None
+        Archivo .mp4 o .gif a generar con los PNG.
+    fps : int
+        Cuadros por segundo del video.
+
+    Returns
+    -------
+    list[Path] : PNG en orden de paso.
+    """
+    output_dir = Path(output_dir)
+    # Fallar antes de renderizar si luego no se podrá armar el video
+    if video is not None and Path(video).suffix.lower() != ".gif" and shutil.which("ffmpeg") is None:
+        raise RuntimeError("[ERROR] ffmpeg no está instalado; usa un archivo .gif o instala ffmpeg.")
+
+    archivos = state_files(output_dir)[::max(1, int(stride))]
+    if not archivos:
+        raise FileNotFoundError(f"No se encontraron archivos state_*.txt en {output_dir}")
+
+    if dest_dir is None:
+        suffix = "_frames" if prop is None else f"_frames_{prop}"
+        dest_dir = output_dir.parent / f"{output_dir.name}{suffix}"
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    if prop is not None and (vmin is None or vmax is None):
+        rango = column_range(output_dir, prop, percentiles=percentiles, workers=workers)
+        bajo, alto = ("p_low", "p_high") if percentiles is not None else ("min", "max")
+        vmin = rango[bajo] if vmin is None else vmin
+        vmax = rango[alto] if vmax is None else vmax
+
+    if xlim is None or ylim is None:
+        x0, y0 = _limits(archivos[0])
+        xlim = x0 if xlim is None else xlim
+        ylim = y0 if ylim is None else ylim
+
+    if figsize is None:
+        figsize = (6, 8) if prop is None else (7, 6)
+
+    settings = {
+        "prop": prop, "vmin": vmin, "vmax": vmax, "cmap": cmap,
+        "xlim": list(xlim), "ylim": list(ylim), "particle_size": particle_size,
+        "figsize": list(figsize), "dpi": dpi, "dt": dt,
+    }
+
+    # Con otra configuración los PNG existentes no sirven
+    settings_path = dest_dir / SETTINGS_FILE
+    if resume and settings_path.exists():
+        with open(settings_path) as f:
+            if json.load(f) != settings:
+                print("[INFO] Configuración distinta a la de los PNG existentes: se redibuja todo")
+                resume = False
+    with open(settings_path, "w") as f:
+        json.dump(settings, f, indent=2)
+
+    pngs = [dest_dir / f"{Path(a.name).stem}.png" for a in archivos]
+    jobs = [(a, png) for a, png in zip(archivos, pngs)
+            if not (resume and png.exists() and png.stat().st_size > 0)]
+    print(f"[INFO] {len(pngs)} frames (stride {stride}); "
+          f"{len(pngs) - len(jobs)} ya renderizados, {len(jobs)} pendientes")
+
+    if jobs:
+        workers = default_workers() if workers is None else max(1, int(workers))
+        chunksize = max(1, math.ceil(len(jobs) / (workers * 4)))
+        chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+        if workers == 1 or len(chunks) == 1:
+            for chunk in chunks:
+                _render_chunk(chunk, settings)
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                list(pool.map(_render_chunk, chunks, [settings] * len(chunks)))
+    print(f"[✓] PNG en {dest_dir}")
+
+    if video is not None:
+        assemble_video(pngs, video, fps=fps)
+    return pngs
+
+
+def assemble_video(pngs, out_path, fps=30):
+    """
+    Une los PNG (en el orden dado) en un .gif (Pillow) o en un video con
+    ffmpeg (.mp4 u otro formato que ffmpeg reconozca por la extensión).
+    """
+    out_path = Path(out_path)
+    pngs = [Path(p) for p in pngs]
+    if not pngs:
+        raise ValueError("No hay PNG para armar el video.")
+
+    if out_path.suffix.lower() == ".gif":
+        from PIL import Image
+
+        first = Image.open(pngs[0])
+        rest = (Image.open(p) for p in pngs[1:])
+        first.save(out_path, save_all=True, append_images=rest,
+                   duration=max(1, round(1000 / fps)), loop=0)
+        print(f"[✓] GIF generado: {out_path}")
+        return out_path
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("[ERROR] ffmpeg no está instalado; usa un archivo .gif o instala ffmpeg.")
+
+    # Lista explícita para el demuxer concat: respeta stride y orden
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as lista:
+        for p in pngs:
+            lista.write(f"file '{p.resolve()}'\nduration {1 / fps}\n")
+        lista.write(f"file '{pngs[-1].resolve()}'\n")
+    try:
+        subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", lista.name,
+             "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2", "-r", str(fps),
+             "-c:v", "libx264", "-pix_fmt", "yuv420p", str(out_path)],
+            check=True
+        )
+    finally:
+        os.unlink(lista.name)
+    print(f"[✓] Video generado: {out_path}")
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Renderizado de frames a PNG/MP4/GIF sin pantalla")
+    parser.add_argument("output_dir", help="Carpeta Output de la simulación (o archivo .sphar)")
+    parser.add_argument("--dest", default=None, help="Carpeta de los PNG")
+    parser.add_argument("--prop", default=None, help="Variable de color (rho, pressure, vel, ...)")
+    parser.add_argument("--stride", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no_resume", action="store_true", help="Redibujar todos los PNG")
+    parser.add_argument("--vmin", type=float, default=None)
+    parser.add_argument("--vmax", type=float, default=None)
+    parser.add_argument("--percentiles", type=float, nargs=2, default=None, metavar=("LOW", "HIGH"))
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--dt", type=float, default=None)
+    parser.add_argument("--video", default=None, help="Archivo .mp4 o .gif de salida")
+    parser.add_argument("--fps", type=int, default=30)
+    args = parser.parse_args()
+
+    render_frames(args.output_dir, args.dest, prop=args.prop, stride=args.stride,
+                  workers=args.workers, resume=not args.no_resume, vmin=args.vmin,
+                  vmax=args.vmax, percentiles=args.percentiles, dpi=args.dpi, dt=args.dt,
+                  video=args.video, fps=args.fps)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ sys.path.insert(0, str(SRC_DIR))
 
 # --- Importar exportador principal ---
 from src.core.export import export_all_particles
+from src.core.preflight import KAPPA, MAX_NEI, DEFAULT_MIN_NEI, preflight_ics, print_preflight
 
 
 def run_tests():
@@ -33,8 +34,8 @@ def main():
 
     parser.add_argument(
         "command",
-        choices=["export", "test"],
-        help="Acción a ejecutar: export o test"
+        choices=["export", "test", "preflight"],
+        help="Acción a ejecutar: export, test o preflight"
     )
 
     # --- Parámetros específicos del comando 'export' ---
@@ -69,6 +70,37 @@ def main():
         help="Nombre del archivo JSON de resumen (por defecto: initial_state_summary.json)"
     )
 
+    parser.add_argument(
+        "--format",
+        choices=["txt", "bin"],
+        default="txt",
+        help="Formato del archivo de partículas: txt (texto) o bin (binario)"
+    )
+
+    parser.add_argument(
+        "--ordering",
+        choices=["none", "morton", "hilbert"],
+        default="none",
+        help="Ordenamiento espacial de las partículas (curva de Morton o Hilbert)"
+    )
+
+    # --- Parámetros específicos del comando 'preflight' ---
+    parser.add_argument(
+        "--ics",
+        type=str,
+        required=False,
+        help="Archivo ICS a revisar (preflight)"
+    )
+    parser.add_argument(
+        "--h_factor",
+        type=float,
+        default=None,
+        help="h = h_factor·dx para todas las partículas (por defecto, la h del archivo)"
+    )
+    parser.add_argument("--kappa", type=float, default=KAPPA)
+    parser.add_argument("--max_nei", type=int, default=MAX_NEI)
+    parser.add_argument("--min_nei", type=int, default=DEFAULT_MIN_NEI)
+
     args = parser.parse_args()
 
     # -------------------------------------------------------------
@@ -91,6 +123,8 @@ def main():
             output_dir=args.output_dir,
             output_filename=args.output_file,
             output_logname=args.output_logname,
+            output_format=args.format,
+            ordering=args.ordering,
         )
 
         print(f"\n[✓] Export completado con éxito.\n"
@@ -102,6 +136,22 @@ def main():
     elif args.command == "test":
         sys.exit(run_tests())
 
+    # -------------------------------------------------------------
+    # 3️⃣ Comando: preflight
+    elif args.command == "preflight":
+        if not args.ics:
+            print(
+                "[ERROR] Debes especificar el archivo ICS.\n"
+                "Uso esperado:\n"
+                "  python main.py preflight --ics data/output/initial_state.txt"
+            )
+            sys.exit(1)
+
+        report = preflight_ics(args.ics, args.h_factor, args.kappa,
+                               args.max_nei, args.min_nei)
+        print_preflight(report)
+        sys.exit(0 if report["ok"] else 1)
+
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,10 @@
 import json
+import numpy as np
 from pathlib import Path
 from src.domains.quadrilateral import Quadrilateral
 from src.domains.composite import CompositeDomain
 from src.boundaries.particleizer import BoundaryParticleizer
+from src.core.particles import concat_particles
 
 class BoundaryBuilder:
     def __init__(self, param_file: Path | str):
@@ -80,9 +82,9 @@ class BoundaryBuilder:
               dx: float = None,
               dy: float = None,
               ref_mass: float = None,
-              ref_rho: float = None) -> list[dict]:
+              ref_rho: float = None) -> np.ndarray:
         """
-        Construye la geometría de frontera y genera la lista de partículas SPH.
+        Construye la geometría de frontera y genera el arreglo de partículas SPH.
         Si se proporciona 'reference_mass', todas las partículas de frontera
         usarán ese mismo valor de masa (útil para igualarlas con las del fluido).
         """
@@ -124,7 +126,7 @@ class BoundaryBuilder:
                     mass=mass,
                     rho=rho0,
                 )
-                all_particles.extend(particles_normal)
+                all_particles.append(particles_normal)
                 
             # Agujeros (si existen)
                 if hasattr(domain, "_segments_holes"):
@@ -139,7 +141,7 @@ class BoundaryBuilder:
                             mass=mass,
                             rho=rho0,
                         )
-                        all_particles.extend(particles_hole)
+                        all_particles.append(particles_hole)
             
             # Otros tipos de dominios (líneas, conexiones, etc.)
             else:
@@ -153,7 +155,7 @@ class BoundaryBuilder:
                     mass=mass,
                     rho=rho0,
                 )
-                all_particles.extend(particles)
+                all_particles.append(particles)
                 
         extra_segments = comp.segments()
         if extra_segments:
@@ -166,6 +168,6 @@ class BoundaryBuilder:
                 mass=mass,
                 rho=rho0,
             )
-            all_particles.extend(extra_particles)
-        
-        return all_particles
\ No newline at end of file
+            all_particles.append(extra_particles)
+
+        return concat_particles(all_particles)
\ No newline at end of file
@@ -1,6 +1,8 @@
 # src/boundaries/particleizer.py
-from typing import List, Dict, Any, Tuple
+import numpy as np
+from typing import List, Tuple
 from src.core.base_particleizer import BaseParticleizer
+from src.core.particles import make_particles
 
 Point = Tuple[float, float]
 Segment = List[Point]
@@ -18,29 +20,18 @@ class BoundaryParticleizer(BaseParticleizer):
              dx: float = 0.01,
              dy: float = 0.01,
              mass: float = 1.0,
-             rho: float = 1000.0) -> List[Dict[str, Any]]:
+             rho: float = 1000.0) -> np.ndarray:
 
-        seen: set[Tuple[float, float]] = set()
-        particles: List[Dict[str, Any]] = []
         mass = mass or (self.rho0 * dx * dy)
 
-        pid = 0
-        for seg in segments:
-            for x, y in seg:
-                key = (round(x, 8), round(y, 8))
-                if key in seen:
-                    continue
-                seen.add(key)
-                particles.append({
-                    "id": pid,
-                    "pos": [x, y],
-                    "vel": [0.0, 0.0],
-                    "accel": [0.0, 0.0],
-                    "rho": rho,
-                    "mass": mass,
-                    "pressure": 0.0,
-                    "h": h,
-                    "type": ptype
-                })
-                pid += 1
-        return particles
+        segs = [np.asarray(seg, dtype=float).reshape(-1, 2) for seg in segments]
+        points = np.concatenate(segs) if segs else np.empty((0, 2))
+
+        # Puntos compartidos entre segmentos (vértices) se conservan una sola
+        # vez, en el orden de su primera aparición
+        if len(points):
+            keys = np.round(points, 8)
+            _, first = np.unique(keys, axis=0, return_index=True)
+            points = points[np.sort(first)]
+
+        return make_particles(points, ptype=ptype, h=h, mass=mass, rho=rho)
@@ -2,9 +2,17 @@
 
 from pathlib import Path
 import json
+import numpy as np
 from datetime import datetime
 from src.fluid.builder import FluidBuilder
 from src.boundaries.builder import BoundaryBuilder
+from src.core.particles import empty_particles, concat_particles, bounds, to_columns
+from src.core.ics_writer import write_ics
+from src.core.ordering import spatial_order
+
+# Versión del generador: incrementarla cuando un cambio altere las partículas
+# generadas para los mismos parámetros (invalida cachés de ICS).
+GENERATOR_VERSION = 1
 
 
 def export_all_particles(
@@ -15,6 +23,8 @@ def export_all_particles(
     output_logname: str = "initial_state_summary.json",
     include_boundary: bool = True,
     include_fluid: bool = True,
+    output_format: str = "txt",
+    ordering: str = "none",
 ):
     """
     Genera y exporta todas las partículas (fluido + frontera) en formato unificado
@@ -28,6 +38,15 @@ def export_all_particles(
         output_logname: nombre del archivo resumen (JSON).
         include_boundary: si True, incluye partículas de frontera.
         include_fluid: si True, incluye partículas de fluido.
+        output_format: "txt" (texto '%.10f') o "bin" (binario que el solver
+            también sabe leer, ver ics_writer).
+        ordering: "none", "morton" o "hilbert". Reordena las partículas sobre
+            una curva de llenado del espacio (frontera y fluido por separado)
+            para mejorar la localidad en memoria de los bucles del solver.
+
+    Returns:
+        np.ndarray: arreglo estructurado (PARTICLE_DTYPE) con todas las
+        partículas exportadas, frontera primero.
     """
 
     # --- Verificación y creación del directorio de salida ---
@@ -36,9 +55,8 @@ def export_all_particles(
     output_path = output_dir / output_filename
     summary_path = output_dir / output_logname
 
-    all_particles = []
-    fluid_particles = []
-    boundary_particles = []
+    fluid_particles = empty_particles()
+    boundary_particles = empty_particles()
 
     # ---------------------------------------------------------
     # 1. Construir fluido (primero, para obtener masa base)
@@ -46,14 +64,13 @@ def export_all_particles(
         print("[INFO] Generando partículas de fluido...")
         f_builder = FluidBuilder(config_path=fluid_param_file)
         fluid_particles = f_builder.build()
-        all_particles.extend(fluid_particles)
         print(f"[✓] Fluido: {len(fluid_particles)} partículas")
 
     # Obtener masa y parámetros de referencia del fluido
-    if fluid_particles:
-        fluid_mass = fluid_particles[0]["mass"]
-        fluid_rho = fluid_particles[0]["rho"]
-        fluid_h = fluid_particles[0]["h"]
+    if len(fluid_particles):
+        fluid_mass = float(fluid_particles[0]["mass"])
+        fluid_rho = float(fluid_particles[0]["rho"])
+        fluid_h = float(fluid_particles[0]["h"])
     else:
         fluid_mass = None
         fluid_rho = 1000.0
@@ -75,60 +92,29 @@ def export_all_particles(
             ref_rho=fluid_rho
         )
 
-        all_particles = boundary_particles + fluid_particles
         print(f"[✓] Frontera: {len(boundary_particles)} partículas")
 
     # ---------------------------------------------------------
-    # 3. Reasignar IDs globales
-    for i, p in enumerate(all_particles):
-        p["id"] = i
+    # 3. Unir (frontera primero) y reasignar IDs globales
+    all_particles = concat_particles([boundary_particles, fluid_particles])
 
-    # ---------------------------------------------------------
-    # 4. Exportar archivo principal de partículas
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(
-            "id posx posy velx vely accelx accely "
-            "rho mass pressure h internalE type\n"
-        )
-        for p in all_particles:
-            x, y = p["pos"]
-            vx, vy = p["vel"]
-            ax, ay = p["accel"]
-            internalE = 0.0
-            f.write(
-                f"{p['id']} "
-                f"{x:.10f} {y:.10f} "
-                f"{vx:.10f} {vy:.10f} "
-                f"{ax:.10f} {ay:.10f} "
-                f"{p['rho']:.10f} "
-                f"{p['mass']:.10f} "
-                f"{p['pressure']:.10f} "
-                f"{p['h']:.10f} "
-                f"{internalE:.10f} "
-                f"{p['type']}\n"
-            )
+    # Ordenamiento espacial opcional; perm[i] = posición original (orden de
+    # generación) de la partícula con nuevo ID i
+    perm = spatial_order(all_particles, ordering)
+    all_particles = all_particles[perm]
+    all_particles["id"] = np.arange(len(all_particles))
 
     # ---------------------------------------------------------
-    # 5. Calcular dimensiones del dominio total
-    xs_all = [p["pos"][0] for p in all_particles]
-    ys_all = [p["pos"][1] for p in all_particles]
-    xmin_all, xmax_all = min(xs_all), max(xs_all)
-    ymin_all, ymax_all = min(ys_all), max(ys_all)
-    Lx_all, Ly_all = xmax_all - xmin_all, ymax_all - ymin_all
+    # 4. Exportar archivo principal de partículas
+    write_ics(output_path, to_columns(all_particles), fmt=output_format)
 
     # ---------------------------------------------------------
-    # 6. Calcular dimensiones solo del fluido
-    if fluid_particles:
-        xs_f = [p["pos"][0] for p in fluid_particles]
-        ys_f = [p["pos"][1] for p in fluid_particles]
-        xmin_f, xmax_f = min(xs_f), max(xs_f)
-        ymin_f, ymax_f = min(ys_f), max(ys_f)
-        Lx_f, Ly_f = xmax_f - xmin_f, ymax_f - ymin_f
-    else:
-        xmin_f = xmax_f = ymin_f = ymax_f = Lx_f = Ly_f = None
+    # 5. Calcular dimensiones del dominio total y solo del fluido
+    bounds_total = bounds(all_particles)
+    bounds_fluid = bounds(fluid_particles)
 
     # ---------------------------------------------------------
-    # 7. Crear resumen JSON
+    # 6. Crear resumen JSON
     summary_data = {
         "timestamp": datetime.now().isoformat(timespec="seconds"),
         "output_file": str(output_path),
@@ -136,29 +122,20 @@ def export_all_particles(
         "nFluid": len(fluid_particles),
         "nBoundaries": len(boundary_particles),
 
-        "bounds_total": {
-            "Lx": Lx_all,
-            "Ly": Ly_all,
-            "xmin": xmin_all,
-            "xmax": xmax_all,
-            "ymin": ymin_all,
-            "ymax": ymax_all,
-        },
-
-        "bounds_fluid": {
-            "Lx": Lx_f,
-            "Ly": Ly_f,
-            "xmin": xmin_f,
-            "xmax": xmax_f,
-            "ymin": ymin_f,
-            "ymax": ymax_f,
-        },
+        "bounds_total": bounds_total,
+        "bounds_fluid": bounds_fluid,
 
         "fluid_mass": fluid_mass,
         "fluid_density": fluid_rho,
         "h": fluid_h,
         "include_fluid": include_fluid,
         "include_boundary": include_boundary,
+        "generator_version": GENERATOR_VERSION,
+        "output_format": output_format,
+        "ordering": {
+            "method": ordering,
+            "permutation": perm.tolist() if ordering != "none" else None,
+        },
         "fluid_param_file": str(fluid_param_file),
         "boundary_param_file": str(boundary_param_file),
     }
@@ -0,0 +1,179 @@
+# src/core/ics_writer.py
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Mapping
+
+import numpy as np
+
+# Columnas del archivo de condiciones iniciales, en el orden que lee
+# readParticlesFromFile (AlgoritmSPH/src/io/readParticles.cpp)
+ICS_COLUMNS = [
+    "id", "posx", "posy", "velx", "vely", "accelx", "accely",
+    "rho", "mass", "pressure", "h", "internalE", "type"
+]
+ICS_HEADER = " ".join(ICS_COLUMNS) + "\n"
+INT_COLUMNS = ("id", "type")
+
+# Formato binario: MAGIC, uint64 n, uint64 ncols (=13) y luego n filas de
+# 13 float64, todo little-endian y por filas. Los valores se redondean a los
+# mismos 10 decimales del texto, así el solver parte del mismo estado con
+# cualquiera de los dos formatos.
+BINARY_MAGIC = b"SPHBIN01"
+_BINARY_HEADER = struct.Struct("<QQ")
+
+ICS_FORMATS = ("txt", "bin")
+
+# Filas formateadas por bloque: acota la memoria del texto en construcción
+DEFAULT_CHUNK = 65536
+
+_ROW_FMT = " ".join("%d" if c in INT_COLUMNS else "%.10f" for c in ICS_COLUMNS) + "\n"
+
+
+def column_dtypes() -> Dict[str, type]:
+    """dtype de cada columna al leer un ICS de texto (p.ej. con pandas)."""
+    return {c: (np.int64 if c in INT_COLUMNS else np.float64) for c in ICS_COLUMNS}
+
+
+def _chunks(columns, chunk_size):
+    """
+    Normaliza la entrada a una secuencia de bloques {columna: arreglo}.
+    Acepta un mapping de columnas (dict, DataFrame) o un iterable de ellos.
+    """
+    if isinstance(columns, Mapping) or hasattr(columns, "columns"):
+        arrays = {c: np.asarray(columns[c]) for c in ICS_COLUMNS}
+        for start in range(0, len(arrays["id"]), chunk_size):
+            yield {c: a[start:start + chunk_size] for c, a in arrays.items()}
+    else:
+        for block in columns:
+            yield from _chunks(block, chunk_size)
+
+
+def _block_values(block, c):
+    values = np.asarray(block[c])
+    if c in INT_COLUMNS:
+        return values.astype(np.int64)
+    return values.astype(np.float64)
+
+
+def text_precision(values) -> np.ndarray:
+    """
+    Valores tal como quedan tras escribirlos con '%.10f' y volver a leerlos.
+
+    Se pasa por el mismo texto en lugar de np.round(x, 10): este escala por
+    1e10 y puede diferir en el último bit del valor decimal más cercano, que
+    es lo que obtiene el solver al parsear el ICS de texto.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return np.char.mod("%.10f", values).astype(np.float64)
+
+
+def format_rows(block: Mapping) -> str:
+    """
+    Formatea un bloque de partículas como texto ICS (sin cabecera).
+
+    Usa una sola operación '%' sobre todo el bloque; el resultado es
+    idéntico byte a byte al f-string '{x:.10f}' por partícula.
+    """
+    n = len(block["id"])
+    if n == 0:
+        return ""
+    table = np.empty((n, len(ICS_COLUMNS)), dtype=object)
+    for j, c in enumerate(ICS_COLUMNS):
+        table[:, j] = _block_values(block, c).tolist()
+    return (_ROW_FMT * n) % tuple(table.ravel().tolist())
+
+
+def write_ics(path: str | Path,
+              columns: Mapping | Iterable[Mapping],
+              fmt: str = "txt",
+              chunk_size: int = DEFAULT_CHUNK) -> int:
+    """
+    Escribe un archivo de condiciones iniciales por bloques.
+
+    Parámetros
+    ----------
+    path : str | Path
+        Archivo de salida.
+    columns : Mapping | Iterable[Mapping]
+        Columnas ICS_COLUMNS como {nombre: arreglo} (o DataFrame), o un
+        iterable de bloques con esa forma (p.ej. pd.read_csv(chunksize=...)),
+        que se escriben sin cargar todo el conjunto en memoria.
+    fmt : str
+        "txt" (13 columnas con cabecera, '%.10f') o "bin" (BINARY_MAGIC,
+        con los mismos valores que el texto).
+    chunk_size : int
+        Filas formateadas por bloque.
+
+    Returns
+    -------
+    int
+        Número de partículas escritas.
+    """
+    if fmt not in ICS_FORMATS:
+        raise ValueError(f"Formato desconocido: {fmt}. Opciones válidas: {ICS_FORMATS}")
+
+    n_total = 0
+    if fmt == "txt":
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(ICS_HEADER)
+            for block in _chunks(columns, chunk_size):
+                f.write(format_rows(block))
+                n_total += len(block["id"])
+        return n_total
+
+    with open(path, "wb") as f:
+        f.write(BINARY_MAGIC)
+        f.write(_BINARY_HEADER.pack(0, len(ICS_COLUMNS)))
+        for block in _chunks(columns, chunk_size):
+            table = np.column_stack([
+                _block_values(block, c) if c in INT_COLUMNS
+                else text_precision(_block_values(block, c))
+                for c in ICS_COLUMNS
+            ])
+            f.write(table.astype("<f8", copy=False).tobytes())
+            n_total += len(table)
+        # El total se conoce al final (la entrada puede ser un iterable)
+        f.seek(len(BINARY_MAGIC))
+        f.write(_BINARY_HEADER.pack(n_total, len(ICS_COLUMNS)))
+    return n_total
+
+
+def is_binary_ics(path: str | Path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def count_particles(path: str | Path) -> int:
+    """
+    Número de partículas de un ICS sin cargarlo: cabecera del binario o
+    filas del texto (sin la cabecera de columnas).
+    """
+    if is_binary_ics(path):
+        with open(path, "rb") as f:
+            f.seek(len(BINARY_MAGIC))
+            n, _ = _BINARY_HEADER.unpack(f.read(_BINARY_HEADER.size))
+        return int(n)
+
+    n_lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            n_lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        n_lines += 1            # última fila sin salto de línea
+    return max(0, n_lines - 1)
+
+
+def read_ics(path: str | Path) -> Dict[str, np.ndarray]:
+    """Lee un ICS (texto o binario) y devuelve {columna: np.ndarray}."""
+    if not is_binary_ics(path):
+        table = np.loadtxt(path, skiprows=1, ndmin=2)
+    else:
+        with open(path, "rb") as f:
+            f.seek(len(BINARY_MAGIC))
+            n, ncols = _BINARY_HEADER.unpack(f.read(_BINARY_HEADER.size))
+            if ncols != len(ICS_COLUMNS):
+                raise ValueError(f"Número de columnas inválido en {path}: {ncols}")
+            table = np.fromfile(f, dtype="<f8", count=n * ncols).reshape(n, ncols)
+
+    return {c: table[:, j].astype(dt) for j, (c, dt) in enumerate(column_dtypes().items())}
@@ -0,0 +1,120 @@
+# src/core/particles.py
+import numpy as np
+from typing import List, Dict, Any, Iterable
+
+# Representación estándar de un conjunto de partículas: arreglo estructurado.
+# Cada fila admite el mismo acceso que los dicts anteriores (p["pos"], p["mass"]...).
+PARTICLE_DTYPE = np.dtype([
+    ("id", np.int64),
+    ("pos", np.float64, (2,)),
+    ("vel", np.float64, (2,)),
+    ("accel", np.float64, (2,)),
+    ("rho", np.float64),
+    ("mass", np.float64),
+    ("pressure", np.float64),
+    ("h", np.float64),
+    ("type", np.int64),
+])
+
+
+def empty_particles(n: int = 0) -> np.ndarray:
+    """Arreglo de n partículas con todos los campos en cero."""
+    return np.zeros(n, dtype=PARTICLE_DTYPE)
+
+
+def make_particles(points: np.ndarray,
+                   ptype: int,
+                   h: float,
+                   mass: float,
+                   rho: float,
+                   velocity: tuple[float, float] = (0.0, 0.0)) -> np.ndarray:
+    """
+    Crea el arreglo de partículas para un conjunto de puntos (N, 2),
+    con ids consecutivos desde 0.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    particles = empty_particles(len(points))
+    particles["id"] = np.arange(len(points))
+    particles["pos"] = points
+    particles["vel"] = velocity
+    particles["rho"] = rho
+    particles["mass"] = mass
+    particles["h"] = h
+    particles["type"] = ptype
+    return particles
+
+
+def concat_particles(arrays: Iterable[np.ndarray]) -> np.ndarray:
+    """Concatena varios arreglos de partículas (acepta lista vacía)."""
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return empty_particles()
+    return np.concatenate(arrays)
+
+
+def as_particle_array(particles) -> np.ndarray:
+    """
+    Normaliza la entrada a PARTICLE_DTYPE. Acepta un arreglo estructurado
+    o la lista de dicts usada por versiones anteriores.
+    """
+    if isinstance(particles, np.ndarray) and particles.dtype == PARTICLE_DTYPE:
+        return particles
+
+    particles = list(particles)
+    arr = empty_particles(len(particles))
+    for name in PARTICLE_DTYPE.names:
+        if particles and name in particles[0]:
+            arr[name] = [p[name] for p in particles]
+    return arr
+
+
+def to_dicts(particles: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Vista de compatibilidad: lista de dicts con el formato anterior
+    (pos/vel/accel como listas de float).
+    """
+    cols = {name: particles[name].tolist() for name in PARTICLE_DTYPE.names}
+    return [
+        {name: cols[name][i] for name in PARTICLE_DTYPE.names}
+        for i in range(len(particles))
+    ]
+
+
+def to_columns(particles: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Columnas del archivo de condiciones iniciales (ver ics_writer.ICS_COLUMNS)
+    como vistas del arreglo; internalE no se guarda y vale 0.
+    """
+    return {
+        "id": particles["id"],
+        "posx": particles["pos"][:, 0],
+        "posy": particles["pos"][:, 1],
+        "velx": particles["vel"][:, 0],
+        "vely": particles["vel"][:, 1],
+        "accelx": particles["accel"][:, 0],
+        "accely": particles["accel"][:, 1],
+        "rho": particles["rho"],
+        "mass": particles["mass"],
+        "pressure": particles["pressure"],
+        "h": particles["h"],
+        "internalE": np.zeros(len(particles)),
+        "type": particles["type"],
+    }
+
+
+def bounds(particles: np.ndarray) -> Dict[str, float | None]:
+    """Caja envolvente de las posiciones (None si no hay partículas)."""
+    if len(particles) == 0:
+        return {k: None for k in ("Lx", "Ly", "xmin", "xmax", "ymin", "ymax")}
+
+    pos = particles["pos"]
+    xmin, ymin = pos.min(axis=0).tolist()
+    xmax, ymax = pos.max(axis=0).tolist()
+    return {
+        "Lx": xmax - xmin,
+        "Ly": ymax - ymin,
+        "xmin": xmin,
+        "xmax": xmax,
+        "ymin": ymin,
+        "ymax": ymax,
+    }
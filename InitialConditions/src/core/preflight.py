@@ -0,0 +1,122 @@
+# src/core/preflight.py
+from pathlib import Path
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from src.core.ics_writer import read_ics
+
+# Valores del solver (AlgoritmSPH): capacidad fija de la lista de vecinos del
+# quadtree (tree_vecinos.h) y radio de búsqueda kappa·h + epsilon (neighbors.cpp)
+MAX_NEI = 48
+KAPPA = 2.0
+EPSILON = 1e-10
+
+# Mínimo de vecinos esperado para partículas de fluido
+DEFAULT_MIN_NEI = 5
+
+
+def neighbor_counts(pos: np.ndarray, radius: float | np.ndarray) -> np.ndarray:
+    """
+    Número de vecinos de cada partícula dentro de radius (escalar o uno por
+    partícula), sin contarse a sí misma, como en buscar_vecinos.
+    """
+    pos = np.asarray(pos, dtype=float).reshape(-1, 2)
+    tree = cKDTree(pos)
+    return tree.query_ball_point(pos, r=radius, return_length=True) - 1
+
+
+def fluid_spacing(pos: np.ndarray, ptype: np.ndarray) -> float:
+    """Separación dx estimada como la mediana de la distancia al vecino más cercano del fluido."""
+    fluid = pos[ptype == 0] if np.any(ptype == 0) else pos
+    dist, _ = cKDTree(fluid).query(fluid, k=2)
+    return float(np.median(dist[:, 1]))
+
+
+def preflight_ics(ics_path: str | Path,
+                  h_factor: float | None = None,
+                  kappa: float = KAPPA,
+                  max_nei: int = MAX_NEI,
+                  min_nei: int = DEFAULT_MIN_NEI) -> dict:
+    """
+    Predice el número de vecinos por partícula que encontrará el solver
+    para un ICS, sin ejecutarlo.
+
+    Parámetros
+    ----------
+    ics_path : str | Path
+        Archivo de condiciones iniciales (texto o binario).
+    h_factor : float | None
+        Si se da, h = h_factor · dx para todas las partículas (dx estimado
+        del fluido). Si es None se usa la h de cada partícula del archivo,
+        que es la que usa el solver.
+    kappa : float
+        Radio de soporte relativo a h.
+    max_nei : int
+        Capacidad de la lista de vecinos; más vecinos desbordan id_nei.
+    min_nei : int
+        Mínimo de vecinos aceptable para partículas de fluido.
+
+    Returns
+    -------
+    dict
+        Reporte con histograma de vecinos, partículas fuera de rango y
+        'ok' = True si ninguna excede max_nei ni queda bajo min_nei.
+    """
+    data = read_ics(ics_path)
+    pos = np.column_stack([data["posx"], data["posy"]])
+    ptype = data["type"]
+
+    dx = fluid_spacing(pos, ptype)
+    h = data["h"] if h_factor is None else np.full(len(pos), h_factor * dx)
+    counts = neighbor_counts(pos, kappa * h + EPSILON)
+
+    fluid = ptype == 0
+    over = counts > max_nei
+    under = fluid & (counts < min_nei)
+
+    values, freq = np.unique(counts, return_counts=True)
+    return {
+        "ics_file": str(ics_path),
+        "n_particles": int(len(pos)),
+        "n_fluid": int(fluid.sum()),
+        "dx": dx,
+        "h_factor": h_factor,
+        "h_min": float(h.min()),
+        "h_max": float(h.max()),
+        "kappa": kappa,
+        "max_nei": max_nei,
+        "min_nei": min_nei,
+        "neighbors_min": int(counts.min()),
+        "neighbors_max": int(counts.max()),
+        "neighbors_mean": float(counts.mean()),
+        "neighbors_mean_fluid": float(counts[fluid].mean()) if fluid.any() else None,
+        "histogram": {int(v): int(n) for v, n in zip(values, freq)},
+        "n_over": int(over.sum()),
+        "n_under": int(under.sum()),
+        "over_ids": data["id"][over][:20].tolist(),
+        "under_ids": data["id"][under][:20].tolist(),
+        "ok": bool(not over.any() and not under.any()),
+    }
+
+
+def print_preflight(report: dict) -> None:
+    """Imprime el reporte de preflight_ics."""
+    print(f"[INFO] Pre-flight de vecinos: {report['ics_file']}")
+    print(f"  Partículas: {report['n_particles']} (fluido {report['n_fluid']}), "
+          f"dx ≈ {report['dx']:.4g}, h ∈ [{report['h_min']:.4g}, {report['h_max']:.4g}], "
+          f"kappa = {report['kappa']}")
+    print(f"  Vecinos: min {report['neighbors_min']}, max {report['neighbors_max']}, "
+          f"media {report['neighbors_mean']:.1f}")
+    print("  Histograma (vecinos: partículas):")
+    for v, n in report["histogram"].items():
+        print(f"    {v:4d}: {n}")
+
+    if report["n_over"]:
+        print(f"[✗] {report['n_over']} partículas con más de {report['max_nei']} vecinos "
+              f"(desbordan MAX_NEI); ids: {report['over_ids']}")
+    if report["n_under"]:
+        print(f"[✗] {report['n_under']} partículas de fluido con menos de "
+              f"{report['min_nei']} vecinos; ids: {report['under_ids']}")
+    if report["ok"]:
+        print("[✓] Número de vecinos dentro de rango")
@@ -5,6 +5,7 @@ import numpy as np
 from pathlib import Path
 from scipy.spatial import cKDTree
 from src.fluid.particleizer import FluidParticleizer
+from src.core.particles import as_particle_array
 
 
 class FluidBuilder:
@@ -72,14 +73,15 @@ class FluidBuilder:
         return points[mask]
 
     # ---------------------------------------------------------
-    def build(self, border_particles: list[dict] | None = None, debug: bool = False) -> list[dict]:
+    def build(self, border_particles: np.ndarray | list[dict] | None = None,
+              debug: bool = False) -> np.ndarray:
         """
         Construye todas las partículas de fluido, eliminando posibles solapamientos
-        con las partículas de frontera si se proveen.
+        con las partículas de frontera si se proveen (arreglo o lista de dicts).
         """
         border_points = None
-        if border_particles:
-            border_points = np.array([p["pos"] for p in border_particles])
+        if border_particles is not None and len(border_particles):
+            border_points = as_particle_array(border_particles)["pos"]
 
         raw_points = self._generate_points()
         n_inicial = raw_points.shape[0]
@@ -0,0 +1,23 @@
+# test_particleizer.py
+
+import numpy as np
+from src.boundaries.particleizer import BoundaryParticleizer
+
+
+def test_vertices_compartidos_una_vez():
+    """Los vértices repetidos entre segmentos se conservan una sola vez y en orden."""
+    segments = [
+        [(0.0, 0.0), (0.5, 0.0), (1.0, 0.0)],
+        [(1.0, 0.0), (1.0, 0.5), (1.0, 1.0)],
+        [(1.0, 1.0), (0.0, 0.0)],
+    ]
+    p = BoundaryParticleizer().generate(segments, ptype=1, h=0.1, mass=1.0, rho=1000.0)
+
+    assert p["pos"].tolist() == [[0.0, 0.0], [0.5, 0.0], [1.0, 0.0], [1.0, 0.5], [1.0, 1.0]]
+    assert p["id"].tolist() == list(range(5))
+    assert np.all(p["type"] == 1)
+
+
+def test_sin_segmentos():
+    """Sin segmentos se obtiene un arreglo vacío."""
+    assert len(BoundaryParticleizer().generate([])) == 0
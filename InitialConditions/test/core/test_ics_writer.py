@@ -0,0 +1,80 @@
+# test_ics_writer.py
+
+import numpy as np
+from src.core.particles import make_particles, concat_particles, to_columns
+from src.core.ics_writer import (ICS_HEADER, BINARY_MAGIC, write_ics, read_ics, format_rows,
+                                 count_particles, text_precision)
+
+
+def _particles():
+    rng = np.random.default_rng(0)
+    b = make_particles(rng.random((5, 2)), ptype=1, h=0.011, mass=0.1, rho=1000.0)
+    f = make_particles(rng.random((7, 2)) - 0.5, ptype=0, h=0.011, mass=0.1,
+                       rho=1000.0, velocity=(0.25, -1.0))
+    p = concat_particles([b, f])
+    p["id"] = np.arange(len(p))
+    return p
+
+
+def test_texto_identico_al_fstring(tmp_path):
+    """El formateo por bloques coincide byte a byte con el f-string por partícula."""
+    p = _particles()
+    esperado = ICS_HEADER + "".join(
+        f"{q['id']} {q['pos'][0]:.10f} {q['pos'][1]:.10f} "
+        f"{q['vel'][0]:.10f} {q['vel'][1]:.10f} {q['accel'][0]:.10f} {q['accel'][1]:.10f} "
+        f"{q['rho']:.10f} {q['mass']:.10f} {q['pressure']:.10f} {q['h']:.10f} "
+        f"{0.0:.10f} {q['type']}\n"
+        for q in p
+    )
+
+    path = tmp_path / "ics.txt"
+    n = write_ics(path, to_columns(p), chunk_size=5)
+
+    assert n == len(p)
+    assert path.read_text() == esperado
+    assert format_rows({k: v[:0] for k, v in to_columns(p).items()}) == ""
+
+
+def test_binario_ida_y_vuelta(tmp_path):
+    """El ICS binario acepta bloques iterables y guarda los valores a 10 decimales."""
+    cols = to_columns(_particles())
+    bloques = ({k: v[i:i + 4] for k, v in cols.items()} for i in range(0, 12, 4))
+
+    path = tmp_path / "ics.bin"
+    assert write_ics(path, bloques, fmt="bin") == 12
+    assert path.read_bytes()[:len(BINARY_MAGIC)] == BINARY_MAGIC
+
+    leido = read_ics(path)
+    for k, v in cols.items():
+        assert np.array_equal(leido[k], text_precision(v) if k not in ("id", "type") else v)
+    assert leido["type"].dtype == np.int64
+
+
+def test_binario_coincide_con_el_texto(tmp_path):
+    """Leer el ICS binario da bit a bit lo mismo que parsear el de texto."""
+    cols = to_columns(_particles())
+    rng = np.random.default_rng(1)
+    cols["posx"] = rng.random(12) * 1e3 - 500.0     # valores sin representación exacta
+    cols["h"] = rng.random(12) * 1e-6
+
+    write_ics(tmp_path / "ics.txt", cols)
+    write_ics(tmp_path / "ics.bin", cols, fmt="bin")
+    texto, binario = read_ics(tmp_path / "ics.txt"), read_ics(tmp_path / "ics.bin")
+
+    for k in cols:
+        assert np.array_equal(texto[k], binario[k]), k
+    assert not np.array_equal(binario["posx"], cols["posx"])
+
+
+def test_count_particles(tmp_path):
+    """count_particles coincide con el número de filas escritas en ambos formatos."""
+    cols = to_columns(_particles())
+    for fmt in ("txt", "bin"):
+        path = tmp_path / f"ics.{fmt}"
+        n = write_ics(path, cols, fmt=fmt)
+        assert count_particles(path) == n == 12
+
+    # Texto sin salto de línea final
+    path = tmp_path / "ics.txt"
+    path.write_bytes(path.read_bytes().rstrip(b"\n"))
+    assert count_particles(path) == 12
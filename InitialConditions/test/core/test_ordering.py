@@ -0,0 +1,50 @@
+# test_ordering.py
+
+import numpy as np
+import pytest
+from src.core.particles import make_particles, concat_particles
+from src.core.ordering import hilbert_keys, morton_keys, spatial_order
+
+
+def _grid(n):
+    x, y = np.meshgrid(np.arange(n), np.arange(n))
+    return np.column_stack([x.ravel(), y.ravel()]).astype(float)
+
+
+def test_hilbert_es_continua():
+    """Sobre una grilla 2^k x 2^k, puntos consecutivos de la curva son vecinos."""
+    pts = _grid(8)
+    orden = np.argsort(hilbert_keys(pts, bits=3))
+    pasos = np.abs(np.diff(pts[orden], axis=0)).sum(axis=1)
+
+    assert np.all(pasos == 1.0)
+    assert sorted(hilbert_keys(pts, bits=3).tolist()) == list(range(64))
+
+
+def test_morton_z_order():
+    """Las claves de Morton recorren cada cuadrante 2x2 en forma de Z."""
+    pts = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    assert morton_keys(pts, bits=1).tolist() == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("method", ["morton", "hilbert"])
+def test_frontera_antes_que_fluido(method):
+    """El orden espacial no mezcla frontera (type != 0) con fluido."""
+    frontera = make_particles(_grid(6)[::-1], ptype=1, h=1.0, mass=1.0, rho=1.0)
+    agujero = make_particles([[9.0, 9.0]], ptype=-1, h=1.0, mass=1.0, rho=1.0)
+    fluido = make_particles(_grid(6)[::-1] + 0.5, ptype=0, h=1.0, mass=1.0, rho=1.0)
+    p = concat_particles([frontera, agujero, fluido])
+
+    perm = spatial_order(p, method)
+    ordenado = p[perm]
+
+    assert sorted(perm.tolist()) == list(range(len(p)))
+    assert np.all(ordenado["type"][:37] != 0) and np.all(ordenado["type"][37:] == 0)
+    assert not np.array_equal(perm, np.arange(len(p)))
+
+
+def test_sin_ordenamiento():
+    p = make_particles(_grid(3), ptype=0, h=1.0, mass=1.0, rho=1.0)
+    assert spatial_order(p, "none").tolist() == list(range(9))
+    with pytest.raises(ValueError):
+        spatial_order(p, "peano")
@@ -0,0 +1,40 @@
+# test_particles.py
+
+import numpy as np
+from src.core.particles import (
+    PARTICLE_DTYPE, make_particles, concat_particles, as_particle_array, to_dicts, bounds
+)
+
+
+def test_make_particles_campos():
+    """Crea un arreglo con ids consecutivos y valores constantes por campo."""
+    pts = np.array([[0.0, 0.0], [1.0, 2.0], [3.0, 1.0]])
+    p = make_particles(pts, ptype=0, h=0.1, mass=2.0, rho=1000.0, velocity=(1.0, -1.0))
+
+    assert p.dtype == PARTICLE_DTYPE
+    assert p["id"].tolist() == [0, 1, 2]
+    assert np.allclose(p["pos"], pts)
+    assert np.allclose(p["vel"], [1.0, -1.0])
+    assert np.all(p["accel"] == 0.0) and np.all(p["pressure"] == 0.0)
+    assert np.all(p["type"] == 0)
+
+
+def test_concat_y_bounds():
+    """Concatena en orden e ignora arreglos vacíos; bounds usa todas las posiciones."""
+    a = make_particles([[0.0, 0.0]], ptype=1, h=0.1, mass=1.0, rho=1000.0)
+    b = make_particles([[2.0, 1.0], [1.0, 3.0]], ptype=0, h=0.1, mass=1.0, rho=1000.0)
+    p = concat_particles([a, concat_particles([]), b])
+
+    assert p["type"].tolist() == [1, 0, 0]
+    assert bounds(p) == {"Lx": 2.0, "Ly": 3.0, "xmin": 0.0, "xmax": 2.0, "ymin": 0.0, "ymax": 3.0}
+    assert bounds(concat_particles([]))["Lx"] is None
+
+
+def test_compatibilidad_dicts():
+    """to_dicts y as_particle_array son inversas."""
+    p = make_particles([[0.5, 0.25], [1.0, 1.0]], ptype=-1, h=0.2, mass=3.0, rho=998.0)
+    dicts = to_dicts(p)
+
+    assert dicts[0]["pos"] == [0.5, 0.25]
+    assert dicts[1]["type"] == -1
+    assert np.array_equal(as_particle_array(dicts), p)
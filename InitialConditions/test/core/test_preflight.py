@@ -0,0 +1,46 @@
+# test_preflight.py
+
+import numpy as np
+from src.core.particles import make_particles, to_columns
+from src.core.ics_writer import write_ics
+from src.core.preflight import neighbor_counts, preflight_ics
+
+
+def _lattice_ics(tmp_path, n=10, dx=0.1, h_factor=1.1):
+    x, y = np.meshgrid(np.arange(n) * dx, np.arange(n) * dx)
+    pts = np.column_stack([x.ravel(), y.ravel()])
+    p = make_particles(pts, ptype=0, h=h_factor * dx, mass=1.0, rho=1000.0)
+    path = tmp_path / "ics.txt"
+    write_ics(path, to_columns(p))
+    return path
+
+
+def test_neighbor_counts_excluye_la_propia():
+    """En una grilla con radio 1.5·dx una partícula interior tiene 8 vecinos."""
+    x, y = np.meshgrid(np.arange(5.0), np.arange(5.0))
+    pts = np.column_stack([x.ravel(), y.ravel()])
+    counts = neighbor_counts(pts, 1.5)
+
+    assert counts[12] == 8          # centro
+    assert counts[0] == 3           # esquina
+
+
+def test_preflight_en_rango(tmp_path):
+    """Con h = 1.1·dx y kappa = 2 (r = 2.2·dx) el interior tiene 12 vecinos."""
+    report = preflight_ics(_lattice_ics(tmp_path))
+
+    assert report["ok"]
+    assert report["neighbors_max"] == 12
+    assert np.isclose(report["dx"], 0.1)
+    assert sum(report["histogram"].values()) == report["n_particles"]
+
+
+def test_preflight_detecta_desborde_y_escasez(tmp_path):
+    """Un h_factor grande desborda MAX_NEI; uno chico deja partículas sin vecinos."""
+    path = _lattice_ics(tmp_path)
+
+    grande = preflight_ics(path, h_factor=2.5)
+    assert not grande["ok"] and grande["n_over"] > 0 and grande["n_under"] == 0
+
+    chico = preflight_ics(path, h_factor=0.4)
+    assert not chico["ok"] and chico["n_under"] == chico["n_particles"]